@@ -40,6 +40,63 @@ const MoIPAPI = {
     return await this.sendCommand('/ir', 'POST', { tx: String(tx), rx: String(rx), code: codeKey });
   },
 
+  async irBurst(tx, rx, codeKey, count, rateHz = 5) {
+    return await this.sendCommand('/ir/burst', 'POST', { tx: String(tx), rx: String(rx), code: codeKey, count, rate_hz: rateHz });
+  },
+
+  async irHold(tx, rx, codeKey, rateHz = 5) {
+    return await this.sendCommand('/ir/hold', 'POST', { tx: String(tx), rx: String(rx), code: codeKey, rate_hz: rateHz });
+  },
+
+  async irRelease(rx) {
+    return await this.sendCommand('/ir/release', 'POST', { rx: String(rx) });
+  },
+
+  // Press-and-hold on a button: a tap sends the code once; holding past
+  // holdMs repeats it until release.  The hold is renewed every few seconds
+  // so the gateway's safety stop only fires if this tablet goes away mid-press.
+  bindIRHold(el, tx, rx, codeKey, rateHz = 5, holdMs = 400) {
+    let pressTimer = null;
+    let renew = null;
+    let pending = Promise.resolve();
+    const onHide = () => { if (document.visibilityState === 'hidden') stop(); };
+    const startHold = () => {
+      pressTimer = null;
+      pending = this.irHold(tx, rx, codeKey, rateHz);
+      renew = setInterval(() => { pending = this.irHold(tx, rx, codeKey, rateHz); }, 3000);
+    };
+    // Ends a press without a tap: the pointer left, was cancelled, or the page hid
+    const stop = () => {
+      document.removeEventListener('visibilitychange', onHide);
+      window.removeEventListener('pagehide', stop);
+      if (pressTimer) {
+        clearTimeout(pressTimer);
+        pressTimer = null;
+      }
+      if (renew) {
+        clearInterval(renew);
+        renew = null;
+        // After the hold request lands, so the release can't overtake it
+        pending.then(() => this.irRelease(rx));
+      }
+    };
+    el.addEventListener('pointerdown', (e) => {
+      e.preventDefault();
+      if (pressTimer || renew) return;
+      pressTimer = setTimeout(startHold, holdMs);
+      // A tablet that sleeps or leaves the page mid-press stops repeating too
+      document.addEventListener('visibilitychange', onHide);
+      window.addEventListener('pagehide', stop);
+    });
+    el.addEventListener('pointerup', () => {
+      const tapped = pressTimer !== null;
+      stop();
+      if (tapped) this.sendIR(tx, rx, codeKey);
+    });
+    ['pointerleave', 'pointercancel'].forEach(ev => el.addEventListener(ev, stop));
+    return stop;
+  },
+
   async sendOSD(text) {
     return await this.sendCommand('/osd', 'POST', { text });
   },
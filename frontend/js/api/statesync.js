@@ -0,0 +1,87 @@
+// State Sync - rebuilds full room state from gateway state:patch deltas
+//
+// The gateway sends one state:snapshot per room on join (and on resync),
+// then only field-level state:patch messages.  Each patch carries the
+// version it applies to (base) and the version it produces (v).  After
+// applying, the full value is handed to the existing 'state:<room>'
+// listeners so page code keeps working with complete objects.
+//
+// Versions are gateway-wide sequence numbers.  On reconnect, join() sends
+// the last version seen per room so the gateway can replay only the
+// patches missed while offline.  The epoch changes when the gateway
+// restarts; versions from an older epoch are discarded.
+const StateSync = {
+  rooms: {},   // room -> { v, value }
+  epoch: null,
+
+  bind(socket) {
+    this.socket = socket;
+
+    socket.on('state:snapshot', (snap) => {
+      if (!snap || !snap.room) return;
+      if (snap.epoch !== this.epoch) {
+        this.rooms = {};
+        this.epoch = snap.epoch;
+      }
+      this.rooms[snap.room] = { v: snap.v, value: snap.value };
+      this._dispatch(snap.room);
+    });
+
+    socket.on('state:patch', (patch) => {
+      if (!patch || !patch.room) return;
+      const local = this.rooms[patch.room];
+      if (local && patch.v <= local.v) return;  // already have it
+      if (!local || local.v !== patch.base) {
+        // Missed one or more patches — ask for a full snapshot
+        socket.emit('state:resync', { room: patch.room });
+        return;
+      }
+      let value = local.value;
+      for (const op of patch.ops) value = this._applyOp(value, op);
+      this.rooms[patch.room] = { v: patch.v, value };
+      this._dispatch(patch.room);
+    });
+  },
+
+  // Join a room, asking only for what changed since our last version
+  join(room) {
+    const entry = this.rooms[room];
+    const data = { room };
+    if (entry && this.epoch !== null) {
+      data.since = entry.v;
+      data.epoch = this.epoch;
+    }
+    this.socket.emit('join', data);
+  },
+
+  get(room) {
+    const entry = this.rooms[room];
+    return entry ? entry.value : undefined;
+  },
+
+  // Copy-on-write: clone each container along the path so objects
+  // previously handed to listeners are never mutated in place.
+  _applyOp(root, op) {
+    const path = op[0];
+    const remove = op.length < 2;
+    if (path.length === 0) return remove ? undefined : op[1];
+    const out = Object.assign({}, root);
+    let node = out;
+    for (let i = 0; i < path.length - 1; i++) {
+      const child = node[path[i]];
+      node[path[i]] = (child && typeof child === 'object') ? Object.assign({}, child) : {};
+      node = node[path[i]];
+    }
+    const leaf = path[path.length - 1];
+    if (remove) delete node[leaf];
+    else node[leaf] = op[1];
+    return out;
+  },
+
+  _dispatch(room) {
+    const value = this.rooms[room].value;
+    for (const fn of this.socket.listeners(`state:${room}`)) {
+      try { fn(value); } catch (e) { console.error(`StateSync ${room}:`, e); }
+    }
+  },
+};
@@ -170,6 +170,59 @@ const X32API = {
     }
   },
 
+  async fade(strip, num, db, seconds) {
+    try {
+      const resp = await fetch(`/api/x32/fade/${strip}/${num}`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ db, seconds }),
+        signal: AbortSignal.timeout(5000),
+      });
+      return await resp.json();
+    } catch (e) {
+      console.error('X32 fade:', e);
+      return null;
+    }
+  },
+
+  // Live level meters: binary x32:meters frames from the x32_meters room.
+  // onFrame gets { 1: [dB x32 input channels], 2: [dB x16 buses, x6 matrix, L, R, M/C] }
+  // Rejoins after a reconnect (the server forgets rooms with the old sid).
+  joinMeters(socket, onFrame, fps = 15) {
+    if (this._meterHandler) this.leaveMeters(socket);
+    this._meterHandler = (buf) => onFrame(this.decodeMeters(buf));
+    this._meterJoin = () => socket.emit('join', { room: 'x32_meters', fps });
+    socket.on('x32:meters', this._meterHandler);
+    socket.on('connect', this._meterJoin);
+    if (socket.connected) this._meterJoin();
+  },
+
+  leaveMeters(socket) {
+    if (!this._meterHandler) return;
+    socket.emit('leave', { room: 'x32_meters' });
+    socket.off('x32:meters', this._meterHandler);
+    socket.off('connect', this._meterJoin);
+    this._meterHandler = null;
+    this._meterJoin = null;
+  },
+
+  // Frame: version, bank count, then per bank: number, count, one byte per
+  // value in half-dB steps above -90 dBFS (0 = silence)
+  decodeMeters(buf) {
+    const bytes = new Uint8Array(buf);
+    const banks = {};
+    let i = 2;
+    for (let b = 0; b < bytes[1] && i + 2 <= bytes.length; b++) {
+      const bank = bytes[i], count = bytes[i + 1];
+      i += 2;
+      const values = [];
+      for (let n = 0; n < count; n++) values.push(bytes[i + n] / 2 - 90);
+      banks[bank] = values;
+      i += count;
+    }
+    return banks;
+  },
+
   // Called by Socket.IO state push
   onStateUpdate(data) {
     if (data && data.event === 'scene') {
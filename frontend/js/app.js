@@ -103,6 +103,9 @@ const App = {
     // Initialize macro API (after socket is ready)
     MacroAPI.init();
 
+    // Follow the visible page's rooms so server presence reflects what's on screen
+    Router.onNavigate = (page) => this.syncRooms(page);
+
     // Navigate to initial page
     const hash = window.location.hash.replace('#', '');
     const startPage = hash && Auth.hasPermission(hash) ? hash : 'home';
@@ -156,6 +159,9 @@ const App = {
       timeout: 60000,           // 60s — match server ping_timeout for WiFi tolerance
     });
 
+    // Rebuild full room state from state:snapshot / state:patch deltas
+    StateSync.bind(this.socket);
+
     this.socket.on('connect', () => {
       this._sessionCount++;
       console.log(`Socket.IO connected (session #${this._sessionCount})`);
@@ -187,15 +193,10 @@ const App = {
         this._lastDisconnectReason = null;
       }
 
-      // Join rooms for all subsystems
-      this.socket.emit('join', { room: 'moip' });
-      this.socket.emit('join', { room: 'x32' });
-      this.socket.emit('join', { room: 'obs' });
-      this.socket.emit('join', { room: 'projectors' });
-      this.socket.emit('join', { room: 'camlytics' });
-      this.socket.emit('join', { room: 'ha' });
-      this.socket.emit('join', { room: 'health' });
-      this.socket.emit('join', { room: 'wattbox' });
+      // The server forgot our rooms with the old sid; rejoin the current page's
+      // (StateSync resumes from the last seen version after a reconnect)
+      this._joinedRooms = new Set();
+      this.syncRooms(Router.currentPage);
     });
 
     this.socket.on('disconnect', (reason) => {
@@ -271,6 +272,11 @@ const App = {
       this.refreshCurrentPage('moip');
     });
 
+    // Switch/scene results from other tablets and macros (not receiver maps)
+    this.socket.on('moip:event', () => {
+      this.refreshCurrentPage('moip');
+    });
+
     this.socket.on('state:obs', (data) => {
       ObsAPI.onStateUpdate(data);
       this.refreshCurrentPage('obs');
@@ -461,6 +467,44 @@ const App = {
     document.body.appendChild(overlay);
   },
 
+  // -----------------------------------------------------------------------
+  // Room membership — only the rooms the visible page displays
+  // -----------------------------------------------------------------------
+
+  _joinedRooms: new Set(),
+
+  syncRooms(page) {
+    if (!this.socket || !this.socket.connected) return;  // 'connect' syncs later
+    // Macro button pages bind button states to any of these sources
+    const macroRooms = ['ha', 'x32', 'moip', 'obs', 'projectors', 'camlytics'];
+    const pageRooms = {
+      main: macroRooms,
+      chapel: macroRooms,
+      social: macroRooms,
+      gym: macroRooms,
+      confroom: macroRooms,
+      stream: ['obs'],
+      source: ['moip', 'x32'],
+      security: ['moip'],
+      settings: ['x32', 'moip', 'projectors', 'wattbox'],
+      occupancy: ['camlytics'],
+    };
+    // The status bar health pills are on every page
+    const wanted = new Set(['health', ...(pageRooms[page] || [])]);
+    for (const room of this._joinedRooms) {
+      if (!wanted.has(room)) {
+        this.socket.emit('leave', { room });
+        this._joinedRooms.delete(room);
+      }
+    }
+    for (const room of wanted) {
+      if (!this._joinedRooms.has(room)) {
+        StateSync.join(room);
+        this._joinedRooms.add(room);
+      }
+    }
+  },
+
   refreshCurrentPage(subsystem) {
     // If the current page cares about this subsystem's data, trigger a UI refresh
     const page = Router.currentPage;
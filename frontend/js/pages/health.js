@@ -203,9 +203,19 @@ const HealthPage = {
 
   async _fetchStatus() {
     try {
-      const resp = await fetch('/api/healthdash/status', { cache: 'no-store', signal: AbortSignal.timeout(8000) });
-      if (!resp.ok) throw new Error(`HTTP ${resp.status}`);
-      const data = await resp.json();
+      // Revalidate with the last ETag; on 304 reuse the previous body
+      // (heartbeats are absolute times, so it is still accurate)
+      const headers = this._statusEtag ? { 'If-None-Match': this._statusEtag } : {};
+      const resp = await fetch('/api/healthdash/status', { cache: 'no-store', headers, signal: AbortSignal.timeout(8000) });
+      let data;
+      if (resp.status === 304 && this._statusData) {
+        data = this._statusData;
+      } else {
+        if (!resp.ok) throw new Error(`HTTP ${resp.status}`);
+        data = await resp.json();
+        this._statusEtag = resp.headers.get('ETag');
+        this._statusData = data;
+      }
 
       this._setBanner(null);
       const timeEl = document.getElementById('health-last-update');
@@ -616,7 +626,7 @@ const HealthPage = {
       const circuit = p.circuit || {};
       const state = circuit.state || 'closed';
       const stale = p.stale;
-      const age = p.last_heartbeat_age_s;
+      const age = p.last_heartbeat_at != null ? Math.max(0, Date.now() / 1000 - p.last_heartbeat_at) : null;
 
       let dotClass = 'health-dot-healthy';
       let label = 'OK';
@@ -624,7 +634,9 @@ const HealthPage = {
       else if (state === 'half-open') { dotClass = 'health-dot-warning'; label = 'Half-open'; }
       else if (stale) { dotClass = 'health-dot-warning'; label = 'Stale'; }
 
-      const ageStr = age != null ? `${Math.round(age)}s ago` : '—';
+      // Only stale pollers carry a heartbeat time; the rest beat on schedule
+      const ageStr = age != null ? `${Math.round(age)}s ago`
+        : p.interval_s != null ? `every ${Math.round(p.interval_s)}s` : '—';
       const failStr = circuit.fail_count > 0 ? ` (${circuit.fail_count}/${circuit.threshold} fails)` : '';
       const friendly = friendlyNames[name] || name;
 
@@ -14,12 +14,15 @@ const MacroBuilderPage = {
     { value: 'wattbox_check', label: 'WattBox Check' },
     { value: 'wattbox_reboot',label: 'WattBox Reboot' },
     { value: 'moip_switch',   label: 'MoIP Switch' },
+    { value: 'moip_switch_many', label: 'MoIP Switch (many RX)' },
     { value: 'moip_ir',       label: 'MoIP IR Code' },
+    { value: 'moip_ir_burst', label: 'MoIP IR Repeat' },
     { value: 'epson_power',   label: 'Projector Power' },
     { value: 'epson_all',     label: 'All Projectors' },
     { value: 'x32_scene',     label: 'X32 Scene' },
     { value: 'x32_mute',      label: 'X32 Mute' },
     { value: 'x32_aux_mute',  label: 'X32 Aux Mute' },
+    { value: 'x32_fade',      label: 'X32 Fade' },
     { value: 'obs_emit',      label: 'OBS Action' },
     { value: 'ptz_preset',    label: 'PTZ Preset' },
     { value: 'tts_announce',  label: 'TTS Announce' },
@@ -461,12 +464,26 @@ const MacroBuilderPage = {
           this._selectField(index, 'rx', 'Receiver', (opts.moip_rx || []).map(r => ({ value: String(r.id), label: `${r.name}${r.location ? ' (' + r.location + ')' : ''}` })), String(step.rx || '')),
         ]);
 
+      case 'moip_switch_many':
+        return this._fieldGroup(index, [
+          this._selectField(index, 'tx', 'Transmitter', (opts.moip_tx || []).map(t => ({ value: String(t.id), label: t.name })), String(step.tx || '')),
+          this._textField(index, 'rx', 'Receivers', Array.isArray(step.rx) ? step.rx.join(', ') : (step.rx || ''), '47, 9, 22'),
+        ]);
+
       case 'moip_ir':
         return this._fieldGroup(index, [
           this._selectField(index, 'rx', 'Receiver', (opts.moip_rx || []).map(r => ({ value: String(r.id), label: r.name })), String(step.rx || '')),
           this._selectField(index, 'code', 'IR Code', (opts.ir_codes || []).map(c => ({ value: c, label: c })), step.code || ''),
         ]);
 
+      case 'moip_ir_burst':
+        return this._fieldGroup(index, [
+          this._selectField(index, 'receiver', 'Receiver', (opts.moip_rx || []).map(r => ({ value: String(r.id), label: r.name })), String(step.receiver || '')),
+          this._selectField(index, 'code', 'IR Code', (opts.ir_codes || []).map(c => ({ value: c, label: c })), step.code || ''),
+          this._textField(index, 'count', 'Presses', step.count || '', '5'),
+          this._textField(index, 'rate_hz', 'Per second', step.rate_hz || '', '5'),
+        ]);
+
       case 'epson_power':
         return this._fieldGroup(index, [
           this._selectField(index, 'projector', 'Projector', (opts.projectors || []).map(p => ({ value: p.id, label: p.name })), step.projector),
@@ -503,6 +520,17 @@ const MacroBuilderPage = {
           ], String(step.mute ?? 'true')),
         ]);
 
+      case 'x32_fade':
+        return this._fieldGroup(index, [
+          this._selectField(index, 'strip', 'Strip', [
+            { value: 'ch', label: 'Channel' }, { value: 'aux', label: 'Aux In' },
+            { value: 'bus', label: 'Bus' }, { value: 'dca', label: 'DCA' },
+          ], step.strip || 'ch'),
+          this._textField(index, 'channel', 'Number', step.channel || '', '1'),
+          this._textField(index, 'db', 'Target dB', step.db ?? '', '-10'),
+          this._textField(index, 'seconds', 'Seconds', step.seconds || '', '3'),
+        ]);
+
       case 'obs_emit':
         return this._fieldGroup(index, [
           this._selectField(index, 'action', 'Action', [
@@ -689,7 +717,7 @@ const MacroBuilderPage = {
           this._steps[idx].message = value;
         } else {
           // Convert numeric-looking values
-          if (typeof value === 'string' && /^\d+$/.test(value) && ['seconds', 'timeout', 'duration', 'preset', 'tx', 'rx', 'bus', 'channel'].includes(field)) {
+          if (typeof value === 'string' && /^\d+$/.test(value) && ['seconds', 'timeout', 'duration', 'preset', 'tx', 'rx', 'bus', 'channel', 'count', 'rate_hz'].includes(field)) {
             value = parseInt(value, 10);
           }
           // Convert boolean strings
@@ -784,7 +812,7 @@ const MacroBuilderPage = {
         let value = e.target.type === 'checkbox' ? e.target.checked : e.target.value;
 
         // Convert numeric and boolean values
-        if (typeof value === 'string' && /^\d+$/.test(value) && ['seconds', 'timeout', 'duration', 'preset', 'tx', 'rx', 'bus', 'channel'].includes(field)) {
+        if (typeof value === 'string' && /^\d+$/.test(value) && ['seconds', 'timeout', 'duration', 'preset', 'tx', 'rx', 'bus', 'channel', 'count', 'rate_hz'].includes(field)) {
           value = parseInt(value, 10);
         }
         if (value === 'true') value = true;
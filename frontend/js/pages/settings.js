@@ -1591,6 +1591,8 @@ const SettingsPage = {
     },
   ],
 
+  _irReleases: [],
+
   _loadTVControls() {
     const grid = document.getElementById('tv-controls-grid');
     if (!grid) return;
@@ -1662,30 +1664,32 @@ const SettingsPage = {
 
     grid.innerHTML = projectorActions + html;
 
-    // Wire all TV control buttons
+    // Wire all TV control buttons. IR buttons send their code once on a tap
+    // and repeat it only on a long press; the Epsons are driven over the network.
+    this._irReleases.forEach(release => release());
+    this._irReleases = [];
     grid.querySelectorAll('.tv-btn').forEach(btn => {
+      if (btn.dataset.tvType !== 'epson') {
+        this._irReleases.push(MoIPAPI.bindIRHold(btn, '0', btn.dataset.rx, btn.dataset.irCode));
+        btn.addEventListener('click', () => {
+          App.showToast(`${btn.closest('.tv-control-card').querySelector('.tv-control-label span:last-child').textContent}: ${btn.dataset.tvAction.toUpperCase()}`);
+        });
+        return;
+      }
       btn.addEventListener('click', async () => {
-        const type = btn.dataset.tvType;
         const action = btn.dataset.tvAction;
 
         btn.classList.add('loading');
         btn.disabled = true;
 
         try {
-          if (type === 'epson') {
-            const key = btn.dataset.epsonKey;
-            if (action === 'on') {
-              await EpsonAPI.powerOn(key);
-            } else {
-              await EpsonAPI.powerOff(key);
-            }
-            App.showToast(`${btn.closest('.tv-control-card').querySelector('.tv-control-label span:last-child').textContent}: ${action === 'on' ? 'Powering on' : 'Powering off'}`);
+          const key = btn.dataset.epsonKey;
+          if (action === 'on') {
+            await EpsonAPI.powerOn(key);
           } else {
-            const rx = btn.dataset.rx;
-            const code = btn.dataset.irCode;
-            await MoIPAPI.sendIR('0', rx, code);
-            App.showToast(`${btn.closest('.tv-control-card').querySelector('.tv-control-label span:last-child').textContent}: ${action.toUpperCase()}`);
+            await EpsonAPI.powerOff(key);
           }
+          App.showToast(`${btn.closest('.tv-control-card').querySelector('.tv-control-label span:last-child').textContent}: ${action === 'on' ? 'Powering on' : 'Powering off'}`);
         } catch (e) {
           App.showToast('Command failed', 3000, 'error');
         } finally {
@@ -4528,6 +4532,8 @@ const SettingsPage = {
   },
 
   destroy() {
+    this._irReleases.forEach(release => release());
+    this._irReleases = [];
     if (this._switchPanelTimer) { clearInterval(this._switchPanelTimer); this._switchPanelTimer = null; }
     if (this._ecoFlowTimer) { clearInterval(this._ecoFlowTimer); this._ecoFlowTimer = null; }
     this._thermostatTimers.forEach(t => clearInterval(t));
@@ -365,6 +365,7 @@ const SourcePage = {
       // Load full mixer data and routing (only when advanced is opened)
       this.loadMixer();
       this._loadAudioRouting();
+      if (App.socket) X32API.joinMeters(App.socket, (banks) => this._renderMeters(banks));
       body.querySelector('#btn-refresh-routing-audio')?.addEventListener('click', () => this._loadAudioRouting(true));
     });
   },
@@ -400,6 +401,22 @@ const SourcePage = {
     this._renderMixer(state);
   },
 
+  // Live levels under each channel/bus fader (bank 1 = inputs, bank 2 = buses).
+  // The panel has no close hook, so the first frame after it closes leaves the room.
+  _renderMeters(banks) {
+    const panel = document.getElementById('mixer-container');
+    if (!panel) {
+      if (App.socket) X32API.leaveMeters(App.socket);
+      return;
+    }
+    panel.closest('.panel-body').querySelectorAll('[data-meter]').forEach(el => {
+      const [bank, id] = el.dataset.meter.split('-').map(Number);
+      const db = (banks[bank] || [])[id - 1];
+      // Show the top 60 dB; anything quieter reads as empty
+      el.style.width = db === undefined ? '0%' : `${Math.max(0, Math.min(100, (db + 60) * 100 / 60))}%`;
+    });
+  },
+
   _faderDebounceTimers: {},
 
   _debouncedSetVolume(type, id, value) {
@@ -433,6 +450,7 @@ const SourcePage = {
             <div class="channel-name" title="${ch.name}">${ch.name}</div>
             <input type="range" class="channel-fader" min="0" max="100" value="${Math.round(ch.volume * 100)}"
               data-fader-type="ch" data-fader-id="${ch.id}" orient="vertical" />
+            <div class="channel-meter"><div class="channel-meter-fill" data-meter="1-${ch.id}"></div></div>
             <div class="channel-volume" data-vol-display="ch-${ch.id}">${Math.round(ch.volume * 100)}%</div>
             <button class="channel-mute ${ch.muted === 'muted' ? 'muted' : 'unmuted'}" data-mute-ch="${ch.id}">
               ${ch.muted === 'muted' ? 'MUTED' : 'ON'}
@@ -507,6 +525,7 @@ const SourcePage = {
           <div class="channel-name" title="${b.name}">${b.name}</div>
           <input type="range" class="channel-fader" min="0" max="100" value="${Math.round(b.volume * 100)}"
             data-fader-type="bus" data-fader-id="${b.id}" orient="vertical" />
+          <div class="channel-meter"><div class="channel-meter-fill" data-meter="2-${b.id}"></div></div>
           <div class="channel-volume" data-vol-display="bus-${b.id}">${Math.round(b.volume * 100)}%</div>
           <button class="channel-mute ${b.muted === 'muted' ? 'muted' : 'unmuted'}" data-mute-bus="${b.id}">
             ${b.muted === 'muted' ? 'MUTED' : 'ON'}
@@ -2232,6 +2251,7 @@ const SourcePage = {
 
   destroy() {
     this._closePreview();
+    if (App.socket) X32API.leaveMeters(App.socket);
     this._activeTab = 'video';
     this._audioInitialized = false;
     this._announcementsLoaded = false;
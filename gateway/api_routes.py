@@ -12,7 +12,7 @@ import threading
 import time
 from datetime import datetime, timezone
 from io import BytesIO
-from typing import Any, Optional
+from typing import Any
 
 import requests as http_requests
 import yaml
@@ -22,7 +22,12 @@ from auth import get_tablet_id, get_actor, check_permission, revoke_user_session
 from macro_engine import (
     execute_macro, fetch_ha_button_states, fetch_all_ha_entities, step_summary,
 )
-from polling import MockBackend
+from metrics import (
+    CIRCUIT_OPEN, POLLER_HEARTBEAT_AGE, PREVIEW_VIEWERS, ROOM_WATCHERS, registry as metrics_registry,
+    timed_command,
+)
+from polling import MockBackend, PreEncoded
+from preview_relay import rewrite_manifest
 
 logger = logging.getLogger("stp-gateway")
 
@@ -47,6 +52,48 @@ def register_api_routes(ctx):
     config_path = ctx.config_path
     timeouts = cfg.get("timeouts", {})
     _notif_retention = int(cfg.get("notification_retention_hours", 12))
+    _gzip_min_bytes = int(cfg.get("state_cache", {}).get("gzip_min_bytes", 2048))
+
+    def _encoded_response(enc: PreEncoded):
+        """Serve a pre-encoded JSON body, gzipped if large and accepted.
+
+        Carries the body's content hash as ETag.  A matching If-None-Match
+        gets a bare 304 before any gzip work, so pass a PreEncoded that is
+        reused while the data is unchanged (see _memo_encoded) and a
+        revalidation costs no serialization at all.  Return it bare, not
+        as ``(resp, 200)`` — a status in the tuple would override the 304.
+        """
+        etag = enc.etag
+        for tag in (etag, etag + "-gz"):  # distinct validator per representation
+            if request.if_none_match.contains_weak(tag):
+                resp = Response(status=304)
+                break
+        else:
+            tag = etag
+            if (_gzip_min_bytes and len(enc.raw) >= _gzip_min_bytes
+                    and "gzip" in request.headers.get("Accept-Encoding", "")):
+                resp = Response(enc.gzipped(), mimetype="application/json")
+                resp.headers["Content-Encoding"] = "gzip"
+                tag = etag + "-gz"
+            else:
+                resp = Response(enc.raw, mimetype="application/json")
+        resp.headers["Vary"] = "Accept-Encoding"
+        # Let browsers keep the body but always revalidate before reuse
+        resp.headers["Cache-Control"] = "no-cache"
+        resp.set_etag(tag)
+        return resp
+
+    def _memo_encoded(memo: dict, value: Any, **extra) -> PreEncoded:
+        """Reuse *memo*'s PreEncoded while *value* compares equal.
+
+        Comparing dicts is far cheaper than dumps + sha1 (+ gzip), which
+        then run once per change instead of once per request.  *extra*
+        fields are added to the body when it is (re)built.
+        """
+        if memo.get("enc") is None or memo.get("value") != value:
+            memo["enc"] = PreEncoded({**extra, **value} if extra else value)
+            memo["value"] = value
+        return memo["enc"]
 
     def _create_notification(label: str, ntype: str, message: str,
                              details: str = "", source: str = "",
@@ -227,8 +274,28 @@ def register_api_routes(ctx):
             "modules": modules_status,
             "db_ok": db_ok,
             "pollers": poller_status,
+            "broadcast": ctx.broadcaster.stats() if ctx.broadcaster else None,
+            "room_watchers": ctx.room_presence.status() if ctx.room_presence else {},
+            "poll_timing": ctx.poll_scheduler.stats() if ctx.poll_scheduler else {},
         }), status_code
 
+    @app.route("/api/metrics")
+    def api_metrics():
+        """Counters, gauges and latency histograms in Prometheus text format."""
+        # Point-in-time gauges are sampled at scrape time
+        for name, p in watchdog.status().items():
+            POLLER_HEARTBEAT_AGE.set(p["last_heartbeat_age_s"], poller=name)
+            CIRCUIT_OPEN.set(1 if (p.get("circuit") or {}).get("state") == "open" else 0, poller=name)
+        if ctx.room_presence is not None:
+            for room, count in ctx.room_presence.status().items():
+                ROOM_WATCHERS.set(count, room=room)
+        if getattr(ctx, "meter_stream", None) is not None:
+            ROOM_WATCHERS.set(ctx.meter_stream.members, room="x32_meters")
+        if getattr(ctx, "preview_relay", None) is not None:
+            PREVIEW_VIEWERS.set(ctx.preview_relay.viewers)
+        return Response(metrics_registry.render(),
+                        mimetype="text/plain; version=0.0.4; charset=utf-8")
+
     @app.route("/api/readiness")
     def api_readiness():
         """Deployment readiness probe — returns 200 only when all modules are connected."""
@@ -289,17 +356,32 @@ def register_api_routes(ctx):
             return jsonify({"counts": {"healthy": 0, "warning": 0, "down": 0}, "total": 0}), 200
         return jsonify(health.get_summary()), 200
 
+    _healthdash_memo: dict = {}
+    _healthdash_lock = threading.Lock()
+
     @app.route("/api/healthdash/status")
     def api_healthdash_status():
         health = ctx.health
         if health is None:
             return jsonify({"generated_at": "", "results": {}, "heartbeat": {}}), 200
-        return jsonify({
-            "generated_at": datetime.now(timezone.utc).isoformat(),
-            "results": health.get_all_results(),
-            "heartbeat": health.get_heartbeats(),
-            "gateway_pollers": watchdog.status(),
-        }), 200
+        # Heartbeats go out as absolute times (tablets work out the ages),
+        # so an unchanged dashboard is byte-identical and revalidates as 304
+        # without being serialized again; generated_at is when it changed.
+        # A poller on schedule beats every poll, so only a stale one (whose
+        # time has stopped moving) carries its last heartbeat.
+        pollers = {}
+        for name, p in watchdog.status().items():
+            p = {k: v for k, v in p.items() if k != "last_heartbeat_age_s"}
+            if not p["stale"]:
+                del p["last_heartbeat_at"]
+            pollers[name] = p
+        with _healthdash_lock:
+            enc = _memo_encoded(_healthdash_memo, {
+                "results": health.get_all_results(),
+                "heartbeat": health.get_heartbeats(absolute=True),
+                "gateway_pollers": pollers,
+            }, generated_at=datetime.now(timezone.utc).isoformat())
+        return _encoded_response(enc)
 
     @app.route("/api/healthdash/services")
     def api_healthdash_services():
@@ -782,12 +864,31 @@ def register_api_routes(ctx):
             try:
                 fresh, fresh_status = ctx.moip.get_receivers()
                 if fresh_status < 400 and fresh:
-                    state_cache.set("moip", fresh)
-                    socketio.emit("state:moip", fresh, room="moip")
+                    state_cache.publish("moip", fresh)
             except Exception as e:
                 logger.debug(f"MoIP state refresh after command failed: {e}")
         return jsonify(result), status
 
+    @app.route("/api/moip/switch_many", methods=["POST"])
+    def moip_switch_many():
+        """Route several receivers at once: {"switches": [{"transmitter": 1, "receiver": 47}, ...]}."""
+        perm_err = check_permission(get_tablet_id(), "source", permissions_data)
+        if perm_err:
+            return perm_err
+        switches = (request.get_json(silent=True) or {}).get("switches")
+        if mock_mode:
+            count = len(switches) if isinstance(switches, list) else 0
+            return jsonify({"success": True, "results": [{"index": i, "success": True} for i in range(count)],
+                            "mock": True}), 200
+        tablet = get_tablet_id()
+        result, status = ctx.moip.switch_many(switches)
+        if status < 400:
+            _create_notification("Video Switch", "success",
+                                 f"{len(result['results'])} receivers switched", source=tablet)
+            if result.get("receivers"):
+                state_cache.publish("moip", result["receivers"])
+        return jsonify(result), status
+
     @app.route("/api/moip/ir", methods=["POST"])
     def moip_ir():
         data = request.get_json(silent=True) or {}
@@ -804,6 +905,40 @@ def register_api_routes(ctx):
         result, status = ctx.moip.send_ir(str(tx), str(rx), code)
         return jsonify(result), status
 
+    def _ir_code(name: str) -> str:
+        ir_codes = devices_data.get("moip", {}).get("irCodes", {})
+        if name not in ir_codes:
+            logger.warning(f"IR code name '{name}' not found in devices.json irCodes")
+        return ir_codes.get(name, name)
+
+    @app.route("/api/moip/ir/burst", methods=["POST"])
+    def moip_ir_burst():
+        data = request.get_json(silent=True) or {}
+        if mock_mode:
+            return jsonify({"success": True, "mock": True}), 200
+        result, status = ctx.moip.ir_burst(
+            str(data.get("tx", "")), str(data.get("rx", "")), _ir_code(data.get("code", "")),
+            count=data.get("count", 1), rate_hz=data.get("rate_hz", 5))
+        return jsonify(result), status
+
+    @app.route("/api/moip/ir/hold", methods=["POST"])
+    def moip_ir_hold():
+        data = request.get_json(silent=True) or {}
+        if mock_mode:
+            return jsonify({"success": True, "mock": True}), 200
+        result, status = ctx.moip.ir_hold(
+            str(data.get("tx", "")), str(data.get("rx", "")), _ir_code(data.get("code", "")),
+            rate_hz=data.get("rate_hz", 5))
+        return jsonify(result), status
+
+    @app.route("/api/moip/ir/release", methods=["POST"])
+    def moip_ir_release():
+        data = request.get_json(silent=True) or {}
+        if mock_mode:
+            return jsonify({"success": True, "mock": True}), 200
+        result, status = ctx.moip.ir_release(str(data.get("rx", "")))
+        return jsonify(result), status
+
     @app.route("/api/moip/scene", methods=["POST"])
     def moip_scene():
         perm_err = check_permission(get_tablet_id(), "source", permissions_data)
@@ -818,7 +953,7 @@ def register_api_routes(ctx):
         if status < 400:
             _create_notification("Video Scene", "success",
                                  f"Scene: {scene}", source=tablet)
-            socketio.emit("state:moip", {"event": "scene", "data": data}, room="moip")
+            socketio.emit("moip:event", {"event": "scene", "data": data}, room="moip")
         return jsonify(result), status
 
     @app.route("/api/moip/osd", methods=["POST"])
@@ -860,6 +995,9 @@ def register_api_routes(ctx):
         result, status = ctx.moip.switch(str(tx), preview_rx)
         if status >= 400:
             return jsonify(result), status
+        if getattr(ctx, "preview_relay", None) is not None:
+            # The encoder now carries a different source; don't serve old segments
+            ctx.preview_relay.reset()
 
         tx_name = str(tx)
         for t in devices_data.get("moip", {}).get("transmitters", []):
@@ -906,50 +1044,34 @@ def register_api_routes(ctx):
         if request.args.get("url") and encoder_ip and encoder_ip not in stream_url:
             return jsonify({"error": "Invalid stream URL"}), 403
 
+        relay = getattr(ctx, "preview_relay", None)
+        if relay is None:
+            return jsonify({"error": "Preview not enabled"}), 404
         try:
             if stream_type == "hls":
-                from urllib.parse import urljoin, quote
                 # Cache-buster propagated from frontend to ensure unique URLs per switch
                 cb = request.args.get("_cb", "")
                 cb_suffix = f"&_cb={cb}" if cb else ""
-                # Proxy HLS manifest — rewrite URLs to go through our proxy
-                upstream = http_requests.get(stream_url, timeout=5)
-                upstream.raise_for_status()
-                # Derive base URL of the encoder for relative references
-                base_url = stream_url.rsplit("/", 1)[0] + "/"
-                lines = []
-                for line in upstream.text.splitlines():
-                    if line and not line.startswith("#"):
-                        abs_url = urljoin(base_url, line.strip())
-                        if abs_url.endswith(".m3u8"):
-                            # Sub-playlist — route back through this same endpoint
-                            lines.append(f"/api/moip/preview/stream?url={quote(abs_url, safe='')}{cb_suffix}")
-                        else:
-                            # Segment (.ts) — route through segment endpoint
-                            lines.append(f"/api/moip/preview/segment?url={quote(abs_url, safe='')}{cb_suffix}")
-                    else:
-                        lines.append(line)
-                manifest = "\n".join(lines) + "\n"
+                # One upstream fetch serves every tablet asking within the TTL;
+                # URLs are rewritten to go through our proxy
+                manifest = rewrite_manifest(relay.manifest(stream_url), stream_url, cb_suffix)
                 return Response(
                     manifest,
                     content_type="application/vnd.apple.mpegurl",
                     headers={"Cache-Control": "no-cache, no-store"},
                 )
             else:
-                # Legacy MJPEG proxy
-                upstream = http_requests.get(stream_url, stream=True, timeout=5)
-                content_type = upstream.headers.get("Content-Type", "multipart/x-mixed-replace; boundary=myboundary")
-                return Response(
-                    upstream.iter_content(chunk_size=4096),
-                    content_type=content_type,
-                )
+                # Legacy MJPEG: all viewers share one upstream connection
+                body, content_type = relay.open_mjpeg(stream_url)
+                return Response(body, content_type=content_type,
+                                headers={"Cache-Control": "no-cache, no-store"})
         except Exception as e:
             log.warning("Preview stream proxy failed: %s", e)
             return jsonify({"error": "Failed to connect to encoder"}), 502
 
     @app.route("/api/moip/preview/segment")
     def moip_preview_segment():
-        """Proxy an individual HLS .ts segment from the encoder."""
+        """Proxy an individual HLS .ts segment from the encoder (cached in the relay)."""
         seg_url = request.args.get("url", "")
         if not seg_url:
             return jsonify({"error": "Missing url parameter"}), 400
@@ -958,12 +1080,13 @@ def register_api_routes(ctx):
         encoder_ip = preview_cfg.get("encoder_ip", "")
         if encoder_ip and encoder_ip not in seg_url:
             return jsonify({"error": "Invalid segment URL"}), 403
+        relay = getattr(ctx, "preview_relay", None)
+        if relay is None:
+            return jsonify({"error": "Preview not enabled"}), 404
         try:
-            upstream = http_requests.get(seg_url, stream=True, timeout=10)
-            upstream.raise_for_status()
-            content_type = upstream.headers.get("Content-Type", "video/mp2t")
+            body, content_type = relay.segment(seg_url)
             return Response(
-                upstream.iter_content(chunk_size=8192),
+                body,
                 content_type=content_type,
                 headers={"Cache-Control": "no-cache, no-store", "Pragma": "no-cache"},
             )
@@ -1154,6 +1277,39 @@ def register_api_routes(ctx):
             socketio.emit("state:x32", {"event": "dca_volume_set", "dca": ch, "value": value}, room="x32")
         return jsonify(result), status
 
+    @app.route("/api/x32/batch", methods=["POST"])
+    def x32_batch():
+        """Several mute/volume changes at once: {"items": [{"strip": "ch", "num": 3, "mute": true}, ...]}."""
+        perm_err = check_permission(get_tablet_id(), "main", permissions_data)
+        if perm_err:
+            return perm_err
+        items = (request.get_json(silent=True) or {}).get("items")
+        if mock_mode:
+            count = len(items) if isinstance(items, list) else 0
+            return jsonify({"success": True, "results": [{"index": i, "success": True} for i in range(count)],
+                            "mock": True}), 200
+        result, status = ctx.x32.batch(items)
+        if status < 400:
+            socketio.emit("state:x32", {"event": "batch", "items": items}, room="x32")
+        return jsonify(result), status
+
+    @app.route("/api/x32/fade/<strip>/<int:num>", methods=["POST"])
+    def x32_fade(strip: str, num: int):
+        """Ramp a fader: {"db": -10, "seconds": 3} or {"value": 0.5, "seconds": 3, "wait": true}."""
+        perm_err = check_permission(get_tablet_id(), "main", permissions_data)
+        if perm_err:
+            return perm_err
+        data = request.get_json(silent=True) or {}
+        if mock_mode:
+            return jsonify({"success": True, "strip": strip, "num": num, "mock": True}), 200
+        result, status = ctx.x32.fade(strip, num, value=data.get("value"), db=data.get("db"),
+                                      seconds=data.get("seconds", 0), wait=bool(data.get("wait")))
+        if status < 400:
+            socketio.emit("state:x32", {"event": "fade", "strip": strip, "num": num,
+                                        "target": result["target"], "seconds": result["seconds"]},
+                          room="x32")
+        return jsonify(result), status
+
     # ---- X32 Audio Routing ----
 
     @app.route("/api/x32/routing/config")
@@ -1354,7 +1510,7 @@ def register_api_routes(ctx):
             except Exception as e:
                 logger.debug(f"Projector {key} status poll failed: {e}")
                 statuses[key] = {"name": proj.get("name", key), "power": "unknown", "reachable": False}
-        state_cache.set("projectors", statuses)
+        state_cache.publish("projectors", statuses)
         return jsonify(statuses), 200
 
     @app.route("/api/projector/<projector_key>/power", methods=["POST"])
@@ -1373,7 +1529,8 @@ def register_api_routes(ctx):
         tablet = get_tablet_id()
         start = time.time()
         try:
-            resp = http_requests.get(url, timeout=timeouts.get("projectors", 5))
+            with timed_command("projector"):
+                resp = http_requests.get(url, timeout=timeouts.get("projectors", 5))
             latency = (time.time() - start) * 1000
             db.log_action(tablet, "projector:power", projector_key, state,
                           f"status={resp.status_code}", latency)
@@ -1459,13 +1616,20 @@ def register_api_routes(ctx):
 
     # ---- WattBox (direct Telnet module) ----
 
+    _wattbox_memo: dict = {}
+    _wattbox_lock = threading.Lock()
+
     @app.route("/api/wattbox/devices")
     def wattbox_devices():
         """Get all WattBox PDU states — uses Telnet module (cached), falls back to HTTP."""
         wattbox = ctx.wattbox
         if wattbox and not mock_mode:
             result, status = wattbox.get_all_devices()
-            return jsonify(result), status
+            if status != 200:
+                return jsonify(result), status
+            with _wattbox_lock:
+                enc = _memo_encoded(_wattbox_memo, result)
+            return _encoded_response(enc)
 
         # Fallback: legacy HTTP polling (mock mode or module unavailable)
         wb_cfg = cfg.get("wattbox", {})
@@ -1490,7 +1654,9 @@ def register_api_routes(ctx):
             else:
                 entry["state"] = "on"
             result[key] = entry
-        return jsonify(result), 200
+        with _wattbox_lock:
+            enc = _memo_encoded(_wattbox_memo, result)
+        return _encoded_response(enc)
 
     @app.route("/api/wattbox/<device_key>/power", methods=["POST"])
     def wattbox_power(device_key: str):
@@ -1647,8 +1813,9 @@ def register_api_routes(ctx):
 
         for attempt in range(max_attempts):
             try:
-                resp = http_requests.post(url, headers=headers, json=data,
-                                          timeout=ha_cfg.get("timeout", 10))
+                with timed_command("ha"):
+                    resp = http_requests.post(url, headers=headers, json=data,
+                                              timeout=ha_cfg.get("timeout", 10))
                 last_resp = resp
                 latency = (time.time() - start) * 1000
                 if resp.status_code < 400:
@@ -2073,6 +2240,9 @@ def register_api_routes(ctx):
         except http_requests.ConnectionError:
             return "HA unreachable", 503
 
+    # Encoded lock list, reused until the HA device cache swaps in a new list
+    _locks_memo = {"locks": None, "enc": None}
+
     @app.route("/api/ha/locks")
     def ha_locks():
         if mock_mode:
@@ -2080,7 +2250,11 @@ def register_api_routes(ctx):
         with ctx.ha_cache_lock:
             if not ctx.ha_device_cache["ready"]:
                 return jsonify({"locks": [], "warming": True}), 200
-            return jsonify({"locks": ctx.ha_device_cache["locks"]}), 200
+            locks = ctx.ha_device_cache["locks"]
+            if _locks_memo["locks"] is not locks:
+                _locks_memo["enc"], _locks_memo["locks"] = PreEncoded({"locks": locks}), locks
+            enc = _locks_memo["enc"]
+        return _encoded_response(enc)
 
     # ---- Audit ----
 
@@ -2215,8 +2389,8 @@ def register_api_routes(ctx):
             _switches_cache.clear()
             _switches_cache_refs.update(cur_refs)
         if page not in _switches_cache:
-            _switches_cache[page] = _build_page_switches(page)
-        return jsonify(_switches_cache[page]), 200
+            _switches_cache[page] = PreEncoded(_build_page_switches(page))
+        return _encoded_response(_switches_cache[page])
 
     @app.route("/api/macro/execute", methods=["POST"])
     def api_macro_execute():
@@ -2259,17 +2433,22 @@ def register_api_routes(ctx):
             return {"macro": key, "label": label, "steps": expanded}
         return jsonify(_expand(macro_key)), 200
 
+    # Combined body is rebuilt only when one of its pre-encoded parts changes
+    _macro_state_memo = {"parts": None, "enc": None}
+
     @app.route("/api/macro/state")
     def api_macro_state():
-        ha_states = state_cache.get("ha") or {}
-        return jsonify({
-            "ha": ha_states,
-            "obs": state_cache.get("obs"),
-            "x32": state_cache.get("x32"),
-            "projectors": state_cache.get("projectors"),
-            "moip": state_cache.get("moip"),
-            "camlytics": state_cache.get("camlytics"),
-        }), 200
+        keys = ("ha", "obs", "x32", "projectors", "moip", "camlytics")
+        parts = tuple(state_cache.encoded(k) for k in keys)
+        memo = _macro_state_memo
+        if memo["parts"] is None or any(a is not b for a, b in zip(parts, memo["parts"])):
+            empty = {"ha": "{}"}
+            raw = "{" + ",".join(
+                f'"{k}":{p.raw if p is not None else empty.get(k, "null")}'
+                for k, p in zip(keys, parts)
+            ) + "}"
+            memo["enc"], memo["parts"] = PreEncoded(raw=raw), parts
+        return _encoded_response(memo["enc"])
 
     # ---- Macro Builder API ----
 
@@ -2489,7 +2668,8 @@ def register_api_routes(ctx):
 
     @app.route("/api/camlytics/state")
     def api_camlytics_state():
-        return jsonify(state_cache.get("camlytics") or {}), 200
+        enc = state_cache.encoded("camlytics")
+        return _encoded_response(enc if enc is not None else PreEncoded({}))
 
     @app.route("/api/camlytics/buffer", methods=["POST"])
     def api_camlytics_buffer():
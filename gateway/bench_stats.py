@@ -0,0 +1,26 @@
+"""Shared timing helpers for the simulator benchmarks (x32_bench, moip_bench)."""
+
+from __future__ import annotations
+
+import statistics
+from typing import Dict, List, Sequence, Tuple
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Milliseconds from samples in seconds: count, p50, p95, max."""
+    if not samples:
+        return {"n": 0}
+    ms = sorted(s * 1000 for s in samples)
+    return {
+        "n": len(ms),
+        "p50": round(statistics.median(ms), 2),
+        "p95": round(ms[min(len(ms) - 1, int(len(ms) * 0.95))], 2),
+        "max": round(ms[-1], 2),
+    }
+
+
+def print_table(rows: Sequence[Tuple[str, dict]]) -> None:
+    """Print ``(label, summarize() result)`` rows as an aligned table."""
+    print(f"{'':30} {'n':>5} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
+    for label, s in rows:
+        print(f"{label:30} {s.get('n', 0):>5} {s.get('p50', '-'):>9} {s.get('p95', '-'):>9} {s.get('max', '-'):>9}")
@@ -0,0 +1,117 @@
+"""Per-room Socket.IO emit coalescing.
+
+Bursts of state changes (a macro switching a dozen MoIP receivers, several
+WattBox outlets reporting at once, health checks finishing back to back)
+would otherwise each produce their own emit.  BroadcastScheduler holds the
+first update to a room/event for a short window, folds any further updates
+into it, and emits once when the window closes.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from metrics import ROOM_EMITS, ROOM_UPDATES_COALESCED
+
+logger = logging.getLogger("stp-gateway")
+
+MergeFn = Callable[[Any, Any], Any]
+
+
+def merge_dicts(old: dict, new: dict) -> dict:
+    """Shallow merge for payloads keyed by device (e.g. ``{pdu_id: states}``)."""
+    return {**old, **new}
+
+
+class BroadcastScheduler:
+    """Coalesce room state emits within a time window.
+
+    Exposes the same ``emit(event, data, room=...)`` signature as
+    ``SocketIO`` so it can be handed to anything that broadcasts.  Only
+    state-shaped events are held: *merge* maps an event name to
+    ``fn(pending, new) -> combined`` for payloads that fold (e.g.
+    state:patch deltas), and *latest* names events whose payload is the
+    whole state, so the newest replaces the pending one.  Anything else —
+    discrete events like a switch or a scene recall, where every message
+    counts — goes straight through, as do emits without a room or with a
+    window of 0.
+    """
+
+    def __init__(self, socketio, window_ms: float = 75,
+                 merge: Optional[Dict[str, MergeFn]] = None,
+                 latest: Iterable[str] = ()):
+        self._socketio = socketio
+        self._window = max(0.0, float(window_ms)) / 1000.0
+        self._merge: Dict[str, MergeFn] = dict(merge or {})
+        self._latest = frozenset(latest)
+        self._lock = threading.Lock()
+        self._pending: Dict[Tuple[str, str], Any] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    @property
+    def window_ms(self) -> float:
+        return self._window * 1000.0
+
+    def emit(self, event: str, data: Any = None, room: Optional[str] = None, **kwargs) -> None:
+        held = event in self._merge or event in self._latest
+        if room is None or self._window <= 0 or kwargs or not held:
+            self._socketio.emit(event, data, room=room, **kwargs)
+            if room is not None:
+                ROOM_EMITS.inc(room=room, event=event)
+                with self._lock:
+                    self._count(room, submitted=1, emitted=1)
+            return
+
+        key = (room, event)
+        with self._lock:
+            if key in self._pending:
+                merge = self._merge.get(event)
+                pending = self._pending[key]
+                self._pending[key] = merge(pending, data) if merge else data
+                self._count(room, submitted=1, saved=1)
+                ROOM_UPDATES_COALESCED.inc(room=room)
+                return
+            self._pending[key] = data
+            self._count(room, submitted=1)
+
+        timer = threading.Timer(self._window, self._flush, args=(key,))
+        timer.daemon = True
+        timer.start()
+
+    def _flush(self, key: Tuple[str, str]) -> None:
+        with self._lock:
+            if key not in self._pending:
+                return
+            data = self._pending.pop(key)
+            self._count(key[0], emitted=1)
+        room, event = key
+        ROOM_EMITS.inc(room=room, event=event)
+        try:
+            self._socketio.emit(event, data, room=room)
+        except Exception as e:
+            logger.debug(f"Broadcast {event} to {room} failed: {e}")
+
+    def flush_all(self) -> None:
+        """Emit everything pending now (used on shutdown and in tests)."""
+        with self._lock:
+            keys = list(self._pending)
+        for key in keys:
+            self._flush(key)
+
+    def _count(self, room: str, submitted: int = 0, emitted: int = 0, saved: int = 0) -> None:
+        s = self._stats.get(room)
+        if s is None:
+            s = self._stats[room] = {"submitted": 0, "emitted": 0, "saved": 0}
+        s["submitted"] += submitted
+        s["emitted"] += emitted
+        s["saved"] += saved
+
+    def stats(self) -> dict:
+        """Per-room counters: updates submitted, emits sent, emits saved."""
+        with self._lock:
+            return {
+                "window_ms": round(self.window_ms, 1),
+                "rooms": {room: dict(s) for room, s in self._stats.items()},
+            }
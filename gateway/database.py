@@ -7,6 +7,8 @@ import sqlite3
 import threading
 from typing import Any
 
+from metrics import DB_WRITE
+
 logger = logging.getLogger("stp-gateway")
 
 
@@ -108,12 +110,13 @@ class Database:
             actor = self._auto_actor(tablet_id)
         try:
             conn = self._get_conn()
-            conn.execute(
-                "INSERT INTO audit_log (tablet_id, action, target, request_data, result, latency_ms, actor) "
-                "VALUES (?, ?, ?, ?, ?, ?, ?)",
-                (tablet_id, action, target, request_data, result, latency_ms, actor or None),
-            )
-            conn.commit()
+            with DB_WRITE.time(op="log_action"):
+                conn.execute(
+                    "INSERT INTO audit_log (tablet_id, action, target, request_data, result, latency_ms, actor) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (tablet_id, action, target, request_data, result, latency_ms, actor or None),
+                )
+                conn.commit()
         except Exception as e:
             logger.warning(f"Audit log write failed: {e}")  # Never let audit logging crash a request
 
@@ -153,15 +156,16 @@ class Database:
     def upsert_session(self, tablet_id: str, display_name: str = "",
                        socket_id: str = "", current_page: str = ""):
         conn = self._get_conn()
-        conn.execute(
-            "INSERT INTO sessions (tablet_id, display_name, last_seen, socket_id, current_page) "
-            "VALUES (?, ?, datetime('now'), ?, ?) "
-            "ON CONFLICT(tablet_id) DO UPDATE SET "
-            "display_name=excluded.display_name, last_seen=datetime('now'), "
-            "socket_id=excluded.socket_id, current_page=excluded.current_page",
-            (tablet_id, display_name, socket_id, current_page),
-        )
-        conn.commit()
+        with DB_WRITE.time(op="upsert_session"):
+            conn.execute(
+                "INSERT INTO sessions (tablet_id, display_name, last_seen, socket_id, current_page) "
+                "VALUES (?, ?, datetime('now'), ?, ?) "
+                "ON CONFLICT(tablet_id) DO UPDATE SET "
+                "display_name=excluded.display_name, last_seen=datetime('now'), "
+                "socket_id=excluded.socket_id, current_page=excluded.current_page",
+                (tablet_id, display_name, socket_id, current_page),
+            )
+            conn.commit()
 
     def get_recent_logs(self, limit: int = 100) -> list:
         conn = self._get_conn()
@@ -264,13 +268,14 @@ class Database:
                          macro_key: str = "", retention_hours: int = 12) -> int:
         """Insert a notification and return its ID."""
         conn = self._get_conn()
-        cur = conn.execute(
-            "INSERT INTO notifications (label, type, message, details, source, macro_key, expires_at) "
-            "VALUES (?, ?, ?, ?, ?, ?, datetime('now', ?))",
-            (label, ntype, message, details or None, source, macro_key or None,
-             f"+{retention_hours} hours"),
-        )
-        conn.commit()
+        with DB_WRITE.time(op="add_notification"):
+            cur = conn.execute(
+                "INSERT INTO notifications (label, type, message, details, source, macro_key, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, datetime('now', ?))",
+                (label, ntype, message, details or None, source, macro_key or None,
+                 f"+{retention_hours} hours"),
+            )
+            conn.commit()
         return cur.lastrowid
 
     def get_notifications(self, tablet_id: str, limit: int = 50) -> list:
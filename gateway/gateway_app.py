@@ -37,7 +37,8 @@ from flask_socketio import SocketIO
 
 # Local modules
 from database import Database
-from polling import StateCache, PollerWatchdog
+from polling import StateCache, PollerWatchdog, PreEncodedJSON, RoomPresence
+from broadcast import BroadcastScheduler, merge_dicts
 from macro_engine import load_macros
 
 
@@ -212,11 +213,16 @@ class GatewayContext:
     def __init__(self):
         self.app = None
         self.socketio = None
+        self.broadcaster = None
         self.cfg = None
         self.logger = None
         self.db = None
         self.state_cache = None
         self.watchdog = None
+        self.room_presence = None
+        self.poll_scheduler = None
+        self.meter_stream = None
+        self.preview_relay = None
         self.mock_mode = False
         self.config_path = ""
         self.start_time = 0.0
@@ -301,6 +307,7 @@ def create_app(cfg: dict, mock_mode: bool = False, config_path: str = "config.ya
         cors_allowed_origins="*",
         ping_timeout=60,
         ping_interval=15,
+        json=PreEncodedJSON,  # splice StateCache's pre-encoded payloads as-is
     )
 
     logger = setup_logging(cfg)
@@ -315,7 +322,16 @@ def create_app(cfg: dict, mock_mode: bool = False, config_path: str = "config.ya
             _eio_lg.addHandler(h)
 
     db = Database(cfg.get("database", {}).get("path", "stp_gateway.db"))
-    state_cache = StateCache()
+    # Room state emits go through the coalescing scheduler; bursts within
+    # the window become one message per room/event
+    broadcaster = BroadcastScheduler(
+        socketio,
+        window_ms=cfg.get("broadcast", {}).get("coalesce_ms", 75),
+        merge={"state:patch": StateCache.compose, "state:wattbox": merge_dicts},
+    )
+    state_cache = StateCache(
+        broadcaster, history=int(cfg.get("state_cache", {}).get("history", StateCache.HISTORY_LEN))
+    )
     watchdog = PollerWatchdog()
 
     # Initialize device modules
@@ -332,15 +348,14 @@ def create_app(cfg: dict, mock_mode: bool = False, config_path: str = "config.ya
 
     from wattbox_module import WattBoxModule
     wattbox = None if mock_mode else WattBoxModule(
-        cfg.get("wattbox", {}), logger, socketio=socketio
+        cfg.get("wattbox", {}), logger, socketio=broadcaster
     )
 
     from health_module import HealthModule
     health = None if mock_mode else HealthModule(cfg, logger)
     if health:
         def _broadcast_health(summary):
-            state_cache.set("health", summary)
-            socketio.emit("state:health", summary, room="health")
+            state_cache.publish("health", summary)
         health._on_summary_change = _broadcast_health
         health._wattbox = wattbox
 
@@ -362,16 +377,32 @@ def create_app(cfg: dict, mock_mode: bool = False, config_path: str = "config.ya
     ctx.start_time = time.time()
     ctx.app = app
     ctx.socketio = socketio
+    ctx.broadcaster = broadcaster
     ctx.cfg = cfg
     ctx.logger = logger
     ctx.db = db
     ctx.state_cache = state_cache
     ctx.watchdog = watchdog
+    ctx.room_presence = RoomPresence()
     ctx.mock_mode = mock_mode
     ctx.config_path = config_path
 
     ctx.x32 = x32
+    if x32 is not None:
+        from meter_stream import MeterStream
+        meters_cfg = cfg.get("x32", {}).get("meters", {}) or {}
+        ctx.meter_stream = MeterStream(x32, socketio, fps=meters_cfg.get("fps", 20))
     ctx.moip = moip
+    preview_cfg = cfg.get("moip", {}).get("preview", {}) or {}
+    if preview_cfg.get("enabled"):
+        from preview_relay import PreviewRelay
+        relay_cfg = preview_cfg.get("relay", {}) or {}
+        ctx.preview_relay = PreviewRelay(
+            cache_mb=relay_cfg.get("cache_mb", 32),
+            manifest_ttl_ms=relay_cfg.get("manifest_ttl_ms", 1000),
+            segment_ttl_seconds=relay_cfg.get("segment_ttl_seconds", 10),
+            linger_seconds=relay_cfg.get("linger_seconds", 2),
+        )
     ctx.obs = obs
     ctx.wattbox = wattbox
     ctx.health = health
@@ -448,7 +479,7 @@ def create_app(cfg: dict, mock_mode: bool = False, config_path: str = "config.ya
     register_socket_handlers(ctx)
 
     # Store references for use in main and shutdown
-    app._modules = {"x32": x32, "moip": moip, "obs": obs, "wattbox": wattbox, "health": health, "occupancy": occupancy, "announcements": announcements, "event_automation": event_automation}
+    app._modules = {"x32_meters": ctx.meter_stream, "preview_relay": ctx.preview_relay, "x32": x32, "moip": moip, "obs": obs, "wattbox": wattbox, "health": health, "occupancy": occupancy, "announcements": announcements, "event_automation": event_automation}
     app._db = db
     app._ctx = ctx
 
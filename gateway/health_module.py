@@ -170,14 +170,15 @@ class HealthModule:
             self._heartbeats[tablet_id] = time.time()
         self._logger.debug(f"Health heartbeat: tablet_id={tablet_id}")
 
-    def get_heartbeats(self) -> dict:
-        """Return heartbeat data."""
+    def get_heartbeats(self, absolute: bool = False) -> dict:
+        """Return heartbeat data: seconds since each tablet's last heartbeat,
+        or with *absolute* its epoch time (stable between heartbeats)."""
         now = time.time()
         with self._lock:
             hb = dict(self._heartbeats)
         return {
             "count": len(hb),
-            "tablets": {tid: round(now - ts, 1) for tid, ts in hb.items()},
+            "tablets": {tid: round(ts if absolute else now - ts, 1) for tid, ts in hb.items()},
         }
 
     def force_check_now(self):
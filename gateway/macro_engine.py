@@ -7,6 +7,7 @@ import json
 import logging
 import os
 import socket
+import threading
 import time
 from typing import Any, Dict, List, Optional, Set
 
@@ -14,6 +15,7 @@ import requests as http_requests
 import yaml
 
 from auth import get_tablet_id
+from metrics import timed_command
 
 logger = logging.getLogger("stp-gateway")
 
@@ -289,6 +291,27 @@ def _force_ha_entity_refresh(ctx, entity_ids: list):
             logger.debug(f"HA update_entity for {eid} failed: {e}")
 
 
+# ---------------------------------------------------------------------------
+# Macro activity — pollers tighten their intervals while macros run
+# ---------------------------------------------------------------------------
+
+# Devices keep settling (projectors warming, HA entities updating) for a
+# while after the last step, so activity lingers past the macro's end.
+MACRO_ACTIVITY_LINGER_S = 30.0
+
+_activity_lock = threading.Lock()
+_active_macros = 0
+_last_macro_end = 0.0
+
+
+def macro_activity() -> bool:
+    """True while any macro runs and for MACRO_ACTIVITY_LINGER_S after."""
+    with _activity_lock:
+        if _active_macros:
+            return True
+        return bool(_last_macro_end) and time.time() - _last_macro_end < MACRO_ACTIVITY_LINGER_S
+
+
 # ---------------------------------------------------------------------------
 # Macro execution
 # ---------------------------------------------------------------------------
@@ -301,6 +324,25 @@ def execute_macro(ctx, macro_key: str, tablet: str, depth: int = 0,
     prefix: current nesting path (e.g., "0." for first nested macro).
     verify_queue: shared verification queue (created at top-level, passed to children).
     """
+    global _active_macros, _last_macro_end
+    if depth > 0:
+        return _run_macro(ctx, macro_key, tablet, depth, skip_steps, prefix, verify_queue)
+    with _activity_lock:
+        _active_macros += 1
+    # Cut short the pollers' sleep so they pick up the faster pace now
+    if getattr(ctx, "poll_scheduler", None) is not None:
+        ctx.poll_scheduler.wake()
+    try:
+        return _run_macro(ctx, macro_key, tablet, depth, skip_steps, prefix, verify_queue)
+    finally:
+        with _activity_lock:
+            _active_macros -= 1
+            _last_macro_end = time.time()
+
+
+def _run_macro(ctx, macro_key: str, tablet: str, depth: int,
+               skip_steps: Optional[set], prefix: str,
+               verify_queue: Optional[_VerificationQueue]) -> dict:
     if skip_steps is None:
         skip_steps = set()
     # Top-level invocation creates and owns the verification queue
@@ -499,13 +541,14 @@ def execute_macro(ctx, macro_key: str, tablet: str, depth: int = 0,
                   json.dumps({"label": label, "steps": len(steps)}),
                   f"OK {completed}/{len(steps)} steps", overall_ms)
 
-    # Force fresh MoIP state broadcast so button highlights update immediately
+    # Publish the MoIP receiver map so button highlights update immediately
+    # (switches already wrote through to it; no controller round trip unless
+    # a reconcile is due)
     try:
         if ctx.moip is not None:
             fresh, fresh_status = ctx.moip.get_receivers()
             if fresh_status < 400 and fresh:
-                ctx.state_cache.set("moip", fresh)
-                socketio.emit("state:moip", fresh, room="moip")
+                ctx.state_cache.publish("moip", fresh)
     except Exception as e:
         logger.debug(f"MoIP state refresh after macro failed: {e}")
 
@@ -532,8 +575,7 @@ def _refresh_ha_state(ctx):
     try:
         ha_fresh = fetch_ha_button_states(ctx)
         if ha_fresh:
-            ctx.state_cache.set("ha", ha_fresh)
-            ctx.socketio.emit("state:ha", ha_fresh, room="ha")
+            ctx.state_cache.publish("ha", ha_fresh)
     except Exception as e:
         logger.debug(f"HA state refresh after macro: {e}")
 
@@ -568,8 +610,12 @@ def _execute_step(ctx, step: dict, tablet: str, depth: int,
             return _step_door_timed_unlock(ctx, step, tablet)
         elif step_type == "moip_switch":
             return _step_moip_switch(ctx, step, tablet)
+        elif step_type == "moip_switch_many":
+            return _step_moip_switch_many(ctx, step, tablet)
         elif step_type == "moip_ir":
             return _step_moip_ir(ctx, step, tablet)
+        elif step_type == "moip_ir_burst":
+            return _step_moip_ir_burst(ctx, step, tablet)
         elif step_type == "epson_power":
             return _step_epson_power(ctx, step, tablet)
         elif step_type == "epson_all":
@@ -580,6 +626,10 @@ def _execute_step(ctx, step: dict, tablet: str, depth: int,
             return _step_x32_mute(ctx, step, tablet)
         elif step_type == "x32_aux_mute":
             return _step_x32_aux_mute(ctx, step, tablet)
+        elif step_type == "x32_fade":
+            return _step_x32_fade(ctx, step, tablet)
+        elif step_type == "x32_batch":
+            return _step_x32_batch(ctx, step, tablet)
         elif step_type == "wattbox_power":
             result = _step_wattbox_power(ctx, step, tablet)
             # Queue verification same as ha_service — verify_pending will
@@ -694,15 +744,16 @@ def _step_ha_service(ctx, step: dict, tablet: str) -> dict:
 
     for attempt in range(max_attempts):
         try:
-            resp = http_requests.post(
-                f"{ha_cfg['url']}/api/services/{domain}/{service}",
-                headers={
-                    "Authorization": f"Bearer {ha_cfg['token']}",
-                    "Content-Type": "application/json",
-                },
-                json=data,
-                timeout=ha_cfg.get("timeout", 10),
-            )
+            with timed_command("ha"):
+                resp = http_requests.post(
+                    f"{ha_cfg['url']}/api/services/{domain}/{service}",
+                    headers={
+                        "Authorization": f"Bearer {ha_cfg['token']}",
+                        "Content-Type": "application/json",
+                    },
+                    json=data,
+                    timeout=ha_cfg.get("timeout", 10),
+                )
             last_status = resp.status_code
             ok = resp.status_code < 400
             if verbose.is_set():
@@ -838,10 +889,50 @@ def _step_moip_switch(ctx, step: dict, tablet: str) -> dict:
                       json.dumps({"tx": tx, "rx": rx}),
                       "OK" if ok else f"FAILED status={status}", latency)
     if ok:
-        ctx.socketio.emit("state:moip", {"event": "switch", "data": {"transmitter": tx, "receiver": rx}}, room="moip")
+        ctx.broadcaster.emit("moip:event", {"event": "switch", "data": {"transmitter": tx, "receiver": rx}}, room="moip")
     return {"success": ok, "error": "" if ok else f"MoIP switch failed: tx={tx}, rx={rx}, status={status}"}
 
 
+def _switch_many_routes(step: dict) -> list:
+    """``switches: [{tx, rx}, ...]``, or one ``tx`` with a list (or comma string) of ``rx``."""
+    if "switches" in step:
+        return step.get("switches") or []
+    rx = step.get("rx", [])
+    if isinstance(rx, str):
+        rx = [r for r in rx.replace(" ", "").split(",") if r]
+    elif not isinstance(rx, list):
+        rx = [rx]
+    return [{"tx": step.get("tx", ""), "rx": r} for r in rx]
+
+
+def _step_moip_switch_many(ctx, step: dict, tablet: str) -> dict:
+    switches = _switch_many_routes(step)
+    if ctx.mock_mode:
+        return {"success": True}
+    start = time.time()
+    result, status = ctx.moip.switch_many(switches)
+    latency = (time.time() - start) * 1000
+    ok = status < 400
+    routes = [f"TX{r['transmitter']}->RX{r['receiver']}" for r in result.get("results", [])]
+    failed = [f"RX{r['receiver']}" for r in result.get("results", []) if not r["success"]]
+    if not ok:
+        outcome = f"FAILED status={status}"
+    elif failed:
+        outcome = f"REJECTED {', '.join(failed)}"
+    else:
+        outcome = f"OK {', '.join(routes)}"
+    ctx.db.log_action(tablet, "macro:moip_switch_many", f"{len(routes)}_receivers",
+                      json.dumps({"switches": switches}), outcome, latency)
+    if not ok:
+        return {"success": False, "error": f"MoIP switch_many failed: {result.get('error', '')} status={status}"}
+    ctx.broadcaster.emit("moip:event", {"event": "switch_many", "data": [
+        {"transmitter": r["transmitter"], "receiver": r["receiver"]}
+        for r in result["results"] if r["success"]]}, room="moip")
+    if failed:
+        return {"success": False, "error": f"MoIP rejected switching {', '.join(failed)}"}
+    return {"success": True}
+
+
 def _step_moip_ir(ctx, step: dict, tablet: str) -> dict:
     rx = str(step.get("receiver", ""))
     code_name = step.get("code", "")
@@ -869,6 +960,30 @@ def _step_moip_ir(ctx, step: dict, tablet: str) -> dict:
     return {"success": ok, "error": "" if ok else f"IR failed: receiver={rx}, code={code}, status={status}"}
 
 
+def _step_moip_ir_burst(ctx, step: dict, tablet: str) -> dict:
+    rx = str(step.get("receiver", ""))
+    code_name = step.get("code", "")
+    count = step.get("count", 1)
+    ir_codes = ctx.devices_data.get("moip", {}).get("irCodes", {})
+    if code_name not in ir_codes:
+        logger.warning(f"IR code name '{code_name}' not found in devices.json irCodes")
+    if ctx.mock_mode:
+        return {"success": True}
+    start = time.time()
+    # Wait for the last press so the next step sees the device after the burst
+    result, status = ctx.moip.ir_burst("0", rx, ir_codes.get(code_name, code_name), count=count,
+                                       rate_hz=step.get("rate_hz", 5), wait=True)
+    latency = (time.time() - start) * 1000
+    ok = status < 400
+    ctx.db.log_action(tablet, "macro:moip_ir_burst", f"RX{rx}:{code_name}x{count}",
+                      json.dumps({"rx": rx, "code_name": code_name, "count": count}),
+                      f"OK sent={result.get('sent')}" if ok else f"FAILED status={status}", latency)
+    if not ok:
+        logger.warning(f"moip_ir_burst FAILED: receiver={rx}, code={code_name}, status={status}")
+    return {"success": ok, "error": "" if ok else f"IR burst failed: receiver={rx}, code={code_name}, "
+                                                  f"{result.get('error', '')} status={status}"}
+
+
 def _step_epson_power(ctx, step: dict, tablet: str) -> dict:
     key = step.get("projector", "")
     state = step.get("state", "on")
@@ -885,8 +1000,9 @@ def _step_epson_power(ctx, step: dict, tablet: str) -> dict:
     for attempt in range(max_attempts):
         try:
             start = time.time()
-            resp = http_requests.get(
-                f"http://{proj['ip']}/api/v01/contentmgr/remote/power/{state}", timeout=20)
+            with timed_command("projector"):
+                resp = http_requests.get(
+                    f"http://{proj['ip']}/api/v01/contentmgr/remote/power/{state}", timeout=20)
             latency = (time.time() - start) * 1000
             ok = resp.status_code == 200
             ctx.socketio.emit("state:projectors", {"event": "power", "projector": key, "state": state}, room="projectors")
@@ -1047,6 +1163,53 @@ def _step_x32_aux_mute(ctx, step: dict, tablet: str) -> dict:
     return {"success": False, "error": error_detail or f"X32 aux{ch} mute failed"}
 
 
+def _step_x32_fade(ctx, step: dict, tablet: str) -> dict:
+    strip = step.get("strip", "ch")
+    ch = step.get("channel", 1)
+    seconds = step.get("seconds", 0)
+    if ctx.mock_mode:
+        return {"success": True}
+    start = time.time()
+    result, status = ctx.x32.fade(strip, ch, value=step.get("value"), db=step.get("db"),
+                                  seconds=seconds, wait=step.get("wait", True))
+    latency = (time.time() - start) * 1000
+    ok = status < 400
+    error_detail = "" if ok else (result.get("error", "") if isinstance(result, dict) else str(result))
+    ctx.db.log_action(tablet, "macro:x32_fade", f"{strip}{ch}",
+                      json.dumps({"strip": strip, "channel": ch, "value": step.get("value"),
+                                  "db": step.get("db"), "seconds": seconds}),
+                      "OK" if ok else f"FAILED: {error_detail}" if error_detail else "FAILED", latency)
+    if ok:
+        ctx.socketio.emit("state:x32", {"event": "fade", "strip": strip, "num": ch,
+                                        "target": result["target"], "seconds": result["seconds"]},
+                          room="x32")
+        return {"success": True}
+    return {"success": False, "error": error_detail or f"X32 fade {strip}{ch} failed"}
+
+
+def _step_x32_batch(ctx, step: dict, tablet: str) -> dict:
+    items = step.get("items", [])
+    if ctx.mock_mode:
+        return {"success": True}
+    start = time.time()
+    result, status = ctx.x32.batch(items)
+    latency = (time.time() - start) * 1000
+    failed = [r for r in result.get("results", []) if not r.get("success")] if status < 400 else []
+    ok = status < 400 and not failed
+    if status >= 400:
+        error_detail = result.get("error", "") if isinstance(result, dict) else str(result)
+    else:
+        error_detail = "; ".join(f"item {r['index']}: {r.get('error', 'failed')}" for r in failed)
+    ctx.db.log_action(tablet, "macro:x32_batch", f"{len(items) if isinstance(items, list) else 0}_items",
+                      json.dumps({"items": items}),
+                      "OK" if ok else f"FAILED: {error_detail}" if error_detail else "FAILED", latency)
+    if status < 400:
+        ctx.socketio.emit("state:x32", {"event": "batch", "items": items}, room="x32")
+    if ok:
+        return {"success": True}
+    return {"success": False, "error": error_detail or "X32 batch failed"}
+
+
 def _step_obs_emit(ctx, step: dict, tablet: str) -> dict:
     action = step.get("action", "")
     payload = step.get("data")
@@ -1468,8 +1631,16 @@ def step_summary(step: dict, macro_defs: dict) -> str:
         return f"Unlock {step.get('entity', '')} for {step.get('minutes', 60)} min"
     elif t == "moip_switch":
         return f"Switch TX {step.get('tx', '')} → RX {step.get('rx', '')}"
+    elif t == "moip_switch_many":
+        routes = _switch_many_routes(step)
+        txs = {str(r.get("tx", r.get("transmitter", ""))) for r in routes if isinstance(r, dict)}
+        if len(txs) == 1:
+            return f"Switch TX {txs.pop()} → {len(routes)} receivers"
+        return f"Switch {len(routes)} receivers"
     elif t == "moip_ir":
         return f"IR {step.get('code', '')} → RX {step.get('receiver', '')}"
+    elif t == "moip_ir_burst":
+        return f"IR {step.get('code', '')} ×{step.get('count', 1)} → RX {step.get('receiver', '')}"
     elif t == "epson_power":
         return f"Projector {step.get('projector', '')} {step.get('state', '')}"
     elif t == "epson_all":
@@ -1480,6 +1651,11 @@ def step_summary(step: dict, macro_defs: dict) -> str:
         return f"X32 mute ch{step.get('channel', '')} {step.get('state', '')}"
     elif t == "x32_aux_mute":
         return f"X32 aux{step.get('channel', '')} mute {step.get('state', '')}"
+    elif t == "x32_batch":
+        return f"X32 batch ({len(step.get('items') or [])} changes)"
+    elif t == "x32_fade":
+        level = f"{step['db']} dB" if step.get("db") is not None else step.get("value", "")
+        return f"X32 fade {step.get('strip', 'ch')}{step.get('channel', '')} to {level} over {step.get('seconds', 0)}s"
     elif t == "wattbox_power":
         return f"WattBox {step.get('action', '')} {step.get('device', '')}"
     elif t == "wattbox_reboot":
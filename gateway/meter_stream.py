@@ -0,0 +1,122 @@
+"""X32 level meters streamed to the ``x32_meters`` Socket.IO room.
+
+The mixer only sends /meters while someone keeps renewing the request, so
+the stream runs only while at least one tablet is in the room.  One mixer
+subscription feeds every tablet: each tick reads the latest packed frame
+from the X32 module (built once per mixer update) and sends it, as a
+binary attachment, to each member whose own frame-rate cap allows it.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+from metrics import ROOM_EMITS
+
+logger = logging.getLogger("stp-gateway")
+
+METER_ROOM = "x32_meters"
+METER_EVENT = "x32:meters"
+
+
+class MeterStream:
+    """Fan the X32 meter frames out to room members at their own rate.
+
+    *fps* is the ceiling for everyone; a tablet may ask for less when it
+    joins (``{"room": "x32_meters", "fps": 10}``).  Frames a tablet is not
+    due for are skipped, never queued, so a slow client only ever gets the
+    newest levels.
+    """
+
+    def __init__(self, x32, socketio, fps: float = 20.0, renew_seconds: float = 8.0):
+        self._x32 = x32
+        self._socketio = socketio
+        self._fps = min(50.0, max(1.0, float(fps)))
+        self._renew_seconds = renew_seconds
+        self._cond = threading.Condition()
+        # sid -> [min seconds between frames, next due (monotonic), last sequence sent]
+        self._clients: Dict[str, list] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._last_renew = 0.0
+        self.frames_sent = 0
+
+    def join(self, sid: str, fps: Optional[float] = None) -> float:
+        """Add *sid*; returns the frame rate it will actually get."""
+        rate = self._fps
+        try:
+            if fps:
+                rate = min(self._fps, max(1.0, float(fps)))
+        except (TypeError, ValueError):
+            pass
+        with self._cond:
+            self._clients[sid] = [1.0 / rate, 0.0, 0]
+            self._cond.notify_all()
+            # Under the lock so two first joins can't both start a thread
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        return rate
+
+    def leave(self, sid: str) -> None:
+        with self._cond:
+            self._clients.pop(sid, None)
+
+    def stop(self) -> None:
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+
+    @property
+    def members(self) -> int:
+        return len(self._clients)
+
+    def tick(self, now: Optional[float] = None) -> int:
+        """Renew the mixer subscription if due and send frames; returns sends."""
+        now = time.monotonic() if now is None else now
+        if now - self._last_renew >= self._renew_seconds:
+            # Only stamp a successful renew so a mixer coming back online
+            # gets its subscription on the next tick
+            if self._x32.renew_meters():
+                self._last_renew = now
+        seq, frame = self._x32.meter_frame()
+        if not seq:
+            return 0
+        with self._cond:
+            due = []
+            for sid, client in self._clients.items():
+                interval, next_due, last_seq = client
+                if now >= next_due and seq != last_seq:
+                    # Keep the client's cadence, but don't burst to catch up
+                    client[1] = next_due + interval if now - next_due < interval else now + interval
+                    client[2] = seq
+                    due.append(sid)
+        for sid in due:
+            try:
+                self._socketio.emit(METER_EVENT, frame, to=sid)
+            except Exception as e:
+                logger.debug(f"Meter frame to {sid} failed: {e}")
+        if due:
+            self.frames_sent += len(due)
+            ROOM_EMITS.inc(len(due), room=METER_ROOM, event=METER_EVENT)
+        return len(due)
+
+    def _run(self) -> None:
+        interval = 1.0 / self._fps
+        while not self._stop.is_set():
+            with self._cond:
+                while not self._clients and not self._stop.is_set():
+                    # Room empty: stop renewing and let the mixer's stream lapse
+                    self._last_renew = 0.0
+                    self._cond.wait()
+            if self._stop.is_set():
+                return
+            started = time.monotonic()
+            try:
+                self.tick(started)
+            except Exception as e:
+                logger.debug(f"Meter stream tick failed: {e}")
+            self._stop.wait(max(0.0, interval - (time.monotonic() - started)))
@@ -0,0 +1,277 @@
+"""In-process metrics: counters, gauges and fixed-bucket histograms.
+
+Modules record into the module-level metrics defined at the bottom of this
+file; ``/api/metrics`` renders the whole registry in the Prometheus text
+exposition format.  Everything is in memory and resets on restart — this
+is for seeing where time goes during a service, not long-term storage.
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+LabelKey = Tuple[str, ...]
+
+# Seconds; spans a fast UDP set (~1 ms) to a slow HTTP retry (~10 s)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelKey:
+        if set(labels) != set(self.labels):
+            raise ValueError(f"{self.name} expects labels {self.labels}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labels)
+
+    def _label_str(self, key: LabelKey, extra: str = "") -> str:
+        parts = [f'{n}="{_escape(v)}"' for n, v in zip(self.labels, key)]
+        if extra:
+            parts.append(extra)
+        return "{" + ",".join(parts) + "}" if parts else ""
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonic count per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{self._label_str(k)} {_fmt(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    """Point-in-time value per label set."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: Dict[LabelKey, float] = {}
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def value(self, **labels) -> Optional[float]:
+        with self._lock:
+            return self._values.get(self._key(labels))
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{self._label_str(k)} {_fmt(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    """Observations counted into fixed cumulative buckets (seconds)."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [per-bucket counts (+Inf last), sum, count]
+        self._series: Dict[LabelKey, list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            s = self._series.get(key)
+            if s is None:
+                s = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            s[0][idx] += 1
+            s[1] += value
+            s[2] += 1
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """Observe the wall time of the ``with`` block (also on exceptions)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            s = self._series.get(self._key(labels))
+            return s[2] if s else 0
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, (list(s[0]), s[1], s[2])) for k, s in self._series.items())
+        lines = []
+        for key, (counts, total, n) in items:
+            cumulative = 0
+            for bound, c in zip(self.buckets + (float("inf"),), counts):
+                cumulative += c
+                le = f'le="{_fmt(bound)}"'
+                lines.append(f"{self.name}_bucket{self._label_str(key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{self._label_str(key)} {_fmt(total)}")
+            lines.append(f"{self.name}_count{self._label_str(key)} {n}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named collection of metrics rendered together."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _add(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labels != metric.labels:
+                    raise ValueError(f"metric {metric.name} already registered differently")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, labels: Sequence[str] = ()) -> Gauge:
+        return self._add(Gauge(name, help, labels))
+
+    def histogram(self, name: str, help: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, help, labels, buckets))
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            metrics = [self._metrics[n] for n in sorted(self._metrics)]
+        lines: List[str] = []
+        for m in metrics:
+            lines.extend(m.render())
+        return "\n".join(lines) + "\n"
+
+
+# =============================================================================
+# GATEWAY METRICS
+# =============================================================================
+
+registry = MetricsRegistry()
+
+POLL_DURATION = registry.histogram(
+    "stp_poll_duration_seconds", "Time spent in one poll cycle.", ["poller"])
+POLL_OVERRUNS = registry.counter(
+    "stp_poll_overruns_total", "Poll cycles that ran past their deadline.", ["poller"])
+POLLER_HEARTBEAT_AGE = registry.gauge(
+    "stp_poller_heartbeat_age_seconds", "Seconds since the poller last succeeded.", ["poller"])
+CIRCUIT_OPEN = registry.gauge(
+    "stp_circuit_open", "1 while the poller's circuit breaker is open.", ["poller"])
+
+X32_SNAPSHOT = registry.histogram(
+    "stp_x32_snapshot_seconds", "Time to build one X32 snapshot (hot fields only, or full).",
+    ["tier"])
+X32_SNAPSHOT_PROGRESS = registry.gauge(
+    "stp_x32_snapshot_progress", "Fraction of the running (or last) X32 snapshot answered.")
+X32_SNAPSHOT_YIELDS = registry.counter(
+    "stp_x32_snapshot_yields_total", "Times an X32 snapshot paused to let a command run.")
+X32_COMMAND_WAIT = registry.histogram(
+    "stp_x32_command_wait_seconds", "Time an X32 command waited for the mixer connection.")
+X32_FADER_SENDS = registry.counter(
+    "stp_x32_fader_sends_total", "Fader sets sent by the X32 fader engine.")
+X32_FADER_COALESCED = registry.counter(
+    "stp_x32_fader_coalesced_total", "Fader targets replaced before they were sent.")
+
+MOIP_IR_PRESSES = registry.counter(
+    "stp_moip_ir_presses_total", "IR presses sent through MoIP, including repeats.")
+
+DEVICE_COMMAND = registry.histogram(
+    "stp_device_command_seconds", "Round-trip time of one device command.", ["device"])
+DEVICE_COMMAND_ERRORS = registry.counter(
+    "stp_device_command_errors_total", "Device commands that failed.", ["device"])
+
+ROOM_EMITS = registry.counter(
+    "stp_room_emits_total", "Socket.IO emits sent to a room.", ["room", "event"])
+ROOM_UPDATES_COALESCED = registry.counter(
+    "stp_room_updates_coalesced_total", "Room updates folded into a pending emit.", ["room"])
+ROOM_WATCHERS = registry.gauge(
+    "stp_room_watchers", "Tablets currently joined to a room.", ["room"])
+
+
+PREVIEW_UPSTREAM = registry.counter(
+    "stp_preview_upstream_requests_total", "Requests the preview relay made to the encoder.", ["kind"])
+PREVIEW_CACHE_HITS = registry.counter(
+    "stp_preview_cache_hits_total", "Preview requests served without a new encoder request.", ["kind"])
+PREVIEW_FRAMES_DROPPED = registry.counter(
+    "stp_preview_frames_dropped_total", "MJPEG frames skipped for viewers that fell behind.")
+PREVIEW_VIEWERS = registry.gauge(
+    "stp_preview_viewers", "Tablets currently watching an MJPEG preview.")
+
+
+def record_command(device: str, started: float, ok: bool) -> None:
+    """Record one device command begun at ``time.perf_counter()`` *started*."""
+    DEVICE_COMMAND.observe(time.perf_counter() - started, device=device)
+    if not ok:
+        DEVICE_COMMAND_ERRORS.inc(device=device)
+
+
+@contextmanager
+def timed_command(device: str) -> Iterator[None]:
+    """Record the ``with`` block as one command; an exception counts as an error."""
+    started = time.perf_counter()
+    ok = False
+    try:
+        yield
+        ok = True
+    finally:
+        record_command(device, started, ok)
+
+
+DB_WRITE = registry.histogram(
+    "stp_db_write_seconds", "SQLite write latency including commit.", ["op"])
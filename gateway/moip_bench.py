@@ -0,0 +1,200 @@
+"""
+MoIP benchmark — times the gateway's MoIP code against the simulator.
+
+Reports:
+  - per-command latency (?Receivers, ?Devices, !Switch, !IR)
+  - batch switch throughput (switch_many vs one switch() per receiver)
+  - reconnect time after the controller drops the connection
+  - failover time from the internal host to the external one
+
+    python moip_bench.py                        # instant controller
+    python moip_bench.py --latency 5 --jitter 2 --json
+
+Uses in-process MoIPSimulators for the internal and external hosts unless
+--target host:port points at another one (the failover phase is skipped
+then — it would need the target to go away).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import statistics
+import time
+from typing import Callable, Dict, List, Optional
+
+from bench_stats import print_table, summarize
+from moip_module import MoIPModule
+from moip_sim import MoIPSimulator
+
+logger = logging.getLogger("stp-gateway")
+
+
+def _module(internal: tuple, external: tuple) -> MoIPModule:
+    # Keepalive/IR threads stay off: the benchmark drives every command itself
+    return MoIPModule({"host_internal": internal[0], "port_internal": internal[1],
+                       "host_external": external[0], "port_external": external[1],
+                       "telnet_read_timeout": 2}, logger)
+
+
+def _time(fn: Callable[[], tuple], runs: int) -> Dict[str, float]:
+    samples, failures = [], 0
+    for _ in range(runs):
+        started = time.perf_counter()
+        _, status = fn()
+        samples.append(time.perf_counter() - started)
+        failures += status >= 400
+    return {**summarize(samples), "failures": failures}
+
+
+def bench_commands(moip: MoIPModule, commands: int) -> Dict[str, dict]:
+    return {
+        "receivers": _time(lambda: moip.get_receivers(force=True), commands),
+        "devices": _time(moip.get_devices, commands),
+        "switch": _time(lambda: moip.switch("1", "1"), commands),
+        "ir": _time(lambda: moip.send_ir("0", "1", "BENCH"), commands),
+    }
+
+
+def bench_batch(moip: MoIPModule, batch: int, runs: int) -> Dict[str, dict]:
+    """Route *batch* receivers: one switch_many vs a switch() each plus a read-back."""
+    receivers = [str(rx) for rx in range(1, batch + 1)]
+    many, single, unconfirmed = [], [], 0
+    for i in range(runs):
+        tx = str(1 + i % 2)
+        started = time.perf_counter()
+        res, _ = moip.switch_many([{"tx": tx, "rx": rx} for rx in receivers])
+        many.append(time.perf_counter() - started)
+        unconfirmed += sum(1 for r in res.get("results", []) if not r.get("confirmed"))
+
+        started = time.perf_counter()
+        for rx in receivers:
+            moip.switch(tx, rx)
+        moip.get_receivers(force=True)
+        single.append(time.perf_counter() - started)
+    per_second = round(batch / statistics.median(many), 1) if many else 0
+    return {"batch": batch, "switch_many": summarize(many), "one_by_one": summarize(single),
+            "receivers_per_second": per_second, "unconfirmed": unconfirmed}
+
+
+def _until_answered(moip: MoIPModule, timeout: float = 30.0) -> Optional[float]:
+    """Seconds until ?Devices succeeds again (each call is a reconnect attempt)."""
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        if moip.get_devices()[1] < 400:
+            return time.perf_counter() - started
+    return None
+
+
+def bench_reconnect(moip: MoIPModule, sim: MoIPSimulator, runs: int) -> Dict[str, dict]:
+    samples, lost = [], 0
+    for _ in range(runs):
+        moip.get_devices()
+        sim.drop_clients()
+        took = _until_answered(moip)
+        if took is None:
+            lost += 1
+        else:
+            samples.append(took)
+    return {**summarize(samples), "lost": lost}
+
+
+def bench_failover(internal: MoIPSimulator, external: MoIPSimulator, runs: int) -> Dict[str, dict]:
+    """Internal controller goes away: time until the module answers via external."""
+    samples, lost, modes = [], 0, set()
+    for _ in range(runs):
+        internal.go_online()
+        moip = _module(internal.address, external.address)
+        try:
+            moip.get_devices()
+            internal.go_offline()
+            took = _until_answered(moip)
+            modes.add(moip.get_status()["mode"])
+            if took is None:
+                lost += 1
+            else:
+                samples.append(took)
+        finally:
+            moip._conn.disconnect()
+    internal.go_online()
+    return {**summarize(samples), "lost": lost, "mode_after": sorted(modes)}
+
+
+def run(target: Optional[str], latency: float, jitter: float, commands: int,
+        batch: int, runs: int, seed: Optional[int]) -> dict:
+    sims: List[MoIPSimulator] = []
+    if target:
+        host, _, port = target.partition(":")
+        internal = external = (host, int(port or 23))
+    else:
+        sims = [MoIPSimulator(receivers=max(28, batch), latency_ms=latency, jitter_ms=jitter,
+                              seed=seed).start() for _ in range(2)]
+        internal, external = sims[0].address, sims[1].address
+    moip = _module(internal, external)
+    try:
+        report = {
+            "network": {"latency_ms": latency, "jitter_ms": jitter,
+                        "target": target or f"simulator {internal[0]}:{internal[1]}"},
+            "commands": bench_commands(moip, commands),
+            "batch_switch": bench_batch(moip, batch, runs),
+        }
+        if sims:
+            report["reconnect"] = bench_reconnect(moip, sims[0], runs)
+            moip._conn.disconnect()
+            report["failover"] = bench_failover(sims[0], sims[1], max(1, runs // 2))
+            report["simulator"] = dict(sims[0].stats)
+        return report
+    finally:
+        moip._conn.disconnect()
+        for sim in sims:
+            sim.stop()
+
+
+def _print(report: dict) -> None:
+    net = report["network"]
+    print(f"MoIP benchmark against {net['target']} "
+          f"(latency {net['latency_ms']} ms, jitter {net['jitter_ms']} ms)")
+    cmds, batch = report["commands"], report["batch_switch"]
+    rows = [
+        ("?Receivers", cmds["receivers"]),
+        ("?Devices", cmds["devices"]),
+        ("!Switch", cmds["switch"]),
+        ("!IR", cmds["ir"]),
+        (f"switch_many x{batch['batch']}", batch["switch_many"]),
+        (f"switch x{batch['batch']} + read-back", batch["one_by_one"]),
+    ]
+    if "reconnect" in report:
+        rows += [("reconnect after drop", report["reconnect"]),
+                 ("failover to external", report["failover"])]
+    print_table(rows)
+    failures = sum(c["failures"] for c in cmds.values())
+    print(f"command failures: {failures}, batch receivers/s: {batch['receivers_per_second']}, "
+          f"unconfirmed routes: {batch['unconfirmed']}")
+    if "failover" in report:
+        print(f"lost reconnects: {report['reconnect']['lost']}, lost failovers: "
+              f"{report['failover']['lost']}, mode after failover: {report['failover']['mode_after']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the gateway's MoIP code")
+    parser.add_argument("--target", help="host:port of a running simulator (default: start two)")
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated per-command time (ms)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="simulated +/- jitter (ms)")
+    parser.add_argument("--commands", type=int, default=50, help="samples per command type")
+    parser.add_argument("--batch", type=int, default=12, help="receivers per batch switch")
+    parser.add_argument("--runs", type=int, default=10, help="batch/reconnect rounds")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    report = run(args.target, args.latency, args.jitter, args.commands, args.batch, args.runs, args.seed)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print(report)
+
+
+if __name__ == "__main__":
+    main()
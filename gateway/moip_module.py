@@ -6,7 +6,14 @@ Replaces the standalone Flask+Waitress middleware that ran on port 5002.
 
 Key design:
 - Persistent Telnet connection with internal/external IP fallback.
-- Keepalive thread sends periodic ?Receivers to detect connection loss.
+- One reader thread per connection frames the controller's output into
+  lines, hands each query its reply as soon as the line arrives, and keeps
+  unsolicited output (banners, ~notifications) away from command replies.
+- Receiver map is write-through: switches update it as they are sent, and
+  a full ?Receivers dump only runs when a reconcile is due.
+- Keepalive thread checks the link only when nothing else has recently.
+- IR repeats (bursts, press-and-hold) stream from an engine thread, one
+  fire-and-forget !IR per press at a fixed rate.
 - Watchdog triggers Home Assistant webhook after prolonged failure.
 - All public methods return plain dicts suitable for jsonify().
 - Thread-safe: connection_lock protects Telnet I/O, state_lock protects counters.
@@ -15,16 +22,18 @@ Key design:
 from __future__ import annotations
 
 import logging
-import select
 import socket
 import threading
 import time
+from collections import deque
 from datetime import datetime
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple, Union
 
 import requests as http_requests
 import urllib3
 
+from metrics import MOIP_IR_PRESSES, record_command
+
 # Suppress warnings for verify=False calls to Nabu Casa webhooks
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -75,6 +84,11 @@ def parse_devices(response: str) -> dict:
     return devices
 
 
+def reply_key(line: str) -> str:
+    """Name a reply or query line answers to: ``?Receivers=1:2`` -> ``Receivers``."""
+    return line.strip().split("=", 1)[0].lstrip("?")
+
+
 # =============================================================================
 # MOIP CONNECTION
 # =============================================================================
@@ -84,6 +98,19 @@ class MoIPConnection:
 
     Uses raw sockets instead of telnetlib (removed in Python 3.13).
     The MoIP controller speaks plain ASCII over TCP on port 23.
+
+    The controller answers a query such as ``?Receivers`` with one line
+    naming it (``?Receivers=1:1,2:3``) or with ``#Error``.  A reader thread
+    owns the receive side: it splits the stream on newlines and completes
+    the waiting query the moment its line arrives, instead of sleeping and
+    then waiting for the socket to go idle.  Lines nobody is waiting for
+    (login banners, ``~`` notifications, acks to sets) are counted and
+    logged, never returned as a reply.
+
+    ``#Error`` doesn't name the command it rejects.  The controller works
+    through a write in order, so when sets are pipelined ahead of a query
+    the first errors go to those sets (``last_rejected``) and only an
+    error beyond their count answers the query.
     """
 
     def __init__(self, cfg: dict, logger: logging.Logger) -> None:
@@ -102,10 +129,26 @@ class MoIPConnection:
         self.port: int = self._port_internal
         self._use_external: bool = False
 
+        # Reply demultiplexing (shared with the reader thread)
+        self._cond = threading.Condition()
+        self._waiting: Dict[str, int] = {}
+        self._replies: Dict[str, str] = {}
+        self._sets_ahead = 0          # sets pipelined before the waiting query
+        self.last_rejected: List[str] = []  # errors those sets drew on the last send
+        self.unsolicited: Deque[str] = deque(maxlen=20)
+        self.unsolicited_count = 0
+
     def _open_socket(self, host: str, port: int, timeout: int) -> socket.socket:
-        """Open a TCP connection and return the socket."""
+        """Open a TCP connection, start its reader thread and return the socket."""
         sock = socket.create_connection((host, port), timeout=timeout)
-        sock.setblocking(False)
+        # Blocking with a short timeout: sendall() is reliable and the reader
+        # wakes up regularly to notice the socket being replaced
+        sock.settimeout(1.0)
+        # Commands are tiny and often back to back (a set, then a query):
+        # without this, Nagle holds the query until the set's delayed ACK
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        threading.Thread(target=self._reader, args=(sock,), daemon=True,
+                         name=f"moip-reader-{host}").start()
         return sock
 
     def _authenticate(self) -> None:
@@ -196,62 +239,299 @@ class MoIPConnection:
                 self._logger.debug(f"MoIP: socket close failed: {e}")
             self._sock = None
 
-    def send_command(self, command: str) -> Optional[str]:
+    def send_command(self, command: Union[str, Sequence[str]]) -> Optional[str]:
         """Send command and return response. Single attempt — no internal retry.
 
+        A list of commands goes out in one write; the response is then the
+        reply to the last one when it is a query (``"OK"`` otherwise).
+
         Reconnection/retry logic lives in MoIPModule._send() so the failure
         streak counter stays accurate (one call = one attempt = one count).
         """
+        started = time.perf_counter()
+        result = self._send_once([command] if isinstance(command, str) else list(command))
+        record_command("moip", started, result is not None)
+        return result
+
+    def _send_once(self, commands: List[str]) -> Optional[str]:
         if not self.connected:
             if not self.connect():
                 return None
 
-        try:
-            if not command.endswith("\n"):
-                command += "\n"
-
-            self._sock.sendall(command.encode("ascii"))
-            time.sleep(0.05)
-
-            if command.strip().startswith("?"):
-                return self._read_response()
-            return "OK"
+        payload = "".join(c if c.endswith("\n") else c + "\n" for c in commands)
+        last = commands[-1].strip() if commands else ""
+        if not last.startswith("?"):
+            try:
+                self._sock.sendall(payload.encode("ascii"))
+                return "OK"
+            except Exception as e:
+                self._logger.error(f"MoIP: Command failed: {e}")
+                self.disconnect()
+                return None
 
+        key = reply_key(last)
+        with self._cond:
+            self._waiting[key] = self._waiting.get(key, 0) + 1
+            self._replies.pop(key, None)
+            self._sets_ahead = sum(1 for c in commands[:-1] if not c.strip().startswith("?"))
+            self.last_rejected = []
+        try:
+            self._sock.sendall(payload.encode("ascii"))
+            return self._wait_reply(key)
         except Exception as e:
             self._logger.error(f"MoIP: Command failed: {e}")
             self.disconnect()
             return None
+        finally:
+            with self._cond:
+                n = self._waiting.get(key, 1) - 1
+                if n > 0:
+                    self._waiting[key] = n
+                else:
+                    self._waiting.pop(key, None)
+                self._sets_ahead = 0
 
-    def _read_response(self) -> str:
-        """Read TCP response with timeout to prevent indefinite hangs.
-
-        Uses select() to poll for available data (replaces telnetlib's
-        read_very_eager which was also non-blocking).
-        """
+    def _wait_reply(self, key: str) -> Optional[str]:
+        """Block until the reader delivers *key*'s line; None on timeout or drop."""
         deadline = time.time() + self._read_timeout
-        chunks = []
-        while time.time() < deadline:
-            try:
+        with self._cond:
+            while key not in self._replies:
+                if not self.connected:
+                    return None
                 remaining = deadline - time.time()
                 if remaining <= 0:
-                    break
-                ready, _, _ = select.select([self._sock], [], [], min(remaining, 0.1))
-                if ready:
-                    chunk = self._sock.recv(4096).decode("ascii", errors="ignore")
-                    if not chunk:
-                        # Connection closed by remote
-                        raise ConnectionError("MoIP: Remote closed connection")
-                    chunks.append(chunk)
-                    time.sleep(0.05)
-                else:
-                    if chunks:
-                        break
-            except (ConnectionError, OSError):
-                raise
-            except Exception as e:
-                self._logger.debug(f"MoIP: read error: {e}")
+                    self._logger.warning(f"MoIP: No reply to ?{key} within {self._read_timeout}s")
+                    return None
+                self._cond.wait(remaining)
+            return self._replies.pop(key)
+
+    # --- Reader thread ---
+
+    def _reader(self, sock: socket.socket) -> None:
+        """Frame *sock*'s output into lines until it closes or is replaced."""
+        buf = b""
+        while self._sock is sock or self._sock is None:
+            try:
+                data = sock.recv(4096)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            if not data:
                 break
-        return "".join(chunks)
+            buf += data
+            *lines, buf = buf.split(b"\n")
+            for raw in lines:
+                line = raw.decode("ascii", errors="ignore").strip()
+                if line:
+                    self._on_line(line)
+        with self._cond:
+            if self._sock is sock:
+                # Remote closed (or the socket died) under a live connection:
+                # fail the waiting query now rather than at its timeout
+                self._logger.warning("MoIP: Connection closed by controller")
+                self.connected = False
+            self._cond.notify_all()
+
+    def _on_line(self, line: str) -> None:
+        with self._cond:
+            if not line.startswith("~"):
+                key = reply_key(line)
+                if key in self._waiting:
+                    self._replies[key] = line
+                    self._cond.notify_all()
+                    return
+                if line.startswith("#") and self._waiting and self._sets_ahead:
+                    # Rejects one of the sets written ahead of the query
+                    self._sets_ahead -= 1
+                    self.last_rejected.append(line)
+                    self._logger.warning(f"MoIP: Controller rejected a command: {line}")
+                    return
+                if line.startswith("#") and self._waiting:
+                    # Errors don't name the query; commands are serialized,
+                    # so it belongs to whichever one is waiting
+                    self._logger.warning(f"MoIP: Controller error: {line}")
+                    for waiting in self._waiting:
+                        self._replies[waiting] = line
+                    self._cond.notify_all()
+                    return
+            self.unsolicited.append(line)
+            self.unsolicited_count += 1
+        self._logger.debug(f"MoIP: Unsolicited: {line}")
+
+
+# =============================================================================
+# IR REPEATER
+# =============================================================================
+
+class IrJob:
+    """One receiver's stream of IR presses (a burst, or a hold until released)."""
+
+    def __init__(self, tx: str, rx: str, code: str, interval: float,
+                 count: Optional[int], deadline: Optional[float]) -> None:
+        self.tx, self.rx, self.code = tx, rx, code
+        self.interval = interval
+        self.remaining = count        # None while held
+        self.deadline = deadline      # hold safety stop (monotonic)
+        self.next_due = time.monotonic()
+        self.sent = 0
+        self.error = ""
+        self.done = threading.Event()
+
+    def mark_sent(self) -> None:
+        """Count a press and schedule the next one."""
+        self.sent += 1
+        self.next_due += self.interval
+        if self.remaining is not None:
+            self.remaining -= 1
+
+    @property
+    def command(self) -> str:
+        return f"!IR={self.tx},{self.rx},{self.code}"
+
+
+class IrRepeater:
+    """Sends repeated IR presses at a steady rate, one job per receiver.
+
+    ``burst()`` sends *count* presses; ``hold()`` keeps pressing until
+    ``release()`` or, if the tablet never releases (dropped Wi-Fi), until
+    *hold_max_seconds* pass — calling ``hold()`` again extends it.  Each
+    press is a plain ``!IR`` set: no reply is awaited and the connection
+    lock is only held for that one write, so other commands interleave
+    with a long hold instead of queueing behind it.
+    """
+
+    def __init__(self, send: Callable[[str], Optional[str]], logger: logging.Logger,
+                 max_rate_hz: float = 10.0, hold_max_seconds: float = 8.0) -> None:
+        self._send = send
+        self._logger = logger
+        self.max_rate_hz = max(1.0, float(max_rate_hz))
+        self.hold_max_seconds = max(0.5, float(hold_max_seconds))
+        self._cond = threading.Condition()
+        self._jobs: Dict[str, IrJob] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        with self._cond:
+            for job in self._jobs.values():
+                job.done.set()
+            self._jobs.clear()
+            self._cond.notify_all()
+
+    def burst(self, tx: str, rx: str, code: str, count: int, rate_hz: float,
+              first_sent: bool = False) -> IrJob:
+        """Queue *count* presses on *rx* (replacing anything it was doing).
+
+        *first_sent* means the caller has already sent press one.
+        """
+        job = IrJob(tx, rx, code, 1.0 / rate_hz, count, None)
+        if first_sent:
+            job.mark_sent()
+        self._replace(job)
+        return job
+
+    def hold(self, tx: str, rx: str, code: str, rate_hz: float,
+             first_sent: bool = False) -> IrJob:
+        """Press *code* on *rx* repeatedly until released."""
+        job = IrJob(tx, rx, code, 1.0 / rate_hz, None,
+                    time.monotonic() + self.hold_max_seconds)
+        if first_sent:
+            job.mark_sent()
+        self._replace(job)
+        return job
+
+    def extend(self, tx: str, rx: str, code: str) -> bool:
+        """Push back the safety stop of a matching hold; False if none is running."""
+        with self._cond:
+            job = self._jobs.get(rx)
+            if job is None or job.remaining is not None or (job.tx, job.code) != (tx, code):
+                return False
+            job.deadline = time.monotonic() + self.hold_max_seconds
+            return True
+
+    def release(self, rx: str) -> Optional[IrJob]:
+        """Stop whatever *rx* is doing; returns the stopped job (None if idle)."""
+        with self._cond:
+            job = self._jobs.pop(rx, None)
+            self._cond.notify_all()
+        if job is not None:
+            job.done.set()
+        return job
+
+    def _replace(self, job: IrJob) -> None:
+        with self._cond:
+            old = self._jobs.get(job.rx)
+            self._jobs[job.rx] = job
+            self._cond.notify_all()
+        if old is not None:
+            old.done.set()
+
+    def active(self) -> int:
+        with self._cond:
+            return len(self._jobs)
+
+    def _due(self, now: float) -> list:
+        due = []
+        for rx, job in list(self._jobs.items()):
+            if job.deadline is not None and now >= job.deadline:
+                self._logger.info(f"MoIP: IR hold on RX{rx} not released after "
+                                  f"{self.hold_max_seconds:g}s; stopping")
+                del self._jobs[rx]
+                job.done.set()
+            elif now >= job.next_due:
+                due.append(job)
+        return due
+
+    def tick(self, now: Optional[float] = None) -> int:
+        """Send every press that is due; returns the number sent."""
+        now = time.monotonic() if now is None else now
+        with self._cond:
+            due = self._due(now)
+        sent = 0
+        for job in due:
+            ok = self._send(job.command) is not None
+            with self._cond:
+                if self._jobs.get(job.rx) is not job:
+                    continue  # released or replaced while we were sending
+                if not ok:
+                    job.error = "IR command failed"
+                    del self._jobs[job.rx]
+                    job.done.set()
+                    self._logger.warning(f"MoIP: IR repeat on RX{job.rx} stopped after {job.sent} presses")
+                    continue
+                sent += 1
+                job.mark_sent()
+                # Keep the cadence, but don't burst to catch up after a slow send
+                job.next_due = max(job.next_due, now)
+                if job.remaining is not None and job.remaining <= 0:
+                    del self._jobs[job.rx]
+                    job.done.set()
+        if sent:
+            MOIP_IR_PRESSES.inc(sent)
+        return sent
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            with self._cond:
+                while not self._jobs and not self._stop.is_set():
+                    self._cond.wait()
+                if self._stop.is_set():
+                    return
+                wait = min(j.next_due for j in self._jobs.values()) - time.monotonic()
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+            try:
+                self.tick()
+            except Exception as e:
+                self._logger.debug(f"MoIP: IR tick failed: {e}")
 
 
 # =============================================================================
@@ -285,12 +565,20 @@ class MoIPModule:
         self._last_successful_command: Optional[datetime] = None
         self._last_reboot_time: Optional[datetime] = None
         self._last_receivers: dict = {}
+        self._receivers_at: float = 0.0  # monotonic time of the last full ?Receivers
+        self._reconcile_corrections: int = 0
 
         # Thresholds
         self._failure_threshold = cfg.get("failure_threshold", 5)
         self._reboot_cooldown_minutes = cfg.get("reboot_cooldown_minutes", 15)
         self._keepalive_normal = cfg.get("keepalive_interval_normal", 30)
         self._keepalive_max = cfg.get("keepalive_interval_max", 300)
+        self._reconcile_seconds = cfg.get("reconcile_seconds", 60)
+
+        # IR repeats
+        self._ir = IrRepeater(self._send, logger,
+                              max_rate_hz=cfg.get("ir_max_rate_hz", 10),
+                              hold_max_seconds=cfg.get("ir_hold_max_seconds", 8))
 
         # Keepalive thread
         self._stop = threading.Event()
@@ -309,19 +597,28 @@ class MoIPModule:
             f"webhook={'configured' if self._cfg.get('ha_webhook_id') else 'NOT SET'}"
         )
         self._keepalive_thread.start()
+        self._ir.start()
 
     def stop(self) -> None:
         self._stop.set()
-        self._client.disconnect()
+        self._ir.stop()
+        self._conn.disconnect()
 
     # --- Thread-safe command send ---
 
-    def _send(self, command: str) -> Optional[str]:
+    def _send(self, command: Union[str, Sequence[str]]) -> Optional[str]:
         """Thread-safe command send with one retry on failure.
 
+        *command* may be a list, sent as one pipelined write under a single
+        hold of the connection lock (see MoIPConnection.send_command).
         First attempt fails → reconnect → second attempt.
         Each call to _send increments the failure streak by at most 1.
         """
+        return self._send_checked(command)[0]
+
+    def _send_checked(self, command: Union[str, Sequence[str]]) -> Tuple[Optional[str], List[str]]:
+        """Like _send(), plus the errors the controller gave the sets
+        pipelined ahead of a trailing query (read under the same lock)."""
         with self._connection_lock:
             result = self._conn.send_command(command)
 
@@ -329,6 +626,7 @@ class MoIPModule:
             if result is None:
                 if self._conn.connect():
                     result = self._conn.send_command(command)
+            rejected = list(self._conn.last_rejected)
 
         if result:
             with self._state_lock:
@@ -350,31 +648,37 @@ class MoIPModule:
                 )
                 self._trigger_ha_restart()
 
-        return result
+        return result, rejected
 
     # --- Public API ---
 
     def get_receivers(self, force: bool = False) -> Tuple[dict, int]:
         """Get receiver-to-transmitter mappings. Returns (data, status).
 
+        The map is kept current by the switches this module sends, so while
+        it is younger than ``reconcile_seconds`` it is returned as is.  Once
+        a reconcile is due (or force=True) the controller's full ?Receivers
+        dump replaces it, catching changes made outside the gateway.
+
         When the module is offline and force=False (default), returns cached
         data immediately instead of hammering the controller with reconnect
         attempts.  The keepalive thread is solely responsible for reconnection.
         """
-        # If offline, return cached data — don't pile on reconnect attempts
         if not force:
             with self._state_lock:
+                cached = self._last_receivers
+                # If offline, return cached data — don't pile on reconnect attempts
                 if not self._healthy:
-                    cached = self._last_receivers
                     if cached:
                         return cached, 200
                     return {"error": "No data available"}, 503
+                if cached and not self._reconcile_due():
+                    return cached, 200
 
         response = self._send("?Receivers")
         if response:
             receivers = parse_receivers(response)
-            with self._state_lock:
-                self._last_receivers = receivers
+            self._store_receivers(receivers)
             return receivers, 200
         # Return cached data if available
         with self._state_lock:
@@ -383,6 +687,31 @@ class MoIPModule:
             return cached, 200
         return {"error": "No data available"}, 503
 
+    def _reconcile_due(self) -> bool:
+        return time.monotonic() - self._receivers_at >= self._reconcile_seconds
+
+    def _store_receivers(self, receivers: dict) -> None:
+        """Replace the map with a full ?Receivers dump (an empty parse is ignored)."""
+        if not receivers:
+            return
+        with self._state_lock:
+            old = self._last_receivers
+            drift = sum(1 for rx, r in receivers.items()
+                        if rx in old and old[rx]["transmitter_id"] != r["transmitter_id"])
+            self._last_receivers = receivers
+            self._receivers_at = time.monotonic()
+            self._reconcile_corrections += drift
+        if drift:
+            self._logger.info(f"MoIP: Reconcile corrected {drift} receiver(s) changed outside the gateway")
+
+    def _write_through(self, routes: Dict[str, str]) -> None:
+        """Apply sent switches (rx -> tx) to the map, copy-on-write for publishers."""
+        with self._state_lock:
+            receivers = dict(self._last_receivers)
+            for rx, tx in routes.items():
+                receivers[rx] = {"receiver_id": rx, "transmitter_id": tx, "connected": True}
+            self._last_receivers = receivers
+
     def get_devices(self) -> Tuple[dict, int]:
         """Get device counts. Returns (data, status)."""
         response = self._send("?Devices")
@@ -394,10 +723,73 @@ class MoIPModule:
         """Switch a receiver to a transmitter."""
         response = self._send(f"!Switch={tx},{rx}")
         if response:
+            self._write_through({str(rx): str(tx)})
             self._logger.info(f"MoIP: Switch RX{rx} -> TX{tx}")
             return {"success": True, "transmitter": tx, "receiver": rx}, 200
         return {"error": "Command failed"}, 503
 
+    def switch_many(self, switches: Any) -> Tuple[dict, int]:
+        """Route several receivers in one write, then read the matrix back once.
+
+        *switches* is a list of ``{"tx": .., "rx": ..}`` (``transmitter`` /
+        ``receiver`` also accepted).  A receiver listed twice takes its last
+        transmitter.  Every ``!Switch`` plus a trailing ``?Receivers`` go out
+        as a single write, so the reply shows the routing after the batch;
+        each result says whether the receiver's route was confirmed by it.
+        ``receivers`` in the result is the gateway's map after the batch: the
+        read-back when it confirms every route, otherwise the sent routes
+        applied to the previous map, with a reconcile marked due.
+
+        ``#Error`` doesn't say which ``!Switch`` it rejects, so when the
+        controller rejected any, every unconfirmed route counts as failed
+        and is left out of the map until the reconcile.
+        """
+        if not isinstance(switches, list) or not switches:
+            return {"error": "switches must be a non-empty list"}, 400
+        routes: Dict[str, str] = {}
+        for i, item in enumerate(switches):
+            if not isinstance(item, dict):
+                return {"error": f"switch {i}: expected an object"}, 400
+            tx = str(item.get("tx", item.get("transmitter", ""))).strip()
+            rx = str(item.get("rx", item.get("receiver", ""))).strip()
+            if not tx or not rx:
+                return {"error": f"switch {i}: tx and rx are required"}, 400
+            routes.pop(rx, None)
+            routes[rx] = tx
+
+        started = time.perf_counter()
+        response, rejected = self._send_checked(
+            [f"!Switch={tx},{rx}" for rx, tx in routes.items()] + ["?Receivers"])
+        duration_ms = round((time.perf_counter() - started) * 1000, 1)
+        if not response:
+            return {"error": "Command failed"}, 503
+
+        readback = parse_receivers(response)
+        results = []
+        for rx, tx in routes.items():
+            current = readback.get(rx, {}).get("transmitter_id")
+            result = {"receiver": rx, "transmitter": tx, "success": True, "confirmed": current == tx}
+            if rejected and not result["confirmed"]:
+                result.update({"success": False, "error": f"controller rejected a switch: {rejected[0]}"})
+            results.append(result)
+        confirmed = sum(r["confirmed"] for r in results)
+        if confirmed == len(results):
+            # The read-back shows the batch applied: it is a full reconcile
+            self._store_receivers(readback)
+        else:
+            # It may predate some switches; keep what we sent (minus anything
+            # possibly rejected) and re-read soon
+            self._write_through({r["receiver"]: r["transmitter"] for r in results if r["success"]})
+            with self._state_lock:
+                self._receivers_at = 0.0
+        with self._state_lock:
+            receivers = self._last_receivers
+        self._logger.info(
+            f"MoIP: Switched {len(routes)} receivers in {duration_ms} ms "
+            f"({confirmed} confirmed, {len(rejected)} rejected)")
+        return {"success": all(r["success"] for r in results), "results": results,
+                "receivers": receivers, "duration_ms": duration_ms}, 200
+
     def send_ir(self, tx: str, rx: str, code: str) -> Tuple[dict, int]:
         """Send IR command via a receiver."""
         response = self._send(f"!IR={tx},{rx},{code}")
@@ -406,6 +798,73 @@ class MoIPModule:
             return {"success": True}, 200
         return {"error": "Command failed"}, 503
 
+    def _ir_args(self, rx: str, code: str, rate_hz: Any) -> Tuple[Optional[float], Optional[str]]:
+        if not str(rx).strip() or not str(code).strip():
+            return None, "rx and code are required"
+        try:
+            rate = float(rate_hz)
+        except (TypeError, ValueError):
+            return None, "rate_hz must be a number"
+        if not 0 < rate <= self._ir.max_rate_hz:
+            return None, f"rate_hz must be between 0 and {self._ir.max_rate_hz:g}"
+        return rate, None
+
+    def ir_burst(self, tx: str, rx: str, code: str, count: Any = 1, rate_hz: Any = 5,
+                 wait: bool = False) -> Tuple[dict, int]:
+        """Press an IR code *count* times at *rate_hz* from one request.
+
+        The first press goes out before returning (so a dead controller is
+        a 503 straight away); the rest stream from the IR engine.  With
+        *wait*, returns once the burst has finished.
+        """
+        rate, err = self._ir_args(rx, code, rate_hz)
+        try:
+            count = int(count)
+        except (TypeError, ValueError):
+            err = err or "count must be an integer"
+        if not err and not 1 <= count <= 100:
+            err = "count must be between 1 and 100"
+        if err:
+            return {"error": err}, 400
+        tx, rx = str(tx), str(rx)
+        self._ir.release(rx)
+        if self._send(f"!IR={tx},{rx},{code}") is None:
+            return {"error": "Command failed"}, 503
+        MOIP_IR_PRESSES.inc()
+        seconds = round((count - 1) / rate, 2)
+        result = {"success": True, "receiver": rx, "count": count, "seconds": seconds}
+        if count == 1:
+            return {**result, "sent": 1}, 200
+        job = self._ir.burst(tx, rx, code, count, rate, first_sent=True)
+        self._logger.info(f"MoIP: IR burst RX{rx} x{count} at {rate:g}/s")
+        if wait:
+            if not job.done.wait(seconds + 5):
+                return {"error": "IR burst did not finish in time", "sent": job.sent}, 504
+            if job.error:
+                return {"error": job.error, "sent": job.sent}, 503
+            result["sent"] = job.sent
+        return result, 200
+
+    def ir_hold(self, tx: str, rx: str, code: str, rate_hz: Any = 5) -> Tuple[dict, int]:
+        """Start press-and-hold of *code* on *rx*; calling again keeps it alive."""
+        rate, err = self._ir_args(rx, code, rate_hz)
+        if err:
+            return {"error": err}, 400
+        tx, rx = str(tx), str(rx)
+        if not self._ir.extend(tx, rx, code):
+            # New hold: first press from the request, the engine repeats
+            self._ir.release(rx)
+            if self._send(f"!IR={tx},{rx},{code}") is None:
+                return {"error": "Command failed"}, 503
+            MOIP_IR_PRESSES.inc()
+            self._ir.hold(tx, rx, code, rate, first_sent=True)
+        return {"success": True, "receiver": rx, "max_seconds": self._ir.hold_max_seconds}, 200
+
+    def ir_release(self, rx: str) -> Tuple[dict, int]:
+        """End a press-and-hold (or a running burst) on *rx*."""
+        job = self._ir.release(str(rx))
+        return {"success": True, "receiver": str(rx), "presses": job.sent if job else 0}, 200
+
     def activate_scene(self, scene: str) -> Tuple[dict, int]:
         """Activate a pre-defined MoIP scene."""
         response = self._send(f"!ActivateScene={scene}")
@@ -452,6 +911,10 @@ class MoIPModule:
             "last_command_seconds_ago": uptime,
             "failure_streak": streak,
             "failure_threshold": self._failure_threshold,
+            "unsolicited_lines": self._conn.unsolicited_count,
+            "ir_repeats_active": self._ir.active(),
+            "receivers_age_seconds": round(time.monotonic() - self._receivers_at, 1) if self._receivers_at else None,
+            "reconcile_corrections": self._reconcile_corrections,
             "last_reboot_seconds_ago": reboot_ago,
             "reboot_cooldown_minutes": self._reboot_cooldown_minutes,
         }
@@ -481,15 +944,10 @@ class MoIPModule:
             if self._stop.is_set():
                 break
 
-            response = self._send("?Receivers")
+            response = self._keepalive_probe(interval)
             if response:
                 interval = self._keepalive_normal
                 consecutive_failures = 0
-                # Cache the receivers data from keepalive
-                receivers = parse_receivers(response)
-                if receivers:
-                    with self._state_lock:
-                        self._last_receivers = receivers
             else:
                 consecutive_failures += 1
                 interval = min(
@@ -520,6 +978,25 @@ class MoIPModule:
                     self._trigger_ha_restart()
                     consecutive_failures = 0
 
+    def _keepalive_probe(self, interval: float) -> Optional[str]:
+        """One keepalive check; returns a truthy response if the link is up.
+
+        Commands and polls inside the last *interval* already prove the
+        link, so nothing is sent.  Otherwise the probe is the reconcile
+        sweep when one is due, and the two-number ?Devices reply if not.
+        """
+        with self._state_lock:
+            recent = (self._healthy and self._last_successful_command is not None and
+                      (datetime.now() - self._last_successful_command).total_seconds() < interval)
+        if recent:
+            return "OK"
+        if self._reconcile_due():
+            response = self._send("?Receivers")
+            if response:
+                self._store_receivers(parse_receivers(response))
+            return response
+        return self._send("?Devices")
+
     # --- HA Watchdog ---
 
     def _check_reboot_cooldown(self) -> bool:
@@ -0,0 +1,265 @@
+"""
+MoIP Simulator — a local Telnet stand-in for the Binary MoIP controller.
+
+Speaks the dialect the gateway uses: ``?Receivers``, ``?Devices``,
+``!Switch``, ``!IR``, ``!OSD`` / ``!SetOSDImage``, ``!ActivateScene`` and
+``!Exit``, with the optional username/password lines first.  Queries are
+answered with one ``?Name=...`` line; sets are silent; anything malformed
+gets ``#Error``.  Each command takes *latency_ms* (± *jitter_ms*) to
+process, one at a time per connection like the real controller, and
+connections can be dropped or refused on demand, so MoIPConnection /
+MoIPModule behaviour can be measured without being on site.
+
+Run standalone and point the gateway at it (moip.host_internal / port_internal):
+
+    python moip_sim.py --port 2323 --latency 5 --jitter 2
+
+or start it in-process with ``MoIPSimulator(...).start()`` (see moip_bench.py).
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import socket
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger("stp-gateway")
+
+
+class MoIPSimulator:
+    """In-process TCP server behaving like the MoIP controller for the gateway's needs.
+
+    *latency_ms* / *jitter_ms* set the processing time of every command
+    (uniform jitter around the latency).  *disconnect_after* closes each
+    connection after that many commands.  ``drop_clients()`` cuts live
+    connections (a controller reboot or network blip); ``go_offline()`` /
+    ``go_online()`` also refuse new ones, which pushes the gateway to its
+    external host.  *silent* swallows queries to exercise reply timeouts.
+    *seed* makes the jitter repeatable.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+                 transmitters: int = 28, receivers: int = 28,
+                 latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 disconnect_after: Optional[int] = None, seed: Optional[int] = None,
+                 username: str = "", password: str = "") -> None:
+        self.latency = max(0.0, latency_ms) / 1000.0
+        self.jitter = max(0.0, jitter_ms) / 1000.0
+        self.disconnect_after = disconnect_after
+        self.silent = False
+        self.transmitters = transmitters
+        self._username = username
+        self._password = password
+        self._rng = random.Random(seed)
+        self._host = host
+        self._srv = self._listen(host, port)
+        self.address: Tuple[str, int] = self._srv.getsockname()
+
+        self._lock = threading.Lock()
+        self.routes: Dict[str, str] = {str(rx): "0" for rx in range(1, receivers + 1)}
+        self.ir: List[Tuple[str, str, str]] = []   # (tx, rx, code) in arrival order
+        self.osd: List[str] = []
+        self.scenes: List[str] = []
+        self._clients: List[socket.socket] = []
+        self._stop = threading.Event()
+        self.stats = {"connections": 0, "commands": 0, "queries": 0, "sets": 0,
+                      "replies": 0, "errors": 0, "disconnects": 0, "refused_logins": 0}
+
+    @property
+    def port(self) -> int:
+        return self.address[1]
+
+    @staticmethod
+    def _listen(host: str, port: int) -> socket.socket:
+        srv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        srv.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        srv.bind((host, port))
+        srv.listen(8)
+        return srv
+
+    def start(self) -> "MoIPSimulator":
+        threading.Thread(target=self._accept, args=(self._srv,), daemon=True).start()
+        logger.info(f"MoIP simulator listening on {self.address[0]}:{self.port}")
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self.go_offline()
+
+    # -------------------
+    # Fault injection / controller-side actions
+    # -------------------
+
+    def drop_clients(self) -> int:
+        """Close every live connection; returns how many were dropped."""
+        with self._lock:
+            clients, self._clients = self._clients, []
+        for conn in clients:
+            self._close(conn)
+        self.stats["disconnects"] += len(clients)
+        return len(clients)
+
+    def go_offline(self) -> None:
+        """Stop listening and drop clients: connections are refused until go_online()."""
+        srv, self._srv = self._srv, None
+        if srv is not None:
+            self._close(srv)
+        self.drop_clients()
+
+    def go_online(self) -> None:
+        if self._srv is None and not self._stop.is_set():
+            self._srv = self._listen(self._host, self.port)
+            threading.Thread(target=self._accept, args=(self._srv,), daemon=True).start()
+
+    def console_switch(self, tx: int, rx: int) -> None:
+        """Route as if someone used the MoIP app instead of the gateway."""
+        with self._lock:
+            self.routes[str(rx)] = str(tx)
+
+    # -------------------
+    # Network
+    # -------------------
+
+    @staticmethod
+    def _close(sock: socket.socket) -> None:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        try:
+            sock.close()
+        except OSError:
+            pass
+
+    def _accept(self, srv: socket.socket) -> None:
+        while not self._stop.is_set():
+            try:
+                conn, _ = srv.accept()
+            except OSError:
+                return
+            with self._lock:
+                self._clients.append(conn)
+            self.stats["connections"] += 1
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn: socket.socket) -> None:
+        login = [self._username, self._password] if self._username else []
+        handled = 0
+        buf = b""
+        try:
+            while True:
+                data = conn.recv(4096)
+                if not data:
+                    return
+                buf += data
+                *lines, buf = buf.split(b"\n")
+                for raw in lines:
+                    line = raw.decode("ascii", errors="ignore").strip()
+                    if not line:
+                        continue
+                    if login:
+                        if line != login.pop(0):
+                            self.stats["refused_logins"] += 1
+                            conn.sendall(b"#Error Login\r\n")
+                            return
+                        continue
+                    if line == "!Exit":
+                        return
+                    self._process_time()
+                    reply = self._handle(line)
+                    if reply:
+                        self.stats["replies"] += 1
+                        conn.sendall(f"{reply}\r\n".encode("ascii"))
+                    handled += 1
+                    if self.disconnect_after and handled >= self.disconnect_after:
+                        self.stats["disconnects"] += 1
+                        return
+        except OSError:
+            return
+        finally:
+            with self._lock:
+                if conn in self._clients:
+                    self._clients.remove(conn)
+            self._close(conn)
+
+    def _process_time(self) -> None:
+        delay = self.latency
+        if self.jitter:
+            delay = max(0.0, delay + self._rng.uniform(-self.jitter, self.jitter))
+        if delay > 0:
+            time.sleep(delay)
+
+    def _handle(self, line: str) -> Optional[str]:
+        self.stats["commands"] += 1
+        name, _, arg = line.partition("=")
+        if name.startswith("?"):
+            self.stats["queries"] += 1
+            if self.silent:
+                return None
+            with self._lock:
+                if name == "?Receivers":
+                    return "?Receivers=" + ",".join(f"{tx}:{rx}" for rx, tx in self.routes.items())
+                if name == "?Devices":
+                    return f"?Devices={self.transmitters},{len(self.routes)}"
+            return self._error(line)
+
+        self.stats["sets"] += 1
+        parts = arg.split(",")
+        with self._lock:
+            if name == "!Switch" and len(parts) == 2 and parts[1] in self.routes \
+                    and parts[0].isdigit() and int(parts[0]) <= self.transmitters:
+                self.routes[parts[1]] = parts[0]
+                return None
+            if name == "!IR" and len(parts) >= 3 and parts[1] in self.routes:
+                self.ir.append((parts[0], parts[1], ",".join(parts[2:])))
+                return None
+            if name in ("!OSD", "!SetOSDImage") and arg:
+                self.osd.append(arg)
+                return None
+            if name == "!ActivateScene" and arg:
+                self.scenes.append(arg)
+                return None
+        return self._error(line)
+
+    def _error(self, line: str) -> str:
+        self.stats["errors"] += 1
+        logger.debug(f"MoIP simulator: rejected {line!r}")
+        return "#Error"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local MoIP controller Telnet simulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=2323)
+    parser.add_argument("--transmitters", type=int, default=28)
+    parser.add_argument("--receivers", type=int, default=28)
+    parser.add_argument("--latency", type=float, default=0.0, help="per-command processing time (ms)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="+/- processing jitter (ms)")
+    parser.add_argument("--disconnect-after", type=int, default=None,
+                        help="close each connection after this many commands")
+    parser.add_argument("--username", default="")
+    parser.add_argument("--password", default="")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    sim = MoIPSimulator(args.host, args.port, transmitters=args.transmitters,
+                        receivers=args.receivers, latency_ms=args.latency, jitter_ms=args.jitter,
+                        disconnect_after=args.disconnect_after, seed=args.seed,
+                        username=args.username, password=args.password).start()
+    try:
+        while True:
+            time.sleep(10)
+            logger.info(f"MoIP simulator: {sim.stats}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sim.stop()
+
+
+if __name__ == "__main__":
+    main()
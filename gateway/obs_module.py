@@ -17,7 +17,6 @@ Key design:
 from __future__ import annotations
 
 import base64
-import copy
 import hashlib
 import json
 import logging
@@ -30,6 +29,9 @@ from urllib.parse import urlparse
 
 import websocket
 
+from metrics import record_command
+from snapshots import FrozenDict, freeze
+
 
 # =============================================================================
 # OBS WEBSOCKET V5 PROTOCOL
@@ -123,6 +125,7 @@ class OBSModule:
         # Poll tuning
         self._ping_seconds = float(cfg.get("ping_seconds", 3.0))
         self._snapshot_seconds = float(cfg.get("snapshot_seconds", 6.0))
+        self._idle_snapshot_seconds: Optional[float] = None  # set while no tablet watches
         self._offline_after_seconds = float(cfg.get("offline_after_seconds", 10.0))
         self._ping_fails_to_offline = int(cfg.get("ping_fails_to_offline", 3))
 
@@ -136,7 +139,7 @@ class OBSModule:
         self._last_ok_ts: float = 0.0
         self._last_error: str = ""
         self._ping_fail_streak: int = 0
-        self._snapshot: Optional[Dict[str, Any]] = None
+        self._snapshot: Optional[FrozenDict] = None  # swapped whole, read lock-free
         self._snapshot_ts: float = 0.0
 
         # Reconnect backoff (exponential when OBS is offline)
@@ -145,6 +148,7 @@ class OBSModule:
 
         # Thread control (eventlet green thread via patched threading)
         self._stop = threading.Event()
+        self._snapshot_wanted = threading.Event()
         self._thread = threading.Thread(target=self._run, daemon=True)
 
     # --- Lifecycle ---
@@ -160,6 +164,17 @@ class OBSModule:
         self._stop.set()
         self._disconnect()
 
+    def set_idle(self, idle_seconds: Optional[float]) -> None:
+        """Slow snapshots to *idle_seconds* while nobody watches; None = full rate.
+
+        Pings keep their normal cadence so online/offline stays accurate.
+        Returning to full rate refreshes the snapshot on the next cycle.
+        """
+        was_idle = self._idle_snapshot_seconds is not None
+        self._idle_snapshot_seconds = idle_seconds
+        if was_idle and idle_seconds is None:
+            self._snapshot_wanted.set()
+
     # --- Connection management ---
 
     def _do_connect(self) -> bool:
@@ -276,6 +291,7 @@ class OBSModule:
             if not self._ws:
                 return None, "obs-websocket is not connected."
 
+            started = time.perf_counter()
             last_err = None
             for attempt in range(2):  # attempt 0 = first try, 1 = retry
                 try:
@@ -292,9 +308,11 @@ class OBSModule:
                     }
                     if resp_d.get("responseData"):
                         ret["responseData"] = resp_d["responseData"]
+                    record_command("obs", started, True)
                     return ret, None
                 except TimeoutError:
                     # Timeouts are not retried — OBS may genuinely be busy
+                    record_command("obs", started, False)
                     return None, "The obs-websocket request timed out."
                 except Exception as e:
                     last_err = e
@@ -306,6 +324,7 @@ class OBSModule:
                         continue
 
             # Both attempts failed — mark offline
+            record_command("obs", started, False)
             self._online = False
             self._last_error = str(last_err)
             self._disconnect()
@@ -363,12 +382,15 @@ class OBSModule:
             "error": error or "",
         }, status_code
 
-    def get_snapshot(self) -> Optional[dict]:
-        """Return cached snapshot for the polling loop. None if offline."""
-        with self._lock:
-            if not self._online:
-                return None
-            return copy.deepcopy(self._snapshot)
+    def get_snapshot(self) -> Optional[FrozenDict]:
+        """Return the cached immutable snapshot by reference. None if offline.
+
+        Does not take _lock, which the poller holds for the whole snapshot
+        build.
+        """
+        if not self._online:
+            return None
+        return self._snapshot
 
     # --- Poll internals ---
 
@@ -498,13 +520,16 @@ class OBSModule:
 
             # 2) SNAPSHOT refresh (only if online and due)
             now = time.time()
-            if now - last_snapshot_attempt >= self._snapshot_seconds:
+            snapshot_every = self._idle_snapshot_seconds or self._snapshot_seconds
+            if (self._snapshot_wanted.is_set()
+                    or now - last_snapshot_attempt >= snapshot_every):
+                self._snapshot_wanted.clear()
                 last_snapshot_attempt = now
 
                 if self._online and self._connected:
                     with self._lock:
                         try:
-                            snap = self._build_snapshot()
+                            snap = freeze(self._build_snapshot())
                             self._snapshot = snap
                             self._snapshot_ts = time.time()
                         except Exception as e:
@@ -2,14 +2,22 @@
 
 from __future__ import annotations
 
+import collections
+import concurrent.futures
+import gzip
+import hashlib
+import heapq
 import json
 import logging
+import random
 import threading
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 
 import requests as http_requests
 
+from metrics import POLL_DURATION, POLL_OVERRUNS
+
 logger = logging.getLogger("stp-gateway")
 
 
@@ -41,6 +49,65 @@ class MockBackend:
     OBS_SCENE = {"currentProgramSceneName": "MainChurch_Altar"}
 
 
+# =============================================================================
+# PRE-ENCODED PAYLOADS (serialize once, reuse for every emit / HTTP read)
+# =============================================================================
+
+class PreEncoded:
+    """A value whose JSON text is produced once and then spliced verbatim.
+
+    Socket.IO emits, join replays and REST reads of the same cached value
+    all share one ``json.dumps`` (and at most one gzip) instead of
+    re-serializing per recipient.  Treat ``value`` as read-only.
+    """
+
+    __slots__ = ("value", "_raw", "_gz", "_etag")
+
+    def __init__(self, value: Any = None, raw: Optional[str] = None):
+        self.value = value
+        self._raw = raw
+        self._gz = None
+        self._etag = None
+
+    @property
+    def raw(self) -> str:
+        if self._raw is None:
+            self._raw = json.dumps(self.value, separators=(",", ":"))
+        return self._raw
+
+    def gzipped(self) -> bytes:
+        if self._gz is None:
+            self._gz = gzip.compress(self.raw.encode("utf-8"), compresslevel=5)
+        return self._gz
+
+    @property
+    def etag(self) -> str:
+        """Content hash of the JSON text (unquoted), for HTTP validators."""
+        if self._etag is None:
+            self._etag = hashlib.sha1(self.raw.encode("utf-8")).hexdigest()[:20]
+        return self._etag
+
+
+class PreEncodedJSON:
+    """Drop-in ``json`` module for ``SocketIO(json=...)``.
+
+    python-socketio encodes each packet as ``dumps([event, *args])``; any
+    PreEncoded argument is spliced in as-is rather than re-encoded.
+    """
+
+    @staticmethod
+    def dumps(obj: Any, **kwargs) -> str:
+        if isinstance(obj, PreEncoded):
+            return obj.raw
+        if isinstance(obj, (list, tuple)) and any(isinstance(o, PreEncoded) for o in obj):
+            return "[" + ",".join(PreEncodedJSON.dumps(o, **kwargs) for o in obj) + "]"
+        return json.dumps(obj, **kwargs)
+
+    @staticmethod
+    def loads(s, **kwargs) -> Any:
+        return json.loads(s, **kwargs)
+
+
 # =============================================================================
 # STATE CACHE (shared mutable state for pollers + SocketIO broadcast)
 # =============================================================================
@@ -56,14 +123,39 @@ class StateCache:
         "stream_bytes",      # OBS — bytes sent (increments every cycle)
     })
 
-    def __init__(self):
+    # Recent patches kept per key so a reconnecting tablet can catch up
+    # with just the changes it missed instead of a full snapshot.
+    HISTORY_LEN = 64
+
+    def __init__(self, socketio=None, history: int = HISTORY_LEN):
         self._lock = threading.Lock()
         self._state: Dict[str, Any] = {}
+        self._published: Dict[str, Any] = {}  # value as of the key's last patch
+        self._versions: Dict[str, int] = {}
+        self._history: Dict[str, collections.deque] = {}
+        self._encoded: Dict[str, PreEncoded] = {}
+        self._history_len = history
+        self._seq = 0
+        self._socketio = socketio
+        # Sequence numbers restart with the process; the epoch lets clients
+        # tell a restarted gateway apart and fall back to a snapshot.
+        self.epoch = int(time.time() * 1000)
 
     def get(self, key: str) -> Any:
         with self._lock:
             return self._state.get(key)
 
+    def version(self, key: str) -> int:
+        """Return the sequence number of *key*'s last change (0 if never set)."""
+        with self._lock:
+            return self._versions.get(key, 0)
+
+    @property
+    def seq(self) -> int:
+        """Global sequence number of the most recent change to any key."""
+        with self._lock:
+            return self._seq
+
     @staticmethod
     def _strip_volatile(value: Any) -> Any:
         """Return a copy with volatile keys removed (for comparison only)."""
@@ -72,18 +164,451 @@ class StateCache:
                     if k not in StateCache.VOLATILE_KEYS}
         return value
 
-    def set(self, key: str, value: Any) -> bool:
-        """Set value. Returns True if non-volatile fields changed."""
+    @staticmethod
+    def diff(old: Any, new: Any, path: tuple = ()) -> list:
+        """Field-level diff between two values.
+
+        Returns a list of ops: ``[path, value]`` sets the field at *path*,
+        ``[path]`` deletes it.  Only dicts are recursed into — lists and
+        scalars are replaced wholesale.  An empty path replaces the root.
+        """
+        if not (isinstance(old, dict) and isinstance(new, dict)):
+            return [] if old == new else [[list(path), new]]
+        ops = []
+        for k, v in new.items():
+            if k not in old:
+                ops.append([list(path) + [k], v])
+            elif old[k] != v:
+                ops.extend(StateCache.diff(old[k], v, path + (k,)))
+        for k in old:
+            if k not in new:
+                ops.append([list(path) + [k]])
+        return ops
+
+    @staticmethod
+    def compose(first: Any, second: Any) -> PreEncoded:
+        """Fold two consecutive patches for the same key into one.
+
+        The result goes from *first*'s base to *second*'s version.  Ops
+        overwritten by a later op on the same path or an ancestor are
+        dropped.  Used as the BroadcastScheduler merge for state:patch.
+        """
+        a = first.value if isinstance(first, PreEncoded) else first
+        b = second.value if isinstance(second, PreEncoded) else second
+        kept, later = [], set()
+        for op in reversed(a["ops"] + b["ops"]):
+            path = tuple(op[0])
+            if any(path[:i] in later for i in range(len(path) + 1)):
+                continue
+            kept.append(op)
+            later.add(path)
+        kept.reverse()
+        return PreEncoded({"room": a["room"], "v": b["v"], "base": a["base"], "ops": kept})
+
+    def _update(self, key: str, value: Any) -> Optional[PreEncoded]:
         with self._lock:
+            had = key in self._state
             old = self._state.get(key)
             self._state[key] = value
-            return self._strip_volatile(old) != self._strip_volatile(value)
+            self._encoded.pop(key, None)
+            if had and self._strip_volatile(old) == self._strip_volatile(value):
+                return None
+            self._seq += 1
+            base = self._versions.get(key, 0)
+            self._versions[key] = self._seq
+            if had:
+                # Diff against what the last patch produced, so volatile
+                # fields that changed silently in between are carried too;
+                # ops against the stored value cover snapshot holders.
+                ops = self.diff(self._published[key], value)
+                paths = {tuple(op[0]) for op in ops}
+                ops += [op for op in self.diff(old, value) if tuple(op[0]) not in paths]
+            else:
+                ops = [[[], value]]
+            self._published[key] = value
+            patch = PreEncoded({"room": key, "v": self._seq, "base": base, "ops": ops})
+            ring = self._history.get(key)
+            if ring is None:
+                ring = self._history[key] = collections.deque(maxlen=self._history_len)
+            ring.append(patch)
+            return patch
+
+    def update(self, key: str, value: Any) -> Optional[dict]:
+        """Set value and return a versioned patch describing the change.
+
+        Returns None if no non-volatile field changed.  The patch has the
+        form ``{"room", "v", "base", "ops"}`` where *v* is a new global
+        sequence number and *base* the key's previous one, so consecutive
+        patches for a key chain together (``next.base == prev.v``).
+        """
+        patch = self._update(key, value)
+        return patch.value if patch is not None else None
+
+    def set(self, key: str, value: Any) -> bool:
+        """Set value. Returns True if non-volatile fields changed."""
+        return self.update(key, value) is not None
+
+    def publish(self, key: str, value: Any) -> bool:
+        """Set value and broadcast a ``state:patch`` to the *key* room.
+
+        Only the changed fields go over the wire; tablets rebuild the full
+        value locally and ask for a ``state:snapshot`` on a version gap.
+        *socketio* may be a BroadcastScheduler, in which case bursts of
+        patches are folded together with compose().
+        Returns True if anything was broadcast.
+        """
+        patch = self._update(key, value)
+        if patch is None:
+            return False
+        if self._socketio is not None:
+            self._socketio.emit("state:patch", patch, room=key)
+        return True
+
+    def snapshot(self, key: str) -> Optional[dict]:
+        """Return ``{"room", "v", "epoch", "value"}`` for a full resync, or None."""
+        with self._lock:
+            if key not in self._state:
+                return None
+            return {"room": key, "v": self._versions.get(key, 0),
+                    "epoch": self.epoch, "value": self._state[key]}
+
+    def _encode(self, key: str):
+        """Return ``(version, PreEncoded value)`` for *key*, or None if unset.
+
+        Encoded lazily on first read after a change and then shared by
+        every reader until the value changes again.  The JSON work runs
+        outside the lock.
+        """
+        with self._lock:
+            if key not in self._state:
+                return None
+            value = self._state[key]
+            version = self._versions.get(key, 0)
+            enc = self._encoded.get(key)
+        if enc is None:
+            enc = PreEncoded(value, raw=json.dumps(value, separators=(",", ":")))
+            with self._lock:
+                # Only cache it if nothing replaced the value meanwhile
+                if self._state.get(key) is value:
+                    self._encoded[key] = enc
+        return version, enc
+
+    def encoded(self, key: str) -> Optional[PreEncoded]:
+        """Return the current value of *key* pre-encoded, or None if unset."""
+        found = self._encode(key)
+        return found[1] if found else None
+
+    def encoded_snapshot(self, key: str) -> Optional[PreEncoded]:
+        """Like snapshot(), with the value spliced in from the encoded cache."""
+        found = self._encode(key)
+        if found is None:
+            return None
+        version, enc = found
+        snap = {"room": key, "v": version, "epoch": self.epoch, "value": enc.value}
+        raw = (f'{{"room":{json.dumps(key)},"v":{version},'
+               f'"epoch":{self.epoch},"value":{enc.raw}}}')
+        return PreEncoded(snap, raw=raw)
+
+    def changes_since(self, key: str, since: int) -> Optional[list]:
+        """Return the (pre-encoded) patches for *key* newer than *since*.
+
+        An empty list means the caller is already current.  Returns None
+        when the ring no longer reaches back to *since* (or *since* is not
+        a version this key ever had) — the caller needs a full snapshot.
+        """
+        with self._lock:
+            if since == self._versions.get(key, 0):
+                return []
+            missed = [p for p in self._history.get(key, ()) if p.value["v"] > since]
+            if not missed or missed[0].value["base"] != since:
+                return None
+            return missed
 
     def get_all(self) -> dict:
         with self._lock:
             return dict(self._state)
 
 
+# =============================================================================
+# ROOM PRESENCE (which tablets are watching each state room)
+# =============================================================================
+
+class RoomPresence:
+    """Tracks Socket.IO room membership so pollers can idle unwatched rooms.
+
+    Updated by the join/leave/disconnect handlers.  Listeners are told when
+    a room goes from unwatched to watched (or back), e.g. so the poll
+    scheduler can refresh a room the moment its first tablet joins.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._members: Dict[str, set] = {}
+        self._listeners: list = []
+
+    def add_listener(self, fn) -> None:
+        """Register ``fn(room, watched)``, called when a room changes state."""
+        self._listeners.append(fn)
+
+    def join(self, room: str, sid: str) -> None:
+        with self._lock:
+            members = self._members.setdefault(room, set())
+            became_watched = not members
+            members.add(sid)
+        if became_watched:
+            self._notify(room, True)
+
+    def leave(self, room: str, sid: str) -> None:
+        with self._lock:
+            members = self._members.get(room)
+            if not members or sid not in members:
+                return
+            members.discard(sid)
+            became_idle = not members
+        if became_idle:
+            self._notify(room, False)
+
+    def drop(self, sid: str) -> None:
+        """Remove a disconnected sid from every room."""
+        with self._lock:
+            rooms = [r for r, m in self._members.items() if sid in m]
+        for room in rooms:
+            self.leave(room, sid)
+
+    def watched(self, room: str) -> bool:
+        with self._lock:
+            return bool(self._members.get(room))
+
+    def status(self) -> dict:
+        with self._lock:
+            return {room: len(m) for room, m in self._members.items()}
+
+    def _notify(self, room: str, watched: bool) -> None:
+        for fn in self._listeners:
+            try:
+                fn(room, watched)
+            except Exception as e:
+                logger.warning(f"Room presence listener failed for {room}: {e}")
+
+
+# =============================================================================
+# ADAPTIVE POLL INTERVAL (tightens on change, relaxes when static)
+# =============================================================================
+
+class AdaptiveInterval:
+    """Per-poller interval driven by how often the polled state changes.
+
+    - While a macro is running the interval sits at *min_s*.
+    - A poll that changed state halves the interval (not below *min_s*).
+    - After *settle* consecutive static polls the interval grows by
+      *backoff* each poll (not above *max_s*).
+
+    With min_s == max_s it behaves as a fixed interval.
+    """
+
+    def __init__(self, base: float, min_s: Optional[float] = None,
+                 max_s: Optional[float] = None, backoff: float = 1.5,
+                 settle: int = 3):
+        self.min_s = float(min_s if min_s is not None else base)
+        self.max_s = max(self.min_s, float(max_s if max_s is not None else base))
+        self.backoff = max(1.0, float(backoff))
+        self.settle = max(1, int(settle))
+        self.current = min(max(float(base), self.min_s), self.max_s)
+        self._static = 0
+
+    @classmethod
+    def from_config(cls, base: float, cfg: Optional[dict]) -> "AdaptiveInterval":
+        cfg = cfg or {}
+        return cls(base, cfg.get("min"), cfg.get("max"),
+                   cfg.get("backoff", 1.5), cfg.get("settle", 3))
+
+    def next(self, changed: bool, active: bool = False) -> float:
+        """Record one poll outcome and return the interval to sleep."""
+        if changed:
+            self._static = 0
+        else:
+            self._static += 1
+        if active:
+            self.current = self.min_s
+        elif changed:
+            self.current = max(self.min_s, self.current / 2)
+        elif self._static >= self.settle:
+            self.current = min(self.max_s, self.current * self.backoff)
+        return self.current
+
+
+# =============================================================================
+# POLL SCHEDULER (one heap of due times, bounded worker pool)
+# =============================================================================
+
+class _PollJob:
+    __slots__ = ("name", "fn", "deadline", "gen", "running", "started",
+                 "wake_pending", "runs", "overruns", "errors",
+                 "last_ms", "total_ms", "max_ms", "next_due")
+
+    def __init__(self, name: str, fn: Callable[[], float], deadline: float):
+        self.name = name
+        self.fn = fn
+        self.deadline = deadline
+        self.gen = 0               # bumped on reschedule; stale heap entries are skipped
+        self.running = False
+        self.started = 0.0
+        self.wake_pending = False
+        self.runs = 0
+        self.overruns = 0
+        self.errors = 0
+        self.last_ms = 0.0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.next_due = 0.0
+
+
+class PollScheduler:
+    """Runs every background poll from one min-heap of next-due times.
+
+    Each job is a callable that performs one poll and returns the delay
+    until its next run, so pacing (fixed, adaptive, keep-warm) stays with
+    the job.  Due jobs are dispatched onto a bounded worker pool; a job is
+    only re-queued once its run finishes, so the same poll never overlaps
+    itself.  Delays get +/- *jitter* (fraction) so polls don't line up.
+
+    Runs longer than the job's *deadline* are counted as overruns and
+    reported to *on_overrun*; a worker can't be pre-empted, but a slow job
+    never delays other jobs beyond the pool size.
+    """
+
+    def __init__(self, workers: int = 4, jitter: float = 0.1,
+                 on_overrun: Optional[Callable[[str, float], None]] = None):
+        self._jobs: Dict[str, _PollJob] = {}
+        self._heap: list = []
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._jitter = max(0.0, float(jitter))
+        self._workers = max(1, int(workers))
+        self._on_overrun = on_overrun
+        self._pool: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, name: str, fn: Callable[[], float], deadline: float = 30.0,
+            first_delay: float = 0.0) -> None:
+        """Register a job; *fn* runs one poll and returns seconds until the next."""
+        with self._cond:
+            job = _PollJob(name, fn, deadline)
+            self._jobs[name] = job
+            self._push(job, first_delay)
+            self._cond.notify()
+
+    def wake(self, name: Optional[str] = None) -> None:
+        """Make a job (every job when *name* is None) due now."""
+        with self._cond:
+            jobs = [self._jobs[name]] if name in self._jobs else (
+                list(self._jobs.values()) if name is None else [])
+            for job in jobs:
+                if job.running:
+                    job.wake_pending = True
+                else:
+                    self._push(job, 0.0)
+            self._cond.notify()
+
+    def start(self) -> None:
+        self._pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self._workers, thread_name_prefix="poll")
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        with self._cond:
+            self._cond.notify()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+
+    def stats(self) -> dict:
+        """Per-job timing: runs, errors, overruns, last/avg/max duration."""
+        now = time.time()
+        with self._cond:
+            return {
+                name: {
+                    "runs": j.runs,
+                    "errors": j.errors,
+                    "overruns": j.overruns,
+                    "deadline_s": j.deadline,
+                    "last_ms": round(j.last_ms, 1),
+                    "avg_ms": round(j.total_ms / j.runs, 1) if j.runs else 0.0,
+                    "max_ms": round(j.max_ms, 1),
+                    "running_for_s": round(now - j.started, 1) if j.running else None,
+                    "next_due_in_s": None if j.running else round(max(0.0, j.next_due - now), 1),
+                }
+                for name, j in self._jobs.items()
+            }
+
+    # --- internals (call with _cond held) ---
+
+    def _push(self, job: _PollJob, delay: float) -> None:
+        if delay > 0 and self._jitter:
+            delay *= 1 + random.uniform(-self._jitter, self._jitter)
+        job.gen += 1
+        job.next_due = time.time() + max(0.0, delay)
+        self._seq += 1
+        heapq.heappush(self._heap, (job.next_due, self._seq, job.name, job.gen))
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            due = []
+            with self._cond:
+                now = time.time()
+                while self._heap and self._heap[0][0] <= now:
+                    _, _, name, gen = heapq.heappop(self._heap)
+                    job = self._jobs.get(name)
+                    if job is None or job.gen != gen or job.running:
+                        continue
+                    job.running = True
+                    job.started = now
+                    due.append(job)
+                if not due:
+                    timeout = (self._heap[0][0] - now) if self._heap else 1.0
+                    self._cond.wait(timeout=min(max(timeout, 0.01), 1.0))
+                    continue
+            for job in due:
+                self._pool.submit(self._execute, job)
+
+    def _execute(self, job: _PollJob) -> None:
+        start = time.time()
+        delay = None
+        try:
+            delay = job.fn()
+        except Exception as e:
+            job.errors += 1
+            logger.error(f"Poll job {job.name} raised: {e}", exc_info=True)
+        elapsed = time.time() - start
+        POLL_DURATION.observe(elapsed, poller=job.name)
+        with self._cond:
+            job.running = False
+            job.runs += 1
+            job.last_ms = elapsed * 1000
+            job.total_ms += job.last_ms
+            job.max_ms = max(job.max_ms, job.last_ms)
+            overran = elapsed > job.deadline
+            if overran:
+                job.overruns += 1
+            if delay is None:
+                delay = 5.0
+            if job.wake_pending:
+                job.wake_pending = False
+                delay = 0.0
+            self._push(job, delay)
+            self._cond.notify()
+        if overran:
+            POLL_OVERRUNS.inc(poller=job.name)
+            logger.warning(f"Poll {job.name} took {elapsed:.1f}s (deadline {job.deadline:.0f}s)")
+            if self._on_overrun is not None:
+                try:
+                    self._on_overrun(job.name, elapsed)
+                except Exception as e:
+                    logger.debug(f"Poll overrun hook failed for {job.name}: {e}")
+
+
 # =============================================================================
 # CIRCUIT BREAKER (per-service failure tracking with backoff)
 # =============================================================================
@@ -155,6 +680,11 @@ class PollerWatchdog:
         with self._lock:
             self._heartbeats[name] = time.time()
 
+    def set_interval(self, name: str, interval: float):
+        """Update the expected interval (e.g. when a poller idles)."""
+        with self._lock:
+            self._intervals[name] = interval
+
     def breaker(self, name: str) -> Optional[CircuitBreaker]:
         with self._lock:
             return self._breakers.get(name)
@@ -170,6 +700,8 @@ class PollerWatchdog:
                 cb = self._breakers.get(name)
                 result[name] = {
                     "last_heartbeat_age_s": round(age, 1),
+                    "last_heartbeat_at": round(last, 1),
+                    "interval_s": interval,
                     "stale": stale,
                     "circuit": cb.status() if cb else None,
                 }
@@ -303,8 +835,8 @@ def build_ha_device_cache(ctx):
 # =============================================================================
 
 def start_pollers(ctx):
-    """Start all background polling threads."""
-    from macro_engine import fetch_ha_button_states
+    """Start device module pollers and schedule all gateway poll jobs."""
+    from macro_engine import fetch_ha_button_states, macro_activity
 
     socketio = ctx.socketio
     cfg = ctx.cfg
@@ -313,6 +845,7 @@ def start_pollers(ctx):
     watchdog = ctx.watchdog
     mw_cfg = cfg.get("middleware", {})
     cam_cfg = cfg.get("camlytics", {})
+    presence = ctx.room_presence
 
     # Start module pollers
     if ctx.x32 is not None:
@@ -328,17 +861,74 @@ def start_pollers(ctx):
 
     poll_cfg = cfg.get("polling", {})
 
-    def poll_loop(name, interval, poll_fn):
-        logger.info(f"Poller started: {name} (every {interval}s)")
+    # Rooms whose pollers drop to a keep-warm interval while no tablet is in
+    # the room.  MoIP is excluded: macros and scenes rely on fresh receiver
+    # state regardless of who is watching.
+    keep_warm = float(poll_cfg.get("keep_warm", 60))
+    idle_rooms = set(poll_cfg.get("idle_rooms", ("x32", "obs", "projectors", "ha", "camlytics")))
+
+    def _idle_interval(name, interval):
+        """Keep-warm interval for *name*, or None if it always polls at full rate."""
+        if not keep_warm or name not in idle_rooms:
+            return None
+        return max(interval, keep_warm)
+
+    # The X32 and OBS modules poll their devices themselves; the gateway
+    # loops only read their snapshots, so idle those too
+    idle_modules = {"x32": ctx.x32, "obs": ctx.obs}
+
+    def _on_overrun(name, elapsed):
+        # A poll blowing its deadline counts against the circuit breaker so a
+        # persistently slow device backs off like a failing one
+        cb = watchdog.breaker(name)
+        if cb:
+            cb.record_failure()
+
+    scheduler = PollScheduler(
+        workers=poll_cfg.get("workers", 4),
+        jitter=poll_cfg.get("jitter", 0.1),
+        on_overrun=_on_overrun,
+    )
+    ctx.poll_scheduler = scheduler
+    if ctx.x32 is not None:
+        # Mixer pushes (/xremote) reach tablets on the next scheduler tick
+        # instead of waiting out the x32 poll interval
+        ctx.x32.add_listener(lambda: scheduler.wake("x32"))
+    deadlines = poll_cfg.get("deadlines", {}) or {}
+
+    def _on_room_change(room, watched):
+        mod = idle_modules.get(room)
+        if mod is not None and room in idle_rooms and keep_warm:
+            mod.set_idle(None if watched else keep_warm)
+        if watched:
+            scheduler.wake(room)  # fresh data for the first tablet now
+        logger.info(f"Room {room} {'watched — full-rate polling' if watched else 'idle — keep-warm polling'}")
+
+    presence.add_listener(_on_room_change)
+    for room, mod in idle_modules.items():
+        if mod is not None and room in idle_rooms and keep_warm and not presence.watched(room):
+            mod.set_idle(keep_warm)
+
+    adaptive_cfg = poll_cfg.get("adaptive", {}) or {}
+
+    def poll_job(name, interval, poll_fn):
+        """Build a scheduler job: one poll + publish, returns the next delay."""
+        idle_interval = _idle_interval(name, interval)
+        pacing = AdaptiveInterval.from_config(interval, adaptive_cfg.get(name))
+        logger.info(f"Poller scheduled: {name} (every {interval}s"
+                    + (f", adaptive {pacing.min_s}-{pacing.max_s}s" if pacing.min_s != pacing.max_s else "")
+                    + (f", {idle_interval}s when unwatched)" if idle_interval else ")"))
         watchdog.register(name, interval)
         crash_count = 0
-        while True:
+
+        def run():
+            nonlocal crash_count
             try:
                 cb = watchdog.breaker(name)
                 if cb and not cb.allow_request():
                     logger.debug(f"Poller {name}: circuit open, skipping poll")
-                    time.sleep(interval)
-                    continue
+                    return interval
+                changed = False
                 try:
                     data = poll_fn()
                     watchdog.heartbeat(name)
@@ -347,24 +937,31 @@ def start_pollers(ctx):
                             cb.record_success()
                         else:
                             cb.record_failure()
-                    if data is not None and state_cache.set(name, data):
-                        socketio.emit(f"state:{name}", data, room=name)
+                    if data is not None:
+                        changed = state_cache.publish(name, data)
                 except Exception as e:
                     logger.warning(f"Poller {name} error: {e}")
                     if cb:
                         cb.record_failure()
-                time.sleep(interval)
+                crash_count = 0
+                if idle_interval and not presence.watched(name):
+                    next_in = idle_interval
+                else:
+                    next_in = pacing.next(changed, macro_activity())
+                watchdog.set_interval(name, next_in)
+                return next_in
             except Exception as e:
-                # Top-level catch: thread would die without this
+                # Unexpected failure outside the poll itself
                 crash_count += 1
                 logger.error(f"Poller {name} CRASHED (#{crash_count}): {e}", exc_info=True)
                 try:
                     socketio.emit("poller_died", {"poller": name, "error": str(e), "crash_count": crash_count})
                 except Exception:
                     pass
-                # Back off before restarting: 5s, 10s, 20s, capped at 60s
-                backoff = min(5 * (2 ** (crash_count - 1)), 60)
-                time.sleep(backoff)
+                # Back off before retrying: 5s, 10s, 20s, capped at 60s
+                return min(5 * (2 ** (crash_count - 1)), 60)
+
+        return run
 
     # Fail-streak counters for poller logging
     _poll_fail_streaks = {}
@@ -577,24 +1174,14 @@ def start_pollers(ctx):
         pollers.append(("camlytics", cam_interval, poll_camlytics))
 
     # HA device cache refresh (cameras + locks, every 5 min)
-    def _ha_cache_loop():
-        logger.info("HA device cache: initial load...")
+    def _ha_cache_job():
         build_ha_device_cache(ctx)
-        crash_count = 0
-        while True:
-            try:
-                time.sleep(300)
-                build_ha_device_cache(ctx)
-                crash_count = 0
-            except Exception as e:
-                crash_count += 1
-                logger.error(f"HA cache loop CRASHED (#{crash_count}): {e}", exc_info=True)
-                backoff = min(5 * (2 ** (crash_count - 1)), 60)
-                time.sleep(backoff)
+        return 300
 
-    ha_cache_thread = threading.Thread(target=_ha_cache_loop, daemon=True)
-    ha_cache_thread.start()
+    logger.info("HA device cache: initial load...")
+    scheduler.add("ha_devices", _ha_cache_job, deadline=deadlines.get("ha_devices", 60))
 
     for name, interval, fn in pollers:
-        t = threading.Thread(target=poll_loop, args=(name, interval, fn), daemon=True)
-        t.start()
+        scheduler.add(name, poll_job(name, interval, fn),
+                      deadline=deadlines.get(name, max(10.0, interval * 2)))
+    scheduler.start()
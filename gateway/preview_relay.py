@@ -0,0 +1,366 @@
+"""MoIP preview relay — one upstream pull per source, shared by every tablet.
+
+The preview encoder is a small HDMI-to-IP box; each tablet on the video page
+used to make its own HLS manifest/segment requests and hold its own MJPEG
+connection, so N tablets meant N identical pulls.  The relay sits between
+the proxy routes and the encoder:
+
+- HLS manifests are cached for a fraction of a second and fetched once for
+  everyone asking at the same time (single flight).
+- HLS segments are cached in memory, least recently used first out, within
+  a byte budget and a short age limit.
+- Each MJPEG source has one upstream connection whose frames are handed to
+  every viewer.  A viewer always gets the newest frame, so a slow tablet
+  skips frames instead of queueing them, and the upstream is closed once
+  the last viewer has been gone for ``linger_seconds``.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import quote, urljoin
+
+import requests as http_requests
+
+from metrics import PREVIEW_CACHE_HITS, PREVIEW_FRAMES_DROPPED, PREVIEW_UPSTREAM
+
+logger = logging.getLogger("stp-gateway")
+
+MJPEG_BOUNDARY = "frame"
+_SOI, _EOI = b"\xff\xd8", b"\xff\xd9"
+_MAX_PENDING = 8 * 1024 * 1024  # bytes of unframed MJPEG before giving up on the buffer
+
+
+def rewrite_manifest(text: str, stream_url: str, cb_suffix: str = "") -> str:
+    """Point every URI in an HLS playlist back at the gateway's proxy routes."""
+    base_url = stream_url.rsplit("/", 1)[0] + "/"
+    lines = []
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            abs_url = urljoin(base_url, line.strip())
+            if abs_url.endswith(".m3u8"):
+                # Sub-playlist — route back through the stream endpoint
+                lines.append(f"/api/moip/preview/stream?url={quote(abs_url, safe='')}{cb_suffix}")
+            else:
+                # Segment (.ts) — route through segment endpoint
+                lines.append(f"/api/moip/preview/segment?url={quote(abs_url, safe='')}{cb_suffix}")
+        else:
+            lines.append(line)
+    return "\n".join(lines) + "\n"
+
+
+def split_jpegs(buf: bytes) -> Tuple[list, bytes]:
+    """Cut complete JPEG images (SOI..EOI) out of *buf*; returns (frames, rest)."""
+    frames = []
+    while True:
+        start = buf.find(_SOI)
+        if start < 0:
+            # Keep a trailing 0xFF in case it is the first half of the next SOI
+            return frames, buf[-1:] if buf.endswith(b"\xff") else b""
+        end = buf.find(_EOI, start + 2)
+        if end < 0:
+            return frames, buf[start:]
+        frames.append(buf[start:end + 2])
+        buf = buf[end + 2:]
+
+
+class _Flight:
+    """One in-progress upstream fetch that late arrivals wait on."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+
+
+class _MjpegSource:
+    """Latest frame from one MJPEG upstream plus the viewers reading it."""
+
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.cond = threading.Condition()
+        self.frame = b""
+        self.seq = 0
+        self.viewers = 0
+        self.idle_since: Optional[float] = None
+        self.connected = False
+        self.error: Optional[str] = None
+        self.closed = False
+
+
+class _MjpegViewer:
+    """Response body for one MJPEG viewer; ``close()`` (called by the WSGI
+    server when the tablet goes away) releases its slot."""
+
+    def __init__(self, relay: "PreviewRelay", source: _MjpegSource) -> None:
+        self._relay = relay
+        self._source = source
+        self._last = 0
+        self._closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> bytes:
+        s = self._source
+        deadline = time.monotonic() + self._relay.frame_timeout
+        with s.cond:
+            while s.seq == self._last and not s.closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                s.cond.wait(remaining)
+            if s.seq == self._last:
+                # Upstream gone or silent: end the response, the tablet reconnects
+                self.close()
+                raise StopIteration
+            frame, seq = s.frame, s.seq
+        if self._last and seq > self._last + 1:
+            PREVIEW_FRAMES_DROPPED.inc(seq - self._last - 1)
+        self._last = seq
+        return (f"--{MJPEG_BOUNDARY}\r\nContent-Type: image/jpeg\r\n"
+                f"Content-Length: {len(frame)}\r\n\r\n").encode("ascii") + frame + b"\r\n"
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._relay._leave(self._source)
+
+
+class PreviewRelay:
+    """Shared upstream access to the preview encoder (see module docstring).
+
+    *fetch* is ``requests.get``-compatible and only replaced in tests.
+    """
+
+    def __init__(self, cache_mb: float = 32, manifest_ttl_ms: float = 1000,
+                 segment_ttl_seconds: float = 10, linger_seconds: float = 2,
+                 frame_timeout: float = 10, fetch: Callable = http_requests.get) -> None:
+        self._fetch = fetch
+        self._cache_bytes = int(max(1.0, float(cache_mb)) * 1024 * 1024)
+        self._manifest_ttl = max(0.0, float(manifest_ttl_ms)) / 1000.0
+        self._segment_ttl = max(0.0, float(segment_ttl_seconds))
+        self._linger = max(0.0, float(linger_seconds))
+        self.frame_timeout = float(frame_timeout)
+
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+        # url -> (fetched at, text); kept apart from segments so a burst of
+        # segments can never evict the playlist
+        self._manifests: Dict[str, Tuple[float, str]] = {}
+        # url -> (fetched at, body, content type), least recently used first
+        self._segments: "OrderedDict[str, Tuple[float, bytes, str]]" = OrderedDict()
+        self._segment_bytes = 0
+        self._mjpeg: Dict[str, _MjpegSource] = {}
+        self._stop = threading.Event()
+
+    # -------------------
+    # HLS
+    # -------------------
+
+    def manifest(self, url: str) -> str:
+        """Upstream playlist text, at most ``manifest_ttl_ms`` old."""
+        with self._lock:
+            cached = self._manifests.get(url)
+        if cached and time.monotonic() - cached[0] < self._manifest_ttl:
+            PREVIEW_CACHE_HITS.inc(kind="manifest")
+            return cached[1]
+
+        def fetch() -> str:
+            resp = self._fetch(url, timeout=5)
+            resp.raise_for_status()
+            with self._lock:
+                self._manifests[url] = (time.monotonic(), resp.text)
+            return resp.text
+
+        return self._single_flight(url, "manifest", fetch)
+
+    def segment(self, url: str) -> Tuple[bytes, str]:
+        """Segment body and content type, from memory when recently fetched."""
+        with self._lock:
+            cached = self._segments.get(url)
+            if cached and time.monotonic() - cached[0] < self._segment_ttl:
+                self._segments.move_to_end(url)
+                PREVIEW_CACHE_HITS.inc(kind="segment")
+                return cached[1], cached[2]
+
+        def fetch() -> Tuple[bytes, str]:
+            resp = self._fetch(url, timeout=10)
+            resp.raise_for_status()
+            body = resp.content
+            ctype = resp.headers.get("Content-Type", "video/mp2t")
+            self._store_segment(url, body, ctype)
+            return body, ctype
+
+        return self._single_flight(url, "segment", fetch)
+
+    def _store_segment(self, url: str, body: bytes, ctype: str) -> None:
+        if len(body) > self._cache_bytes:
+            return
+        with self._lock:
+            old = self._segments.pop(url, None)
+            if old:
+                self._segment_bytes -= len(old[1])
+            self._segments[url] = (time.monotonic(), body, ctype)
+            self._segment_bytes += len(body)
+            while self._segment_bytes > self._cache_bytes:
+                _, (_, evicted, _) = self._segments.popitem(last=False)
+                self._segment_bytes -= len(evicted)
+
+    def _single_flight(self, key: str, kind: str, fn: Callable):
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        if leader:
+            PREVIEW_UPSTREAM.inc(kind=kind)
+            try:
+                flight.value = fn()
+            except Exception as e:
+                flight.error = e
+            finally:
+                with self._lock:
+                    self._flights.pop(key, None)
+                flight.done.set()
+        else:
+            PREVIEW_CACHE_HITS.inc(kind=kind)
+            if not flight.done.wait(15):
+                raise TimeoutError(f"preview fetch still running: {key}")
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+
+    def reset(self) -> None:
+        """Drop cached HLS data (the preview receiver was switched)."""
+        with self._lock:
+            self._manifests.clear()
+            self._segments.clear()
+            self._segment_bytes = 0
+
+    # -------------------
+    # MJPEG
+    # -------------------
+
+    def open_mjpeg(self, url: str, connect_timeout: float = 5.0) -> Tuple[_MjpegViewer, str]:
+        """Join *url*'s shared upstream; returns (response body, content type).
+
+        Raises ConnectionError if the upstream can't be reached, so the
+        route can answer 502 as the direct proxy did.
+        """
+        with self._lock:
+            source = self._mjpeg.get(url)
+            if source is None or source.closed:
+                source = self._mjpeg[url] = _MjpegSource(url)
+                threading.Thread(target=self._pump, args=(source,), daemon=True,
+                                 name="preview-mjpeg").start()
+            with source.cond:
+                source.viewers += 1
+                source.idle_since = None
+        viewer = _MjpegViewer(self, source)
+        deadline = time.monotonic() + connect_timeout
+        with source.cond:
+            while not source.connected and not source.closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                source.cond.wait(remaining)
+            ok, error = source.connected, source.error
+        if not ok:
+            viewer.close()
+            raise ConnectionError(error or "preview upstream did not connect")
+        return viewer, f"multipart/x-mixed-replace; boundary={MJPEG_BOUNDARY}"
+
+    def _leave(self, source: _MjpegSource) -> None:
+        with source.cond:
+            source.viewers = max(0, source.viewers - 1)
+            if source.viewers == 0:
+                source.idle_since = time.monotonic()
+
+    def _idle_expired(self, source: _MjpegSource) -> bool:
+        with source.cond:
+            return (source.viewers == 0 and source.idle_since is not None
+                    and time.monotonic() - source.idle_since >= self._linger)
+
+    def _pump(self, source: _MjpegSource) -> None:
+        """Read *source*'s upstream until no one has watched for the linger time."""
+        while True:
+            self._pump_until_idle(source)
+            with self._lock:
+                with source.cond:
+                    if source.viewers and not self._stop.is_set():
+                        continue  # someone joined while we were winding down
+                    source.closed = True
+                    source.cond.notify_all()
+                if self._mjpeg.get(source.url) is source:
+                    del self._mjpeg[source.url]
+            break
+        logger.info(f"Preview relay: MJPEG upstream {source.url} closed")
+
+    def _pump_until_idle(self, source: _MjpegSource) -> None:
+        backoff = 1.0
+        while not self._stop.is_set() and not self._idle_expired(source):
+            PREVIEW_UPSTREAM.inc(kind="mjpeg")
+            try:
+                resp = self._fetch(source.url, stream=True, timeout=5)
+                resp.raise_for_status()
+                with source.cond:
+                    source.connected, source.error = True, None
+                    source.cond.notify_all()
+                backoff = 1.0
+                pending = b""
+                try:
+                    for chunk in resp.iter_content(chunk_size=8192):
+                        if self._stop.is_set() or self._idle_expired(source):
+                            return
+                        frames, pending = split_jpegs(pending + chunk)
+                        if len(pending) > _MAX_PENDING:
+                            pending = b""
+                        if frames:
+                            with source.cond:
+                                source.frame = frames[-1]
+                                source.seq += len(frames)
+                                source.cond.notify_all()
+                finally:
+                    resp.close()
+            except Exception as e:
+                logger.warning(f"Preview relay: MJPEG upstream {source.url} failed: {e}")
+                with source.cond:
+                    source.connected, source.error = False, str(e)
+                    source.cond.notify_all()
+                    if source.viewers == 0:
+                        return  # nobody left to retry for
+                if self._stop.wait(backoff):
+                    return
+                backoff = min(backoff * 2, 10.0)
+
+    # -------------------
+    # Status
+    # -------------------
+
+    @property
+    def viewers(self) -> int:
+        with self._lock:
+            return sum(s.viewers for s in self._mjpeg.values())
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "mjpeg_sources": {url: s.viewers for url, s in self._mjpeg.items()},
+                "segments_cached": len(self._segments),
+                "segment_bytes": self._segment_bytes,
+                "cache_bytes": self._cache_bytes,
+            }
+
+    def stop(self) -> None:
+        self._stop.set()
+        with self._lock:
+            sources = list(self._mjpeg.values())
+        for s in sources:
+            with s.cond:
+                s.closed = True
+                s.cond.notify_all()
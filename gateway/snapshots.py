@@ -0,0 +1,54 @@
+"""Immutable device snapshots shared by reference.
+
+Device pollers build a fresh dict every refresh, freeze it, and swap it in
+with a single attribute assignment.  Readers (status routes, routing
+lookups, health probes, the state broadcaster) get the frozen object
+itself — no deep copy, no poller lock.  Anyone who really needs a mutable
+copy can ``thaw()`` it (``copy.deepcopy`` does the same).
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+
+class FrozenDict(dict):
+    """A read-only dict.  Serializes and compares exactly like a dict."""
+
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("snapshot is read-only; thaw() it for a mutable copy")
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+    __ior__ = _readonly
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return (dict, (thaw(self),))
+
+
+def freeze(value: Any) -> Any:
+    """Recursively convert dicts to FrozenDict and lists to tuples."""
+    if isinstance(value, FrozenDict):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Inverse of freeze(): plain, mutable dicts and lists."""
+    if isinstance(value, dict):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(v) for v in value]
+    return value
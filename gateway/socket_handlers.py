@@ -10,6 +10,8 @@ import threading
 from flask import request
 from flask_socketio import emit, join_room, leave_room
 
+from meter_stream import METER_ROOM
+
 logger = logging.getLogger("stp-gateway")
 
 # ---------------------------------------------------------------------------
@@ -91,12 +93,17 @@ class _TabletConnStats:
 # Module-level singleton so the API route can access it
 conn_stats = _TabletConnStats()
 
+# Rooms a tablet may join; each maps to a StateCache key of the same name
+STATE_ROOMS = ("moip", "x32", "obs", "projectors", "ha", "macros", "camlytics", "health", "wattbox")
+
 
 def register_socket_handlers(ctx):
     """Register all SocketIO event handlers."""
     socketio = ctx.socketio
     db = ctx.db
     state_cache = ctx.state_cache
+    presence = ctx.room_presence
+    meters = getattr(ctx, "meter_stream", None)
     cfg = ctx.cfg
 
     @socketio.on("connect")
@@ -119,6 +126,9 @@ def register_socket_handlers(ctx):
         uptime = f"{now - connected_at:.1f}s" if connected_at else "?"
         logger.info(f"SocketIO disconnect: tablet={tablet} sid={request.sid} uptime={uptime}")
         conn_stats.record_disconnect(tablet, connected_at, now, reason="server-observed")
+        presence.drop(request.sid)
+        if meters is not None:
+            meters.leave(request.sid)
 
     @socketio.on("diag")
     def on_diag(data):
@@ -177,19 +187,50 @@ def register_socket_handlers(ctx):
     @socketio.on("join")
     def on_join(data):
         room = data.get("room", "")
-        if room in ("moip", "x32", "obs", "projectors", "ha", "macros", "camlytics", "health", "wattbox"):
+        if room == METER_ROOM:
+            # Binary x32:meters frames, no state snapshot; "fps" caps this tablet's rate
+            if meters is not None:
+                join_room(room)
+                fps = meters.join(request.sid, data.get("fps"))
+                logger.debug(f"sid={request.sid} joined room={room} fps={fps:g}")
+            return
+        if room in STATE_ROOMS:
             join_room(room)
+            presence.join(room, request.sid)
             logger.debug(f"sid={request.sid} joined room={room}")
-            # Push cached state immediately so reconnecting tablets
-            # don't wait for the next state change to get data
-            cached = state_cache.get(room)
-            if cached is not None:
-                emit(f"state:{room}", cached)
+            # A reconnecting tablet sends the last sequence it saw; replay
+            # just the patches it missed when the history still has them
+            since = data.get("since")
+            if isinstance(since, int) and data.get("epoch") == state_cache.epoch:
+                missed = state_cache.changes_since(room, since)
+                if missed is not None:
+                    for patch in missed:
+                        emit("state:patch", patch)
+                    return
+            # Otherwise push a full snapshot so the tablet doesn't wait for
+            # the next state change; later changes arrive as state:patch
+            snap = state_cache.encoded_snapshot(room)
+            if snap is not None:
+                emit("state:snapshot", snap)
+
+    @socketio.on("state:resync")
+    def on_resync(data):
+        """Client saw a version gap in state:patch — send a full snapshot."""
+        room = (data or {}).get("room", "")
+        if room not in STATE_ROOMS:
+            return
+        logger.debug(f"sid={request.sid} resync room={room}")
+        snap = state_cache.encoded_snapshot(room)
+        if snap is not None:
+            emit("state:snapshot", snap)
 
     @socketio.on("leave")
     def on_leave(data):
         room = data.get("room", "")
         leave_room(room)
+        presence.leave(room, request.sid)
+        if room == METER_ROOM and meters is not None:
+            meters.leave(request.sid)
 
     @socketio.on("heartbeat")
     def on_heartbeat(data):
@@ -18,7 +18,7 @@ class StubContext:
     """Lightweight stand-in for GatewayContext that doesn't require eventlet."""
 
     def __init__(self):
-        from polling import StateCache, PollerWatchdog
+        from polling import StateCache, PollerWatchdog, RoomPresence
 
         self.cfg = {
             "home_assistant": {"url": "", "token": ""},
@@ -31,6 +31,9 @@ class StubContext:
         self.config_path = ""
         self.state_cache = StateCache()
         self.watchdog = PollerWatchdog()
+        self.room_presence = RoomPresence()
+        self.poll_scheduler = None
+        self.broadcaster = None
 
         # Modules (all None in mock)
         self.x32 = None
@@ -0,0 +1,50 @@
+"""Tests for AdaptiveInterval — change-rate driven poll pacing."""
+
+import time
+
+import macro_engine
+from polling import AdaptiveInterval
+
+
+class TestAdaptiveInterval:
+    def test_fixed_when_unconfigured(self):
+        pacing = AdaptiveInterval.from_config(5, None)
+        assert [pacing.next(c) for c in (True, False, False, False, False)] == [5] * 5
+
+    def test_change_halves_down_to_min(self):
+        pacing = AdaptiveInterval(8, min_s=2, max_s=20)
+        assert pacing.next(True) == 4
+        assert pacing.next(True) == 2
+        assert pacing.next(True) == 2
+
+    def test_static_backs_off_after_settle_to_max(self):
+        pacing = AdaptiveInterval(4, min_s=2, max_s=10, backoff=2, settle=2)
+        assert pacing.next(False) == 4   # 1 static poll — still settling
+        assert pacing.next(False) == 8
+        assert pacing.next(False) == 10  # capped
+        assert pacing.next(True) == 5    # change resets the streak and speeds up
+        assert pacing.next(False) == 5
+
+    def test_macro_activity_pins_min(self):
+        pacing = AdaptiveInterval(10, min_s=1, max_s=30)
+        assert pacing.next(False, active=True) == 1
+
+    def test_base_clamped_into_bounds(self):
+        assert AdaptiveInterval(1, min_s=3, max_s=9).current == 3
+        assert AdaptiveInterval(60, min_s=3, max_s=9).current == 9
+
+
+class TestMacroActivity:
+    def test_running_macro_marks_activity(self, stub_ctx, monkeypatch):
+        monkeypatch.setattr(macro_engine, "_last_macro_end", 0.0)
+        seen = []
+        monkeypatch.setattr(macro_engine, "_run_macro",
+                            lambda *a: seen.append(macro_engine.macro_activity()) or {"success": True})
+        assert macro_engine.macro_activity() is False
+        macro_engine.execute_macro(stub_ctx, "any", "T1")
+        assert seen == [True]
+        # Lingers briefly after the macro finishes
+        assert macro_engine.macro_activity() is True
+        monkeypatch.setattr(macro_engine, "_last_macro_end",
+                            time.time() - macro_engine.MACRO_ACTIVITY_LINGER_S - 1)
+        assert macro_engine.macro_activity() is False
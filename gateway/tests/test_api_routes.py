@@ -9,13 +9,14 @@ import os
 import sys
 import tempfile
 import threading
+import time
 
 import pytest
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 from flask import Flask
-from polling import StateCache, PollerWatchdog
+from polling import StateCache, PollerWatchdog, RoomPresence
 from database import Database
 
 
@@ -40,6 +41,7 @@ def _build_test_app():
     ctx = Ctx()
     ctx.app = app
     ctx.socketio = type("FakeSocketIO", (), {"emit": lambda *a, **kw: None})()
+    ctx.broadcaster = None
     ctx.db = Database(db_path)
     ctx.cfg = {
         "home_assistant": {"url": "", "token": ""},
@@ -54,6 +56,8 @@ def _build_test_app():
     ctx.config_path = ""
     ctx.state_cache = StateCache()
     ctx.watchdog = PollerWatchdog()
+    ctx.room_presence = RoomPresence()
+    ctx.poll_scheduler = None
     ctx.verbose_logging = threading.Event()
     ctx.camlytics_buffers = {"communion": 0, "occupancy": 0, "enter": 0}
     ctx.camlytics_lock = threading.Lock()
@@ -170,6 +174,178 @@ class TestMacroEndpoints:
         assert resp.status_code == 200
 
 
+class TestPreEncodedStateReads:
+    @pytest.fixture(scope="class")
+    def built(self):
+        app, ctx, db_path = _build_test_app()
+        with app.test_client() as c:
+            yield c, ctx
+        try:
+            os.unlink(db_path)
+        except OSError:
+            pass
+
+    def test_macro_state_combines_cached_values(self, built):
+        c, ctx = built
+        ctx.state_cache.set("x32", {"ch1vol": "50"})
+        resp = c.get("/api/macro/state", environ_base={"REMOTE_ADDR": "127.0.0.1"})
+        data = resp.get_json()
+        assert data["x32"] == {"ch1vol": "50"}
+        assert data["ha"] == {}
+        assert data["moip"] is None
+        ctx.state_cache.set("x32", {"ch1vol": "60"})
+        resp = c.get("/api/macro/state", environ_base={"REMOTE_ADDR": "127.0.0.1"})
+        assert resp.get_json()["x32"] == {"ch1vol": "60"}
+
+    def test_large_state_is_gzipped_when_accepted(self, built):
+        import gzip
+        c, ctx = built
+        big = {f"sensor.s{i}": {"state": "on"} for i in range(200)}
+        ctx.state_cache.set("camlytics", big)
+        resp = c.get("/api/camlytics/state", headers={"Accept-Encoding": "gzip"},
+                     environ_base={"REMOTE_ADDR": "127.0.0.1"})
+        assert resp.headers["Content-Encoding"] == "gzip"
+        assert json.loads(gzip.decompress(resp.data)) == big
+        plain = c.get("/api/camlytics/state", environ_base={"REMOTE_ADDR": "127.0.0.1"})
+        assert "Content-Encoding" not in plain.headers
+        assert plain.get_json() == big
+
+
+class TestMetricsEndpoint:
+    def test_metrics_prometheus_text(self):
+        app, ctx, db_path = _build_test_app()
+        try:
+            ctx.room_presence.join("x32", "sid1")
+            with app.test_client() as c:
+                c.get("/api/camlytics/state", environ_base={"REMOTE_ADDR": "127.0.0.1"})
+                resp = c.get("/api/metrics", environ_base={"REMOTE_ADDR": "127.0.0.1"})
+            assert resp.status_code == 200
+            assert resp.mimetype == "text/plain"
+            text = resp.get_data(as_text=True)
+            assert "# TYPE stp_device_command_seconds histogram" in text
+            assert 'stp_room_watchers{room="x32"} 1' in text
+        finally:
+            try:
+                os.unlink(db_path)
+            except OSError:
+                pass
+
+
+class TestConditionalGet:
+    @pytest.fixture(scope="class")
+    def built(self):
+        app, ctx, db_path = _build_test_app()
+        with app.test_client() as c:
+            yield c, ctx
+        try:
+            os.unlink(db_path)
+        except OSError:
+            pass
+
+    def _get(self, c, url, etag=None):
+        headers = {"If-None-Match": etag} if etag else {}
+        return c.get(url, headers=headers, environ_base={"REMOTE_ADDR": "127.0.0.1"})
+
+    def test_unchanged_state_returns_304(self, built):
+        c, ctx = built
+        ctx.state_cache.set("camlytics", {"occupancy": 12})
+        first = self._get(c, "/api/camlytics/state")
+        etag = first.headers["ETag"]
+        assert first.headers["Cache-Control"] == "no-cache"
+        again = self._get(c, "/api/camlytics/state", etag)
+        assert again.status_code == 304
+        assert again.data == b""
+        ctx.state_cache.set("camlytics", {"occupancy": 13})
+        changed = self._get(c, "/api/camlytics/state", etag)
+        assert changed.status_code == 200
+        assert changed.headers["ETag"] != etag
+
+    def test_macro_state_etag_tracks_any_room(self, built):
+        c, ctx = built
+        etag = self._get(c, "/api/macro/state").headers["ETag"]
+        assert self._get(c, "/api/macro/state", etag).status_code == 304
+        ctx.state_cache.set("obs", {"streaming": True})
+        assert self._get(c, "/api/macro/state", etag).status_code == 200
+
+    def test_gzipped_body_has_its_own_etag(self, built):
+        c, ctx = built
+        ctx.state_cache.set("camlytics", {f"s{i}": i for i in range(500)})
+        plain = self._get(c, "/api/camlytics/state").headers["ETag"]
+        gz = c.get("/api/camlytics/state", headers={"Accept-Encoding": "gzip"},
+                   environ_base={"REMOTE_ADDR": "127.0.0.1"}).headers["ETag"]
+        assert plain != gz
+
+    def test_gzipped_etag_revalidates(self, built):
+        c, ctx = built
+        ctx.state_cache.set("camlytics", {f"s{i}": i for i in range(500)})
+        gz = {"Accept-Encoding": "gzip"}
+        etag = c.get("/api/camlytics/state", headers=gz,
+                     environ_base={"REMOTE_ADDR": "127.0.0.1"}).headers["ETag"]
+        again = c.get("/api/camlytics/state", headers={**gz, "If-None-Match": etag},
+                      environ_base={"REMOTE_ADDR": "127.0.0.1"})
+        assert again.status_code == 304 and again.headers["ETag"] == etag
+
+    def test_healthdash_status_stable_between_heartbeats(self, built):
+        c, ctx = built
+
+        class _Health:
+            results = {"x32": {"status": {"level": "healthy"}}}
+            seen = 1700000000.0
+
+            def get_all_results(self):
+                return self.results
+
+            def get_heartbeats(self, absolute=False):
+                return {"count": 1, "tablets": {"Lobby": self.seen if absolute else time.time() - self.seen}}
+
+        ctx.health = _Health()
+        try:
+            first = self._get(c, "/api/healthdash/status")
+            etag = first.headers["ETag"]
+            assert not etag.startswith("W/")
+            assert first.get_json()["heartbeat"]["tablets"]["Lobby"] == 1700000000.0
+            assert self._get(c, "/api/healthdash/status", etag).status_code == 304
+            ctx.health.seen += 5
+            etag2 = self._get(c, "/api/healthdash/status", etag).headers["ETag"]
+            assert etag2 != etag
+            ctx.health.results = {"x32": {"status": {"level": "down"}}}
+            assert self._get(c, "/api/healthdash/status", etag2).status_code == 200
+        finally:
+            ctx.health = None
+
+    def test_healthdash_status_stable_while_pollers_beat(self, built):
+        c, ctx = built
+
+        class _Health:
+            def get_all_results(self):
+                return {}
+
+            def get_heartbeats(self, absolute=False):
+                return {"count": 0, "tablets": {}}
+
+        ctx.health = _Health()
+        ctx.watchdog.register("x32", 5)
+        try:
+            first = self._get(c, "/api/healthdash/status")
+            etag = first.headers["ETag"]
+            assert "last_heartbeat_at" not in first.get_json()["gateway_pollers"]["x32"]
+            with ctx.watchdog._lock:
+                ctx.watchdog._heartbeats["x32"] += 2
+            assert self._get(c, "/api/healthdash/status", etag).status_code == 304
+            with ctx.watchdog._lock:
+                ctx.watchdog._heartbeats["x32"] -= 60
+            stale = self._get(c, "/api/healthdash/status", etag)
+            assert stale.status_code == 200
+            x32 = stale.get_json()["gateway_pollers"]["x32"]
+            assert x32["stale"] and "last_heartbeat_at" in x32
+            assert self._get(c, "/api/healthdash/status", stale.headers["ETag"]).status_code == 304
+        finally:
+            ctx.health = None
+            with ctx.watchdog._lock:
+                for d in (ctx.watchdog._heartbeats, ctx.watchdog._intervals, ctx.watchdog._breakers):
+                    d.pop("x32", None)
+
+
 # ---------------------------------------------------------------------------
 # Health / status endpoints
 # ---------------------------------------------------------------------------
@@ -0,0 +1,72 @@
+"""Tests for BroadcastScheduler — per-room emit coalescing."""
+
+import time
+
+from broadcast import BroadcastScheduler, merge_dicts
+
+
+class _FakeSocketIO:
+    def __init__(self):
+        self.emitted = []
+
+    def emit(self, event, data=None, room=None, **kw):
+        self.emitted.append((event, data, room))
+
+
+class TestBroadcastScheduler:
+    def test_zero_window_emits_immediately(self):
+        sio = _FakeSocketIO()
+        b = BroadcastScheduler(sio, window_ms=0)
+        b.emit("state:moip", {"a": 1}, room="moip")
+        assert sio.emitted == [("state:moip", {"a": 1}, "moip")]
+
+    def test_roomless_emit_passes_through(self):
+        sio = _FakeSocketIO()
+        b = BroadcastScheduler(sio, window_ms=1000)
+        b.emit("notification", {"message": "hi"})
+        assert sio.emitted == [("notification", {"message": "hi"}, None)]
+
+    def test_burst_is_coalesced_latest_wins(self):
+        sio = _FakeSocketIO()
+        b = BroadcastScheduler(sio, window_ms=1000, latest={"state:moip"})
+        for i in range(5):
+            b.emit("state:moip", {"n": i}, room="moip")
+        assert sio.emitted == []
+        b.flush_all()
+        assert sio.emitted == [("state:moip", {"n": 4}, "moip")]
+        stats = b.stats()["rooms"]["moip"]
+        assert stats == {"submitted": 5, "emitted": 1, "saved": 4}
+
+    def test_discrete_events_are_never_dropped(self):
+        sio = _FakeSocketIO()
+        b = BroadcastScheduler(sio, window_ms=1000, latest={"state:moip"})
+        for rx in (1, 2, 3):
+            b.emit("moip:event", {"event": "switch", "data": {"receiver": rx}}, room="moip")
+        assert [e[1]["data"]["receiver"] for e in sio.emitted] == [1, 2, 3]
+        assert b.stats()["rooms"]["moip"] == {"submitted": 3, "emitted": 3, "saved": 0}
+
+    def test_merge_function_folds_payloads(self):
+        sio = _FakeSocketIO()
+        b = BroadcastScheduler(sio, window_ms=1000, merge={"state:wattbox": merge_dicts})
+        b.emit("state:wattbox", {"pdu1": "on"}, room="wattbox")
+        b.emit("state:wattbox", {"pdu2": "off"}, room="wattbox")
+        b.flush_all()
+        assert sio.emitted == [("state:wattbox", {"pdu1": "on", "pdu2": "off"}, "wattbox")]
+
+    def test_rooms_and_events_are_independent(self):
+        sio = _FakeSocketIO()
+        b = BroadcastScheduler(sio, window_ms=1000, latest={"state:patch"})
+        b.emit("state:patch", 1, room="x32")
+        b.emit("state:patch", 2, room="obs")
+        b.flush_all()
+        assert sorted(e[2] for e in sio.emitted) == ["obs", "x32"]
+
+    def test_window_timer_flushes(self):
+        sio = _FakeSocketIO()
+        b = BroadcastScheduler(sio, window_ms=20, latest={"state:health"})
+        b.emit("state:health", {"ok": 1}, room="health")
+        b.emit("state:health", {"ok": 2}, room="health")
+        deadline = time.time() + 2
+        while not sio.emitted and time.time() < deadline:
+            time.sleep(0.01)
+        assert sio.emitted == [("state:health", {"ok": 2}, "health")]
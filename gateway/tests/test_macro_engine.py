@@ -320,6 +320,28 @@ class TestStepSummary:
         )
         assert "check switches" in result
 
+    def test_x32_batch_summary(self):
+        result = step_summary(
+            {"type": "x32_batch", "items": [{"strip": "ch", "num": 1, "mute": True}] * 3}, {}
+        )
+        assert result == "X32 batch (3 changes)"
+
+    def test_moip_ir_burst_summary(self):
+        assert step_summary({"type": "moip_ir_burst", "receiver": 3, "code": "VOL_UP", "count": 5}, {}) == \
+            "IR VOL_UP ×5 → RX 3"
+
+    def test_moip_switch_many_summary(self):
+        assert step_summary({"type": "moip_switch_many", "tx": 1, "rx": [47, 9, 22]}, {}) == \
+            "Switch TX 1 → 3 receivers"
+        assert step_summary({"type": "moip_switch_many", "switches": [
+            {"tx": 1, "rx": 47}, {"tx": 2, "rx": 9}]}, {}) == "Switch 2 receivers"
+
+    def test_x32_fade_summary(self):
+        result = step_summary(
+            {"type": "x32_fade", "strip": "bus", "channel": 3, "db": -10, "seconds": 3}, {}
+        )
+        assert result == "X32 fade bus3 to -10 dB over 3s"
+
 
 # ---------------------------------------------------------------------------
 # Verification queue
@@ -635,6 +657,23 @@ class TestDeferredIssues:
 # WattBox step types
 # ---------------------------------------------------------------------------
 
+class TestMoipSwitchManyStep:
+    def test_rejected_receiver_fails_step(self):
+        ctx = _make_ctx()
+        ctx.mock_mode = False
+        ctx.moip = MagicMock()
+        ctx.moip.switch_many.return_value = ({"success": False, "results": [
+            {"receiver": "3", "transmitter": "1", "success": True, "confirmed": True},
+            {"receiver": "99", "transmitter": "1", "success": False, "confirmed": False,
+             "error": "controller rejected a switch: #Error"},
+        ]}, 200)
+        result = _execute_step(ctx, {"type": "moip_switch_many", "tx": 1, "rx": [3, 99]},
+                               "test-tablet", 0)
+        assert result["success"] is False and "RX99" in result["error"]
+        event = ctx.broadcaster.emit.call_args
+        assert event.args[1]["data"] == [{"transmitter": "1", "receiver": "3"}]
+
+
 class TestWattboxCheck:
     def test_wattbox_check_mock_mode(self):
         """wattbox_check in mock mode always succeeds."""
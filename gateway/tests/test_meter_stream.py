@@ -0,0 +1,122 @@
+"""Tests for MeterStream — X32 meter fan-out with per-client frame caps."""
+
+import threading
+
+import meter_stream
+from meter_stream import METER_EVENT, MeterStream
+
+
+class _FakeSocketIO:
+    def __init__(self):
+        self.emitted = []
+
+    def emit(self, event, data=None, to=None, **kw):
+        self.emitted.append((event, data, to))
+
+
+class _FakeX32:
+    def __init__(self):
+        self.renewals = 0
+        self.online = True
+        self.seq = 0
+
+    def renew_meters(self):
+        self.renewals += 1
+        return self.online
+
+    def meter_frame(self):
+        return self.seq, bytes([1, 0]) if self.seq else b""
+
+    def update(self):
+        self.seq += 1
+
+
+def _stream(fps=20):
+    x32, sio = _FakeX32(), _FakeSocketIO()
+    return MeterStream(x32, sio, fps=fps, renew_seconds=8.0), x32, sio
+
+
+class TestMeterStream:
+    def test_no_frame_yet_sends_nothing(self):
+        ms, x32, sio = _stream()
+        ms._clients["a"] = [0.05, 0.0, 0]
+        assert ms.tick(100.0) == 0
+        assert sio.emitted == []
+        assert x32.renewals == 1
+
+    def test_one_subscription_feeds_all_clients(self):
+        ms, x32, sio = _stream()
+        for sid in ("a", "b", "c"):
+            ms._clients[sid] = [0.05, 0.0, 0]
+        x32.update()
+        assert ms.tick(100.0) == 3
+        assert sorted(to for _, _, to in sio.emitted) == ["a", "b", "c"]
+        assert all(ev == METER_EVENT for ev, _, _ in sio.emitted)
+        # Renewed once for everyone, and not again until renew_seconds pass
+        ms.tick(101.0)
+        assert x32.renewals == 1
+        ms.tick(108.5)
+        assert x32.renewals == 2
+
+    def test_unchanged_frame_not_resent(self):
+        ms, x32, sio = _stream()
+        ms._clients["a"] = [0.05, 0.0, 0]
+        x32.update()
+        ms.tick(100.0)
+        assert ms.tick(101.0) == 0
+
+    def test_per_client_fps_cap(self):
+        ms, x32, sio = _stream(fps=20)
+        ms._clients["fast"] = [1 / 20, 0.0, 0]
+        ms._clients["slow"] = [1 / 5, 0.0, 0]
+        t = 100.0
+        for _ in range(20):  # one second at 20 Hz, new levels every tick
+            x32.update()
+            ms.tick(t)
+            t += 0.05
+        counts = {sid: sum(1 for _, _, to in sio.emitted if to == sid) for sid in ("fast", "slow")}
+        assert counts == {"fast": 20, "slow": 5}
+
+    def test_join_clamps_requested_fps(self):
+        ms, _, _ = _stream(fps=20)
+        ms._thread = object()  # don't start the loop
+        assert ms.join("a", 60) == 20
+        assert ms.join("b", 4) == 4
+        assert ms.join("c", "junk") == 20
+        ms.leave("a")
+        assert ms.members == 2
+
+    def test_failed_renew_retried_next_tick(self):
+        ms, x32, _ = _stream()
+        x32.online = False
+        ms.tick(100.0)
+        x32.online = True
+        ms.tick(100.05)
+        assert x32.renewals == 2
+        ms.tick(100.1)
+        assert x32.renewals == 2
+
+    def test_concurrent_first_joins_start_one_thread(self, monkeypatch):
+        started = []
+
+        class _Thread:
+            def __init__(self, target, daemon):
+                pass
+
+            def start(self):
+                started.append(self)
+
+        ms, _, _ = _stream()
+        gate = threading.Barrier(8)
+
+        def join(n):
+            gate.wait()
+            ms.join(f"sid{n}")
+
+        workers = [threading.Thread(target=join, args=(n,)) for n in range(8)]
+        monkeypatch.setattr(meter_stream.threading, "Thread", _Thread)
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        assert len(started) == 1 and ms.members == 8
@@ -0,0 +1,78 @@
+"""Tests for the in-process metrics registry and its Prometheus rendering."""
+
+import pytest
+
+from metrics import MetricsRegistry, record_command, timed_command, DEVICE_COMMAND, DEVICE_COMMAND_ERRORS
+
+
+class TestMetricsRegistry:
+    def test_counter_renders_with_labels(self):
+        r = MetricsRegistry()
+        c = r.counter("stp_test_total", "Test counter.", ["room"])
+        c.inc(room="x32")
+        c.inc(2, room="x32")
+        c.inc(room="obs")
+        text = r.render()
+        assert "# TYPE stp_test_total counter" in text
+        assert 'stp_test_total{room="x32"} 3' in text
+        assert 'stp_test_total{room="obs"} 1' in text
+
+    def test_gauge_overwrites(self):
+        r = MetricsRegistry()
+        g = r.gauge("stp_test_gauge", "Test gauge.")
+        g.set(4)
+        g.set(2.5)
+        assert "stp_test_gauge 2.5" in r.render()
+
+    def test_histogram_buckets_are_cumulative(self):
+        r = MetricsRegistry()
+        h = r.histogram("stp_test_seconds", "Test histogram.", ["device"], buckets=(0.1, 1.0))
+        for v in (0.05, 0.1, 0.5, 3.0):
+            h.observe(v, device="moip")
+        text = r.render()
+        assert 'stp_test_seconds_bucket{device="moip",le="0.1"} 2' in text
+        assert 'stp_test_seconds_bucket{device="moip",le="1"} 3' in text
+        assert 'stp_test_seconds_bucket{device="moip",le="+Inf"} 4' in text
+        assert 'stp_test_seconds_count{device="moip"} 4' in text
+        assert 'stp_test_seconds_sum{device="moip"} 3.65' in text
+
+    def test_histogram_time_records_on_exception(self):
+        r = MetricsRegistry()
+        h = r.histogram("stp_test_seconds", "Test histogram.", ["op"])
+        with pytest.raises(RuntimeError):
+            with h.time(op="log_action"):
+                raise RuntimeError("boom")
+        assert h.count(op="log_action") == 1
+
+    def test_label_mismatch_rejected(self):
+        r = MetricsRegistry()
+        c = r.counter("stp_test_total", "Test counter.", ["room"])
+        with pytest.raises(ValueError):
+            c.inc(device="x32")
+
+    def test_reregistering_returns_same_metric(self):
+        r = MetricsRegistry()
+        a = r.counter("stp_test_total", "Test counter.", ["room"])
+        assert r.counter("stp_test_total", "Test counter.", ["room"]) is a
+        with pytest.raises(ValueError):
+            r.gauge("stp_test_total", "Clash.", ["room"])
+
+    def test_label_values_escaped(self):
+        r = MetricsRegistry()
+        c = r.counter("stp_test_total", "Test counter.", ["room"])
+        c.inc(room='a"b')
+        assert 'room="a\\"b"' in r.render()
+
+
+class TestCommandTiming:
+    def test_timed_command_counts_errors(self):
+        before = DEVICE_COMMAND.count(device="test-dev")
+        errors = DEVICE_COMMAND_ERRORS.value(device="test-dev")
+        with timed_command("test-dev"):
+            pass
+        with pytest.raises(OSError):
+            with timed_command("test-dev"):
+                raise OSError("unreachable")
+        record_command("test-dev", 0.0, False)
+        assert DEVICE_COMMAND.count(device="test-dev") == before + 3
+        assert DEVICE_COMMAND_ERRORS.value(device="test-dev") == errors + 2
@@ -0,0 +1,427 @@
+"""Tests for MoIP module — parsers, the framed Telnet reply reader, switching and IR repeats."""
+
+import logging
+import os
+import socket
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from moip_module import MoIPConnection, MoIPModule, parse_devices, parse_receivers, reply_key
+
+
+@pytest.fixture
+def logger():
+    return logging.getLogger("test_moip")
+
+
+class FakeController:
+    """TCP listener answering MoIP commands through *handler(line) -> bytes*."""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.received = []
+        self.client = None
+        self._srv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._srv.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._srv.bind(("127.0.0.1", 0))
+        self._srv.listen(1)
+        self.port = self._srv.getsockname()[1]
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        try:
+            self.client, _ = self._srv.accept()
+        except OSError:
+            return
+        buf = b""
+        while True:
+            try:
+                data = self.client.recv(4096)
+            except OSError:
+                return
+            if not data:
+                return
+            buf += data
+            *lines, buf = buf.split(b"\n")
+            for raw in lines:
+                line = raw.decode().strip()
+                self.received.append(line)
+                out = self.handler(line)
+                if out:
+                    self.client.sendall(out)
+
+    def push(self, data: bytes):
+        self.client.sendall(data)
+
+    def close(self):
+        for s in (self.client, self._srv):
+            if s is not None:
+                try:
+                    s.close()
+                except OSError:
+                    pass
+
+
+def _connection(ctrl, logger, **cfg):
+    return MoIPConnection({"host_internal": "127.0.0.1", "port_internal": ctrl.port,
+                           "host_external": "127.0.0.1", "port_external": ctrl.port, **cfg},
+                          logger)
+
+
+class TestParsers:
+    def test_receivers(self):
+        r = parse_receivers("?Receivers=1:1,3:2,0:41\n")
+        assert r["2"]["transmitter_id"] == "3"
+        assert r["41"]["transmitter_id"] == "0"
+
+    def test_devices(self):
+        assert parse_devices("?Devices=12,41") == {"transmitters": 12, "receivers": 41}
+
+    def test_reply_key(self):
+        assert reply_key("?Receivers\n") == "Receivers"
+        assert reply_key("?Receivers=1:1,2:2") == "Receivers"
+        assert reply_key("Devices=3,4") == "Devices"
+
+
+class TestFramedReader:
+    def test_query_returns_as_soon_as_line_arrives(self, logger):
+        ctrl = FakeController(lambda line: b"?Receivers=1:1,2:2\r\n" if line == "?Receivers" else b"")
+        conn = _connection(ctrl, logger)
+        try:
+            assert conn.connect()
+            started = time.perf_counter()
+            resp = conn.send_command("?Receivers")
+            elapsed = time.perf_counter() - started
+            assert resp == "?Receivers=1:1,2:2"
+            assert elapsed < 0.05  # no fixed sleep, no idle wait
+        finally:
+            conn.disconnect()
+            ctrl.close()
+
+    def test_set_does_not_wait(self, logger):
+        ctrl = FakeController(lambda line: b"OK\n")
+        conn = _connection(ctrl, logger)
+        try:
+            assert conn.connect()
+            started = time.perf_counter()
+            assert conn.send_command("!Switch=3,7") == "OK"
+            assert time.perf_counter() - started < 0.02
+            # The ack is not mistaken for the next query's reply
+            time.sleep(0.05)
+            assert conn.unsolicited_count == 1
+        finally:
+            conn.disconnect()
+            ctrl.close()
+
+    def test_reply_split_across_packets(self, logger):
+        def handler(line):
+            if line == "?Devices":
+                ctrl.push(b"?Devi")
+                time.sleep(0.02)
+                return b"ces=12,41\n"
+            return b""
+        ctrl = FakeController(handler)
+        conn = _connection(ctrl, logger)
+        try:
+            assert conn.connect()
+            assert conn.send_command("?Devices") == "?Devices=12,41"
+        finally:
+            conn.disconnect()
+            ctrl.close()
+
+    def test_unsolicited_output_kept_out_of_replies(self, logger):
+        def handler(line):
+            if line == "?Receivers":
+                return b"~Notify=hello\nWelcome\n?Receivers=5:9\n"
+            return b""
+        ctrl = FakeController(handler)
+        conn = _connection(ctrl, logger)
+        try:
+            assert conn.connect()
+            assert conn.send_command("?Receivers") == "?Receivers=5:9"
+            assert list(conn.unsolicited) == ["~Notify=hello", "Welcome"]
+        finally:
+            conn.disconnect()
+            ctrl.close()
+
+    def test_error_reply_completes_query(self, logger):
+        ctrl = FakeController(lambda line: b"#Error\n")
+        conn = _connection(ctrl, logger)
+        try:
+            assert conn.connect()
+            assert conn.send_command("?Bogus") == "#Error"
+        finally:
+            conn.disconnect()
+            ctrl.close()
+
+    def test_timeout_returns_none(self, logger):
+        ctrl = FakeController(lambda line: b"")
+        conn = _connection(ctrl, logger, telnet_read_timeout=0.1)
+        try:
+            assert conn.connect()
+            assert conn.send_command("?Receivers") is None
+        finally:
+            conn.disconnect()
+            ctrl.close()
+
+    def test_remote_close_fails_waiting_query_promptly(self, logger):
+        def handler(line):
+            if line == "?Receivers":
+                ctrl.client.close()
+            return b""
+        ctrl = FakeController(handler)
+        conn = _connection(ctrl, logger, telnet_read_timeout=5)
+        try:
+            assert conn.connect()
+            started = time.perf_counter()
+            assert conn.send_command("?Receivers") is None
+            assert time.perf_counter() - started < 1.0
+            assert conn.connected is False
+        finally:
+            conn.disconnect()
+            ctrl.close()
+
+
+# =============================================================================
+# SWITCH MANY
+# =============================================================================
+
+class FakeMatrix:
+    """Controller answering !Switch and ?Receivers from a routing table."""
+
+    def __init__(self, receivers=48):
+        self.routes = {str(rx): "0" for rx in range(1, receivers + 1)}
+        self.offline = set()
+        self.lagging = set()  # receivers whose switches land after the read-back
+        self.ctrl = FakeController(self._handle)
+
+    def _handle(self, line):
+        if line.startswith("!Switch="):
+            tx, rx = line.split("=", 1)[1].split(",")
+            if rx not in self.routes:
+                return b"#Error\r\n"
+            if rx not in self.lagging:
+                self.routes[rx] = tx
+            return b""
+        if line == "?Receivers":
+            pairs = ",".join(f"{tx}:{rx}" for rx, tx in self.routes.items() if rx not in self.offline)
+            return f"?Receivers={pairs}\r\n".encode()
+        if line == "?Devices":
+            return f"?Devices=20,{len(self.routes)}\r\n".encode()
+        return b""
+
+
+@pytest.fixture
+def matrix(logger):
+    m = FakeMatrix()
+    moip = MoIPModule({"host_internal": "127.0.0.1", "port_internal": m.ctrl.port,
+                       "host_external": "127.0.0.1", "port_external": m.ctrl.port}, logger)
+    yield m, moip
+    moip._conn.disconnect()
+    m.ctrl.close()
+
+
+class TestSwitchMany:
+    def test_twelve_receivers_one_write(self, matrix):
+        m, moip = matrix
+        switches = [{"tx": 3, "rx": rx} for rx in range(1, 13)]
+        started = time.perf_counter()
+        result, status = moip.switch_many(switches)
+        assert status == 200
+        assert time.perf_counter() - started < 1.0
+        assert [r["receiver"] for r in result["results"]] == [str(rx) for rx in range(1, 13)]
+        assert all(r["confirmed"] for r in result["results"])
+        assert m.ctrl.received[-1] == "?Receivers"
+        assert len(m.ctrl.received) == 13
+        assert moip._last_receivers["12"]["transmitter_id"] == "3"
+
+    def test_duplicate_receiver_takes_last_transmitter(self, matrix):
+        m, moip = matrix
+        result, status = moip.switch_many([{"tx": 1, "rx": 5}, {"transmitter": 2, "receiver": 5}])
+        assert status == 200
+        assert result["results"] == [{"receiver": "5", "transmitter": "2", "success": True, "confirmed": True}]
+        assert m.ctrl.received.count("!Switch=1,5") == 0
+
+    def test_unconfirmed_route_reported(self, matrix):
+        m, moip = matrix
+        m.offline.add("7")  # receiver the controller doesn't report
+        result, _ = moip.switch_many([{"tx": 1, "rx": 7}, {"tx": 1, "rx": 8}])
+        assert [r["confirmed"] for r in result["results"]] == [False, True]
+
+    def test_rejected_switch_does_not_become_the_readback(self, matrix):
+        m, moip = matrix
+        result, status = moip.switch_many([{"tx": 1, "rx": 99}, {"tx": 2, "rx": 3}])
+        assert status == 200
+        assert [r["confirmed"] for r in result["results"]] == [False, True]
+        assert result["receivers"]["3"]["transmitter_id"] == "2"
+        assert moip._conn.last_rejected == ["#Error"]
+        # The rejected route is reported as failed and not published as real
+        assert result["success"] is False
+        assert [r["success"] for r in result["results"]] == [False, True]
+        assert "#Error" in result["results"][0]["error"]
+        assert "99" not in result["receivers"]
+
+    @pytest.mark.parametrize("switches", [[], None, [{"tx": 1}], ["1,2"]])
+    def test_invalid_input(self, matrix, switches):
+        _, moip = matrix
+        assert moip.switch_many(switches)[1] == 400
+
+    def test_controller_down(self, logger):
+        moip = MoIPModule({"host_internal": "127.0.0.1", "port_internal": 1,
+                           "host_external": "127.0.0.1", "port_external": 1}, logger)
+        result, status = moip.switch_many([{"tx": 1, "rx": 2}])
+        assert status == 503
+
+
+# =============================================================================
+# WRITE-THROUGH RECEIVER STATE
+# =============================================================================
+
+class TestWriteThrough:
+    def _queries(self, m):
+        return m.ctrl.received.count("?Receivers")
+
+    def test_switch_updates_map_without_full_dump(self, matrix):
+        m, moip = matrix
+        assert moip.get_receivers(force=True)[1] == 200
+        before = moip.get_receivers()[0]
+        assert moip.switch("4", "10")[1] == 200
+        after, status = moip.get_receivers()
+        assert status == 200
+        assert after["10"]["transmitter_id"] == "4"
+        assert before["10"]["transmitter_id"] == "0"  # published maps are never mutated
+        assert self._queries(m) == 1
+
+    def test_reconcile_when_due_corrects_outside_changes(self, matrix):
+        m, moip = matrix
+        moip.get_receivers(force=True)
+        m.routes["5"] = "9"  # someone used the MoIP app
+        assert moip.get_receivers()[0]["5"]["transmitter_id"] == "0"
+        moip._receivers_at -= moip._reconcile_seconds
+        assert moip.get_receivers()[0]["5"]["transmitter_id"] == "9"
+        assert self._queries(m) == 2
+        assert moip.get_status()["reconcile_corrections"] == 1
+
+    def test_switch_many_readback_counts_as_reconcile(self, matrix):
+        m, moip = matrix
+        moip.switch_many([{"tx": 2, "rx": 3}])
+        moip.get_receivers()
+        assert self._queries(m) == 1
+
+    def test_stale_readback_keeps_write_through_and_reconciles(self, matrix):
+        m, moip = matrix
+        moip.get_receivers(force=True)
+        m.lagging.add("5")
+        result, status = moip.switch_many([{"tx": 2, "rx": 5}, {"tx": 2, "rx": 6}])
+        assert status == 200
+        assert [r["confirmed"] for r in result["results"]] == [False, True]
+        assert result["receivers"]["5"]["transmitter_id"] == "2"
+        assert moip.get_status()["reconcile_corrections"] == 0
+        # Marked due: the next read goes to the controller
+        m.lagging.clear()
+        m.routes["5"] = "2"
+        assert moip.get_receivers()[0]["5"]["transmitter_id"] == "2"
+        assert self._queries(m) == 3
+        assert moip.get_status()["reconcile_corrections"] == 0
+
+
+class TestKeepaliveProbe:
+    def test_skips_when_link_recently_used(self, matrix):
+        m, moip = matrix
+        moip.get_receivers(force=True)
+        sent = len(m.ctrl.received)
+        assert moip._keepalive_probe(30)
+        assert len(m.ctrl.received) == sent
+
+    def test_light_query_unless_reconcile_due(self, matrix):
+        m, moip = matrix
+        moip.get_receivers(force=True)
+        assert moip._keepalive_probe(0)
+        assert m.ctrl.received[-1] == "?Devices"
+        moip._receivers_at -= moip._reconcile_seconds
+        moip._keepalive_probe(0)
+        assert m.ctrl.received[-1] == "?Receivers"
+
+
+# =============================================================================
+# IR REPEATS
+# =============================================================================
+
+@pytest.fixture
+def ir(matrix):
+    m, moip = matrix
+    moip._ir.start()
+    yield m, moip
+    moip._ir.stop()
+
+
+def _presses(m, code="VOLUP"):
+    return sum(1 for line in list(m.ctrl.received) if line == f"!IR=0,3,{code}")
+
+
+class TestIrRepeat:
+    def test_burst_waits_for_last_press(self, ir):
+        m, moip = ir
+        started = time.perf_counter()
+        result, status = moip.ir_burst("0", "3", "VOLUP", count=5, rate_hz=10, wait=True)
+        assert status == 200
+        assert result["sent"] == 5
+        assert 0.35 < time.perf_counter() - started < 1.5
+        time.sleep(0.05)
+        assert _presses(m) == 5
+
+    def test_other_commands_interleave_with_burst(self, ir):
+        m, moip = ir
+        assert moip.ir_burst("0", "3", "VOLUP", count=10, rate_hz=10)[1] == 200
+        started = time.perf_counter()
+        assert moip.get_receivers(force=True)[1] == 200
+        assert time.perf_counter() - started < 0.3
+        assert _presses(m) < 10
+
+    def test_hold_repeats_until_release(self, ir):
+        m, moip = ir
+        assert moip.ir_hold("0", "3", "VOLUP", rate_hz=10)[1] == 200
+        time.sleep(0.35)
+        result, _ = moip.ir_release("3")
+        assert 3 <= result["presses"] <= 5
+        time.sleep(0.05)
+        sent = _presses(m)
+        time.sleep(0.25)
+        assert _presses(m) == sent == result["presses"]
+
+    def test_repeated_hold_extends_without_extra_press(self, ir):
+        m, moip = ir
+        moip.ir_hold("0", "3", "VOLUP", rate_hz=2)
+        moip.ir_hold("0", "3", "VOLUP", rate_hz=2)
+        time.sleep(0.05)
+        assert _presses(m) == 1
+        moip.ir_release("3")
+
+    def test_unreleased_hold_stops_itself(self, ir):
+        m, moip = ir
+        moip._ir.hold_max_seconds = 0.3
+        moip.ir_hold("0", "3", "VOLUP", rate_hz=10)
+        time.sleep(0.6)
+        assert moip._ir.active() == 0
+        sent = _presses(m)
+        time.sleep(0.2)
+        assert _presses(m) == sent
+
+    @pytest.mark.parametrize("kwargs", [{"count": 0}, {"count": "x"}, {"count": 101},
+                                        {"rate_hz": 0}, {"rate_hz": 50}, {"code": ""}])
+    def test_invalid_input(self, ir, kwargs):
+        _, moip = ir
+        args = {"tx": "0", "rx": "3", "code": "VOLUP", **kwargs}
+        assert moip.ir_burst(**args)[1] == 400
+
+    def test_controller_down(self, logger):
+        moip = MoIPModule({"host_internal": "127.0.0.1", "port_internal": 1,
+                           "host_external": "127.0.0.1", "port_external": 1}, logger)
+        assert moip.ir_burst("0", "3", "VOLUP", count=3)[1] == 503
+        assert moip.ir_hold("0", "3", "VOLUP")[1] == 503
+        assert moip._ir.active() == 0
@@ -0,0 +1,153 @@
+"""Tests for the MoIP simulator and benchmark, driving the real MoIPModule over TCP."""
+
+import logging
+import time
+
+import pytest
+
+from moip_bench import run
+from moip_module import MoIPModule
+from moip_sim import MoIPSimulator
+
+
+@pytest.fixture
+def sim():
+    s = MoIPSimulator(seed=1).start()
+    yield s
+    s.stop()
+
+
+def _module(sim, external=None, **cfg):
+    ext = external.address if external else sim.address
+    return MoIPModule({"host_internal": sim.address[0], "port_internal": sim.port,
+                       "host_external": ext[0], "port_external": ext[1], **cfg},
+                      logging.getLogger("test_moip"))
+
+
+def _wait_for(cond, timeout=2.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if cond():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestSimulator:
+    def test_commands_change_simulated_state(self, sim):
+        moip = _module(sim)
+        try:
+            assert moip.get_devices()[0] == {"transmitters": 28, "receivers": 28}
+            assert moip.switch("4", "10")[1] == 200
+            assert moip.send_ir("0", "10", "PWR")[1] == 200
+            assert moip.send_osd(clear=True)[1] == 200
+            receivers, status = moip.get_receivers(force=True)
+            assert status == 200 and receivers["10"]["transmitter_id"] == "4"
+            assert sim.ir == [("0", "10", "PWR")]
+            assert sim.osd == ["1,CLEAR"]
+        finally:
+            moip._conn.disconnect()
+
+    def test_switch_many_confirmed_by_simulator(self, sim):
+        moip = _module(sim)
+        try:
+            result, status = moip.switch_many([{"tx": 2, "rx": rx} for rx in range(1, 13)])
+            assert status == 200
+            assert all(r["confirmed"] for r in result["results"])
+            assert sim.routes["12"] == "2"
+        finally:
+            moip._conn.disconnect()
+
+    def test_bad_query_gets_error_not_timeout(self, sim):
+        moip = _module(sim)
+        try:
+            started = time.perf_counter()
+            assert moip._send("?Nonsense") == "#Error"
+            assert time.perf_counter() - started < 1.0
+        finally:
+            moip._conn.disconnect()
+
+    def test_query_latency_has_no_fixed_sleeps(self, sim):
+        # An instant controller must give sub-frame replies; a sleep or a
+        # Nagle stall in the read/write path shows up as tens of ms here
+        moip = _module(sim)
+        try:
+            moip.get_devices()
+            samples = []
+            for _ in range(20):
+                started = time.perf_counter()
+                moip.switch("1", "1")
+                moip.get_receivers(force=True)
+                samples.append(time.perf_counter() - started)
+            assert sorted(samples)[-2] < 0.02
+        finally:
+            moip._conn.disconnect()
+
+    def test_silent_controller_times_out(self, sim):
+        moip = _module(sim, telnet_read_timeout=0.2)
+        try:
+            sim.silent = True
+            started = time.perf_counter()
+            assert moip.get_devices()[1] == 503
+            assert time.perf_counter() - started < 1.0  # one retry, 0.2 s each
+        finally:
+            moip._conn.disconnect()
+
+    def test_login_lines(self):
+        secured = MoIPSimulator(username="av", password="secret").start()
+        try:
+            good = _module(secured, username="av", password="secret")
+            assert good.get_devices()[1] == 200
+            good._conn.disconnect()
+            bad = _module(secured, username="av", password="wrong", telnet_read_timeout=0.2)
+            assert bad.get_devices()[1] == 503
+            assert secured.stats["refused_logins"] >= 1
+            bad._conn.disconnect()
+        finally:
+            secured.stop()
+
+    def test_reconnects_after_drop(self, sim):
+        moip = _module(sim)
+        try:
+            assert moip.get_devices()[1] == 200
+            assert sim.drop_clients() == 1
+            assert _wait_for(lambda: not moip._conn.connected)
+            assert moip.get_devices()[1] == 200
+            assert sim.stats["connections"] == 2
+        finally:
+            moip._conn.disconnect()
+
+    def test_disconnect_after_n_commands(self):
+        flaky = MoIPSimulator(disconnect_after=3).start()
+        moip = _module(flaky)
+        try:
+            for _ in range(6):
+                assert moip.get_devices()[1] == 200
+            assert flaky.stats["connections"] >= 2
+        finally:
+            moip._conn.disconnect()
+            flaky.stop()
+
+    def test_fails_over_to_external(self, sim):
+        external = MoIPSimulator().start()
+        moip = _module(sim, external=external)
+        try:
+            assert moip.get_devices()[1] == 200
+            sim.go_offline()
+            assert moip.get_devices()[1] == 200
+            assert moip.get_status()["mode"] == "external"
+            assert external.stats["connections"] == 1
+        finally:
+            moip._conn.disconnect()
+            external.stop()
+
+
+class TestBenchmark:
+    def test_report_shape(self):
+        report = run(None, latency=0.0, jitter=0.0, commands=2, batch=4, runs=2, seed=1)
+        assert report["commands"]["receivers"]["n"] == 2
+        assert all(c["failures"] == 0 for c in report["commands"].values())
+        assert report["batch_switch"]["unconfirmed"] == 0
+        assert report["reconnect"]["lost"] == 0
+        assert report["failover"]["mode_after"] == ["external"]
+        assert report["simulator"]["queries"] > 0
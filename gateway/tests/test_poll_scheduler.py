@@ -0,0 +1,146 @@
+"""Tests for PollScheduler — heap-based scheduling of all poll jobs."""
+
+import threading
+import time
+
+from polling import PollScheduler
+
+
+def _wait_for(pred, timeout=2.0):
+    end = time.time() + timeout
+    while time.time() < end:
+        if pred():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+class TestPollScheduler:
+    def test_job_runs_and_reschedules(self):
+        runs = []
+        s = PollScheduler(workers=2, jitter=0)
+        s.add("x32", lambda: runs.append(1) or 0.02)
+        s.start()
+        try:
+            assert _wait_for(lambda: len(runs) >= 3)
+        finally:
+            s.stop()
+
+    def test_first_delay_defers_first_run(self):
+        runs = []
+        s = PollScheduler(jitter=0)
+        s.add("ha_devices", lambda: runs.append(1) or 300, first_delay=60)
+        s.start()
+        try:
+            time.sleep(0.05)
+            assert runs == []
+            assert s.stats()["ha_devices"]["next_due_in_s"] > 50
+        finally:
+            s.stop()
+
+    def test_wake_runs_job_now(self):
+        runs = []
+        s = PollScheduler(jitter=0)
+        s.add("obs", lambda: runs.append(1) or 60)
+        s.start()
+        try:
+            assert _wait_for(lambda: len(runs) == 1)
+            s.wake("obs")
+            assert _wait_for(lambda: len(runs) == 2)
+        finally:
+            s.stop()
+
+    def test_wake_during_run_reruns_after_finish(self):
+        runs = []
+        gate = threading.Event()
+
+        def job():
+            runs.append(1)
+            if len(runs) == 1:
+                gate.wait(1)
+            return 60
+
+        s = PollScheduler(jitter=0)
+        s.add("moip", job)
+        s.start()
+        try:
+            assert _wait_for(lambda: len(runs) == 1)
+            s.wake()
+            gate.set()
+            assert _wait_for(lambda: len(runs) == 2)
+        finally:
+            s.stop()
+
+    def test_job_never_overlaps_itself(self):
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def job():
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.03)
+            with lock:
+                active.pop()
+            return 0
+
+        s = PollScheduler(workers=4, jitter=0)
+        s.add("ha", job)
+        s.start()
+        try:
+            for _ in range(5):
+                s.wake("ha")
+                time.sleep(0.01)
+            assert _wait_for(lambda: len(peak) >= 3)
+        finally:
+            s.stop()
+        assert max(peak) == 1
+
+    def test_slow_job_does_not_block_others(self):
+        fast = []
+        s = PollScheduler(workers=2, jitter=0)
+        s.add("slow", lambda: time.sleep(0.5) or 60)
+        s.add("fast", lambda: fast.append(1) or 0.01)
+        s.start()
+        try:
+            assert _wait_for(lambda: len(fast) >= 5, timeout=0.4)
+        finally:
+            s.stop()
+
+    def test_overrun_counted_and_reported(self):
+        reported = []
+        s = PollScheduler(jitter=0, on_overrun=lambda name, elapsed: reported.append(name))
+        s.add("camlytics", lambda: time.sleep(0.05) or 60, deadline=0.01)
+        s.start()
+        try:
+            assert _wait_for(lambda: reported == ["camlytics"])
+            assert s.stats()["camlytics"]["overruns"] == 1
+        finally:
+            s.stop()
+
+    def test_exception_counted_and_job_retried(self):
+        s = PollScheduler(jitter=0)
+        s.add("projectors", lambda: 1 / 0)
+        s.start()
+        try:
+            assert _wait_for(lambda: s.stats()["projectors"]["runs"] == 1)
+            st = s.stats()["projectors"]
+            assert st["errors"] == 1
+            assert st["next_due_in_s"] > 0
+        finally:
+            s.stop()
+
+    def test_stats_fields(self):
+        s = PollScheduler(jitter=0)
+        s.add("x32", lambda: 30)
+        s.start()
+        try:
+            assert _wait_for(lambda: s.stats()["x32"]["runs"] == 1)
+            st = s.stats()["x32"]
+            for key in ("runs", "errors", "overruns", "deadline_s", "last_ms",
+                        "avg_ms", "max_ms", "running_for_s", "next_due_in_s"):
+                assert key in st
+            assert st["running_for_s"] is None
+        finally:
+            s.stop()
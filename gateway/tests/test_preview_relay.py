@@ -0,0 +1,182 @@
+"""Tests for the MoIP preview relay — shared HLS fetches and MJPEG fan-out."""
+
+import threading
+import time
+
+import pytest
+
+from preview_relay import PreviewRelay, rewrite_manifest, split_jpegs
+
+
+def _jpeg(n: int) -> bytes:
+    return b"\xff\xd8" + bytes([n]) * 10 + b"\xff\xd9"
+
+
+class FakeResponse:
+    def __init__(self, body=b"", chunks=None, status=200, ctype="video/mp2t", stop=None):
+        self.content = body
+        self.text = body.decode() if isinstance(body, bytes) else body
+        self.status_code = status
+        self.headers = {"Content-Type": ctype}
+        self._chunks = chunks
+        self._stop = stop
+        self.closed = False
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+    def iter_content(self, chunk_size=8192):
+        for chunk in self._chunks or ():
+            if self.closed:
+                return
+            yield chunk
+        # A live stream: keep the connection open until closed
+        while not self.closed and not self._stop.is_set():
+            time.sleep(0.005)
+            yield b""
+
+    def close(self):
+        self.closed = True
+
+
+class FakeEncoder:
+    """Counts requests; serves playlists, segments and an MJPEG stream."""
+
+    def __init__(self, delay=0.0):
+        self.calls = []
+        self.delay = delay
+        self.stop = threading.Event()
+        self.mjpeg_chunks = [_jpeg(i) for i in range(1, 6)]
+        self.responses = []
+
+    def get(self, url, stream=False, timeout=None):
+        self.calls.append(url)
+        if self.delay:
+            time.sleep(self.delay)
+        if url.endswith(".m3u8"):
+            return FakeResponse(b"#EXTM3U\n#EXT-X-TARGETDURATION:2\nseg1.ts\nseg2.ts\n")
+        if url.endswith(".mjpg"):
+            resp = FakeResponse(chunks=list(self.mjpeg_chunks), stop=self.stop)
+            self.responses.append(resp)
+            return resp
+        return FakeResponse(url.encode() * 100)
+
+
+@pytest.fixture
+def encoder():
+    enc = FakeEncoder()
+    yield enc
+    enc.stop.set()
+
+
+class TestHelpers:
+    def test_rewrite_manifest(self):
+        text = "#EXTM3U\nchn2_1.ts\nsub/low.m3u8\n"
+        out = rewrite_manifest(text, "http://10.0.0.5:8100/chn2.m3u8", "&_cb=7")
+        lines = out.splitlines()
+        assert lines[0] == "#EXTM3U"
+        assert lines[1] == "/api/moip/preview/segment?url=http%3A%2F%2F10.0.0.5%3A8100%2Fchn2_1.ts&_cb=7"
+        assert lines[2].startswith("/api/moip/preview/stream?url=http%3A%2F%2F10.0.0.5%3A8100%2Fsub%2Flow.m3u8")
+
+    def test_split_jpegs_across_chunks(self):
+        data = _jpeg(1) + _jpeg(2)
+        frames, rest = split_jpegs(data[:20])
+        assert frames == [_jpeg(1)] and rest == data[14:20]
+        frames, rest = split_jpegs(rest + data[20:])
+        assert frames == [_jpeg(2)] and rest == b""
+
+
+class TestHls:
+    def test_concurrent_manifest_requests_share_one_fetch(self):
+        enc = FakeEncoder(delay=0.05)
+        relay = PreviewRelay(fetch=enc.get)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(relay.manifest("http://e/chn2.m3u8")))
+                   for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(results) == 6 and len(set(results)) == 1
+        assert enc.calls == ["http://e/chn2.m3u8"]
+
+    def test_manifest_refetched_after_ttl(self, encoder):
+        relay = PreviewRelay(manifest_ttl_ms=20, fetch=encoder.get)
+        relay.manifest("http://e/chn2.m3u8")
+        relay.manifest("http://e/chn2.m3u8")
+        time.sleep(0.03)
+        relay.manifest("http://e/chn2.m3u8")
+        assert len(encoder.calls) == 2
+
+    def test_segments_cached_within_byte_budget(self, encoder):
+        relay = PreviewRelay(cache_mb=1, fetch=encoder.get)
+        body, ctype = relay.segment("http://e/seg1.ts")
+        assert relay.segment("http://e/seg1.ts") == (body, ctype)
+        assert encoder.calls == ["http://e/seg1.ts"]
+        # ~1.6 KB each: far more than fits evicts the oldest first
+        for i in range(2, 800):
+            relay.segment(f"http://e/seg{i}.ts")
+        stats = relay.stats()
+        assert stats["segment_bytes"] <= stats["cache_bytes"]
+        relay.segment("http://e/seg1.ts")
+        assert encoder.calls.count("http://e/seg1.ts") == 2
+
+    def test_reset_drops_cache(self, encoder):
+        relay = PreviewRelay(fetch=encoder.get)
+        relay.segment("http://e/seg1.ts")
+        relay.reset()
+        relay.segment("http://e/seg1.ts")
+        assert len(encoder.calls) == 2
+
+    def test_upstream_error_propagates_to_waiters(self):
+        def fail(url, **kw):
+            time.sleep(0.02)
+            return FakeResponse(status=503)
+        relay = PreviewRelay(fetch=fail)
+        with pytest.raises(RuntimeError):
+            relay.segment("http://e/seg1.ts")
+
+
+class TestMjpeg:
+    def test_viewers_share_one_upstream(self, encoder):
+        relay = PreviewRelay(linger_seconds=0, fetch=encoder.get)
+        a, ctype = relay.open_mjpeg("http://e/video.mjpg")
+        b, _ = relay.open_mjpeg("http://e/video.mjpg")
+        assert ctype == "multipart/x-mixed-replace; boundary=frame"
+        assert relay.viewers == 2
+        part = next(a)
+        assert part.startswith(b"--frame\r\nContent-Type: image/jpeg\r\n")
+        assert part.endswith(b"\xff\xd9\r\n")
+        assert next(b).endswith(b"\xff\xd9\r\n")
+        assert encoder.calls.count("http://e/video.mjpg") == 1
+        a.close()
+        b.close()
+
+    def test_slow_viewer_gets_newest_frame(self, encoder):
+        relay = PreviewRelay(fetch=encoder.get)
+        viewer, _ = relay.open_mjpeg("http://e/video.mjpg")
+        time.sleep(0.05)  # all five frames arrive before the viewer reads
+        part = next(viewer)
+        assert part.endswith(_jpeg(5) + b"\r\n")
+        viewer.close()
+
+    def test_upstream_closed_after_last_viewer_leaves(self, encoder):
+        relay = PreviewRelay(linger_seconds=0.05, fetch=encoder.get)
+        viewer, _ = relay.open_mjpeg("http://e/video.mjpg")
+        next(viewer)
+        viewer.close()
+        assert relay.viewers == 0
+        deadline = time.time() + 2
+        while time.time() < deadline and not encoder.responses[0].closed:
+            time.sleep(0.01)
+        assert encoder.responses[0].closed
+        assert relay.stats()["mjpeg_sources"] == {}
+
+    def test_unreachable_upstream_raises(self):
+        def refuse(url, **kw):
+            raise ConnectionError("refused")
+        relay = PreviewRelay(fetch=refuse)
+        with pytest.raises(ConnectionError):
+            relay.open_mjpeg("http://e/video.mjpg", connect_timeout=0.5)
+        assert relay.viewers == 0
@@ -0,0 +1,40 @@
+"""Tests for RoomPresence — room membership tracking for idle polling."""
+
+from polling import RoomPresence
+
+
+class TestRoomPresence:
+    def test_join_and_leave(self):
+        p = RoomPresence()
+        assert p.watched("x32") is False
+        p.join("x32", "sid1")
+        p.join("x32", "sid2")
+        p.leave("x32", "sid1")
+        assert p.watched("x32") is True
+        p.leave("x32", "sid2")
+        assert p.watched("x32") is False
+
+    def test_drop_removes_sid_from_all_rooms(self):
+        p = RoomPresence()
+        p.join("x32", "sid1")
+        p.join("obs", "sid1")
+        p.join("obs", "sid2")
+        p.drop("sid1")
+        assert p.status() == {"x32": 0, "obs": 1}
+
+    def test_listener_fires_on_transitions_only(self):
+        p = RoomPresence()
+        events = []
+        p.add_listener(lambda room, watched: events.append((room, watched)))
+        p.join("obs", "a")
+        p.join("obs", "b")
+        p.leave("obs", "a")
+        p.leave("obs", "b")
+        p.leave("obs", "b")  # not a member any more
+        assert events == [("obs", True), ("obs", False)]
+
+    def test_listener_errors_are_contained(self):
+        p = RoomPresence()
+        p.add_listener(lambda room, watched: 1 / 0)
+        p.join("ha", "a")
+        assert p.watched("ha") is True
@@ -0,0 +1,69 @@
+"""Tests for immutable device snapshots (FrozenDict / freeze / thaw)."""
+
+import copy
+import json
+import logging
+import pickle
+
+import pytest
+
+from snapshots import FrozenDict, freeze, thaw
+from x32_module import X32Poller
+
+
+class TestFreeze:
+    def test_nested_values_are_frozen(self):
+        snap = freeze({"scenes": ["a", "b"], "stats": {"fps": 30}})
+        assert isinstance(snap, FrozenDict)
+        assert snap["scenes"] == ("a", "b")
+        assert isinstance(snap["stats"], FrozenDict)
+
+    @pytest.mark.parametrize("mutate", [
+        lambda d: d.__setitem__("x", 1),
+        lambda d: d.__delitem__("a"),
+        lambda d: d.update(x=1),
+        lambda d: d.pop("a"),
+        lambda d: d.setdefault("x", 1),
+        lambda d: d.clear(),
+        lambda d: d.popitem(),
+    ])
+    def test_mutation_raises(self, mutate):
+        snap = freeze({"a": 1})
+        with pytest.raises(TypeError):
+            mutate(snap)
+
+    def test_behaves_like_dict_for_readers(self):
+        snap = freeze({"a": 1, "b": [1, 2]})
+        assert snap == {"a": 1, "b": (1, 2)}
+        assert json.loads(json.dumps(snap)) == {"a": 1, "b": [1, 2]}
+        assert {**snap, "c": 3}["c"] == 3
+
+    def test_copy_shares_deepcopy_thaws(self):
+        snap = freeze({"a": {"b": [1]}})
+        assert copy.copy(snap) is snap
+        mutable = copy.deepcopy(snap)
+        assert type(mutable) is dict
+        mutable["a"]["b"].append(2)
+        assert snap["a"]["b"] == (1,)
+
+    def test_thaw_and_pickle_give_plain_containers(self):
+        snap = freeze({"a": [{"b": 1}]})
+        assert thaw(snap) == {"a": [{"b": 1}]}
+        restored = pickle.loads(pickle.dumps(snap))
+        assert type(restored) is dict and restored == {"a": [{"b": 1}]}
+
+    def test_freeze_is_idempotent(self):
+        snap = freeze({"a": 1})
+        assert freeze(snap) is snap
+
+
+class TestX32PollerSnapshot:
+    def test_snapshot_returned_by_reference_without_lock(self):
+        poller = X32Poller("X32", "127.0.0.1", logging.getLogger("test"))
+        poller._snapshot = (freeze({"ch1vol": "50"}), 1.0)
+        with poller._lane.background():
+            # Held lock (e.g. a snapshot build in progress) must not block readers
+            snap, age, online, err = poller.snapshot()
+        assert snap is poller._snapshot[0]
+        assert snap["ch1vol"] == "50"
+        assert age > 0
@@ -1,8 +1,10 @@
 """Tests for StateCache — thread-safe state storage with volatile field stripping."""
 
+import gzip
+import json
 import threading
 
-from polling import StateCache
+from polling import PreEncoded, PreEncodedJSON, StateCache
 
 
 class TestStateCache:
@@ -105,3 +107,181 @@ class TestStateCache:
         cache.set("test", base)
         # Adding only volatile fields shouldn't trigger change
         assert cache.set("test", volatile_data) is False
+
+
+class _FakeSocketIO:
+    def __init__(self):
+        self.emitted = []
+
+    def emit(self, event, data=None, room=None, **kw):
+        self.emitted.append((event, data, room))
+
+
+class TestStateCachePatches:
+    def test_first_update_is_full_replace(self):
+        cache = StateCache()
+        patch = cache.update("moip", {"1": "2"})
+        assert patch == {"room": "moip", "v": 1, "base": 0, "ops": [[[], {"1": "2"}]]}
+        assert cache.version("moip") == 1
+
+    def test_update_returns_only_changed_fields(self):
+        cache = StateCache()
+        cache.update("x32", {"ch1vol": "50", "ch2vol": "60", "ch1name": "Pulpit"})
+        patch = cache.update("x32", {"ch1vol": "55", "ch2vol": "60", "ch1name": "Pulpit"})
+        assert patch["base"] == 1 and patch["v"] == 2
+        assert patch["ops"] == [[["ch1vol"], "55"]]
+
+    def test_unchanged_update_returns_none_and_keeps_version(self):
+        cache = StateCache()
+        cache.update("x32", {"a": 1, "age_seconds": 1})
+        assert cache.update("x32", {"a": 1, "age_seconds": 2}) is None
+        assert cache.version("x32") == 1
+
+    def test_patch_carries_volatile_changes_not_yet_sent(self):
+        cache = StateCache()
+        first = {"streaming": True, "stream_bytes": 100, "stream_timecode": "00:00:01"}
+        cache.update("obs", first)
+        assert cache.update("obs", {**first, "stream_bytes": 200, "stream_timecode": "00:00:02"}) is None
+        patch = cache.update("obs", {"streaming": False, "stream_bytes": 200, "stream_timecode": "00:00:02"})
+        client = dict(first)
+        for path, *value in patch["ops"]:
+            client[path[0]] = value[0]
+        assert client == cache.get("obs")
+
+    def test_diff_nested_add_and_delete(self):
+        old = {"rx": {"1": {"tx": 1}, "2": {"tx": 2}}, "gone": True}
+        new = {"rx": {"1": {"tx": 3}, "2": {"tx": 2}}, "added": [1, 2]}
+        ops = StateCache.diff(old, new)
+        assert [["rx", "1", "tx"], 3] in ops
+        assert [["added"], [1, 2]] in ops
+        assert [["gone"]] in ops
+        assert len(ops) == 3
+
+    def test_diff_replaces_lists_wholesale(self):
+        ops = StateCache.diff({"scenes": ["a", "b"]}, {"scenes": ["a", "c"]})
+        assert ops == [[["scenes"], ["a", "c"]]]
+
+    def test_publish_emits_patch_to_room(self):
+        sio = _FakeSocketIO()
+        cache = StateCache(sio)
+        assert cache.publish("obs", {"streaming": False}) is True
+        assert cache.publish("obs", {"streaming": False}) is False
+        assert cache.publish("obs", {"streaming": True}) is True
+        assert [e[0] for e in sio.emitted] == ["state:patch", "state:patch"]
+        event, patch, room = sio.emitted[-1]
+        assert room == "obs"
+        assert json.loads(PreEncodedJSON.dumps(patch))["ops"] == [[["streaming"], True]]
+
+    def test_snapshot(self):
+        cache = StateCache()
+        assert cache.snapshot("ha") is None
+        cache.set("ha", {"lock.front": "locked"})
+        cache.set("ha", {"lock.front": "unlocked"})
+        assert cache.snapshot("ha") == {"room": "ha", "v": 2, "epoch": cache.epoch,
+                                        "value": {"lock.front": "unlocked"}}
+
+
+class TestStateCacheHistory:
+    def test_sequence_is_global_and_patches_chain_per_key(self):
+        cache = StateCache()
+        p1 = cache.update("moip", {"1": 1})
+        p2 = cache.update("x32", {"a": 1})
+        p3 = cache.update("moip", {"1": 2})
+        assert (p1["v"], p2["v"], p3["v"]) == (1, 2, 3)
+        assert p3["base"] == p1["v"]
+        assert cache.seq == 3
+        assert cache.version("moip") == 3
+
+    def test_changes_since_returns_missed_patches(self):
+        cache = StateCache()
+        cache.update("moip", {"1": 1})
+        cache.update("x32", {"a": 1})
+        cache.update("moip", {"1": 2})
+        cache.update("moip", {"1": 3})
+        missed = cache.changes_since("moip", 1)
+        assert [p.value["v"] for p in missed] == [3, 4]
+        assert missed[-1].value["ops"] == [[["1"], 3]]
+
+    def test_changes_since_current_version_is_empty(self):
+        cache = StateCache()
+        cache.update("moip", {"1": 1})
+        assert cache.changes_since("moip", 1) == []
+
+    def test_changes_since_unknown_version_needs_snapshot(self):
+        cache = StateCache()
+        cache.update("moip", {"1": 1})
+        cache.update("moip", {"1": 2})
+        # 7 was never a version of this key (e.g. from a previous process)
+        assert cache.changes_since("moip", 7) is None
+
+    def test_changes_since_beyond_history_needs_snapshot(self):
+        cache = StateCache(history=2)
+        for i in range(5):
+            cache.update("moip", {"1": i})
+        assert cache.changes_since("moip", 1) is None
+        assert [p.value["v"] for p in cache.changes_since("moip", 3)] == [4, 5]
+
+    def test_changes_since_from_zero_replays_first_insert(self):
+        cache = StateCache()
+        cache.update("ha", {"lock": "locked"})
+        missed = cache.changes_since("ha", 0)
+        assert missed[0].value["ops"] == [[[], {"lock": "locked"}]]
+
+
+class TestPreEncoded:
+    def test_encoded_is_reused_until_value_changes(self):
+        cache = StateCache()
+        cache.set("x32", {"ch1vol": "50"})
+        enc = cache.encoded("x32")
+        assert json.loads(enc.raw) == {"ch1vol": "50"}
+        assert cache.encoded("x32") is enc
+        cache.set("x32", {"ch1vol": "55"})
+        assert cache.encoded("x32") is not enc
+
+    def test_volatile_change_refreshes_encoding(self):
+        cache = StateCache()
+        cache.set("obs", {"streaming": True, "stream_timecode": "00:00:01"})
+        cache.encoded("obs")
+        cache.set("obs", {"streaming": True, "stream_timecode": "00:00:06"})
+        assert json.loads(cache.encoded("obs").raw)["stream_timecode"] == "00:00:06"
+
+    def test_encoded_missing_key(self):
+        assert StateCache().encoded("nope") is None
+
+    def test_encoded_snapshot_matches_snapshot(self):
+        cache = StateCache()
+        cache.set("moip", {"1": {"tx": 2}})
+        assert json.loads(cache.encoded_snapshot("moip").raw) == cache.snapshot("moip")
+
+    def test_gzipped_round_trip_is_memoised(self):
+        enc = PreEncoded({"a": list(range(100))})
+        gz = enc.gzipped()
+        assert enc.gzipped() is gz
+        assert json.loads(gzip.decompress(gz)) == {"a": list(range(100))}
+
+    def test_json_module_splices_pre_encoded_args(self):
+        enc = PreEncoded(raw='{"pre":1}')
+        out = PreEncodedJSON.dumps(["state:patch", enc], separators=(",", ":"))
+        assert out == '["state:patch",{"pre":1}]'
+        assert PreEncodedJSON.dumps(["ev", {"a": 1}]) == json.dumps(["ev", {"a": 1}])
+
+
+class TestComposePatches:
+    def test_compose_spans_both_versions(self):
+        cache = StateCache()
+        cache.update("moip", {"1": 1, "2": 1})
+        p1 = cache.update("moip", {"1": 2, "2": 1})
+        p2 = cache.update("moip", {"1": 2, "2": 2})
+        merged = StateCache.compose(p1, p2).value
+        assert merged["base"] == p1["base"] and merged["v"] == p2["v"]
+        assert merged["ops"] == [[["1"], 2], [["2"], 2]]
+
+    def test_compose_drops_overwritten_ops(self):
+        a = {"room": "x", "v": 2, "base": 1, "ops": [[["a", "b"], 1], [["c"], 1]]}
+        b = {"room": "x", "v": 3, "base": 2, "ops": [[["a"], {"b": 5}], [["c"], 2]]}
+        assert StateCache.compose(a, b).value["ops"] == [[["a"], {"b": 5}], [["c"], 2]]
+
+    def test_compose_keeps_child_set_after_parent(self):
+        a = {"room": "x", "v": 2, "base": 1, "ops": [[["a"], {}]]}
+        b = {"room": "x", "v": 3, "base": 2, "ops": [[["a", "b"], 1]]}
+        assert StateCache.compose(a, b).value["ops"] == [[["a"], {}], [["a", "b"], 1]]
@@ -58,3 +58,12 @@ class TestPollerWatchdog:
         assert len(status) == 5
         for name in ("x32", "moip", "obs", "projectors", "ha"):
             assert name in status
+
+    def test_set_interval_extends_staleness_window(self):
+        wd = PollerWatchdog()
+        wd.register("x32", interval=0.01)
+        wd.set_interval("x32", 60)
+        time.sleep(0.05)
+        status = wd.status()
+        assert status["x32"]["stale"] is False
+        assert status["x32"]["interval_s"] == 60
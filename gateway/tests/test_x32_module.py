@@ -0,0 +1,728 @@
+"""Tests for X32 push-mode plumbing: OSC reply matching and snapshot patches."""
+
+import logging
+import struct
+import threading
+import time
+
+from snapshots import freeze
+from x32_module import (
+    CommandLane, FaderEngine, OscTap, X32Module, X32Poller, db_to_fader, decode_meter_blob,
+    fader_to_db, osc_to_snapshot, pack_meter_frame, parse_send,
+)
+
+
+class _Dispatcher:
+    def set_default_handler(self, handler):
+        self.handler = handler
+
+
+class _Server:
+    def __init__(self):
+        self.dispatcher = _Dispatcher()
+
+
+class FakeMixer:
+    """Stands in for an xair_api remote; replies to queries from *replies*."""
+
+    def __init__(self, replies=None, drop_once=()):
+        self.server = _Server()
+        self.replies = replies or {}
+        self.drop_once = set(drop_once)
+        self.sent = []
+        self._info_response = ()
+
+    def send(self, address, param=None):
+        self.sent.append((address, param))
+        addr = address.rstrip()
+        if addr in self.drop_once:
+            self.drop_once.discard(addr)
+            return
+        if param is None and addr in self.replies:
+            threading.Timer(0.005, self.server.dispatcher.handler,
+                            args=(addr, *self.replies[addr])).start()
+
+
+def _poller():
+    return X32Poller("X32", "127.0.0.1", logging.getLogger("test_x32"))
+
+
+class TestOscToSnapshot:
+    def test_channel_fields(self):
+        assert osc_to_snapshot("/ch/05/mix/fader", (0.75,)) == ({"ch5vol": "75"}, False)
+        assert osc_to_snapshot("/ch/05/mix/on", (0,)) == ({"ch5mutestatus": "muted"}, False)
+        assert osc_to_snapshot("/ch/05/config/name", ("PODIUM",)) == ({"ch5name": "PODIUM"}, False)
+
+    def test_aux_bus_dca_keys_match_snapshot(self):
+        assert osc_to_snapshot("/auxin/02/mix/on", (1,)) == ({"aux2_mutestatus": "unmuted"}, False)
+        assert osc_to_snapshot("/auxin/02/mix/fader", (0.5,)) == ({"aux2vol": "50"}, False)
+        assert osc_to_snapshot("/bus/12/config/name", ("Lobby",)) == ({"bus12_name": "Lobby"}, False)
+        assert osc_to_snapshot("/dca/3/fader", (0.1,)) == ({"dca3vol": "10"}, False)
+        assert osc_to_snapshot("/dca/3/on", (1,)) == ({"dca3_mutestatus": "unmuted"}, False)
+
+    def test_scene_change_requests_rescan(self):
+        assert osc_to_snapshot("/-show/prepos/current", (4,)) == ({"cur_scene": "4"}, True)
+        assert osc_to_snapshot("/-action/goscene", (2,)) == ({"cur_scene": "2"}, True)
+        assert osc_to_snapshot("/-show/showfile/scene/007/name", ("Vespers",)) == (
+            {"scene7name": "Vespers"}, False)
+
+    def test_unknown_address_ignored(self):
+        assert osc_to_snapshot("/ch/01/eq/1/f", (0.3,)) == ({}, False)
+        assert osc_to_snapshot("/ch/01/mix/fader", ()) == ({}, False)
+
+
+class TestOscTap:
+    def test_query_returns_reply_for_its_address(self):
+        mixer = FakeMixer({"/-show/prepos/current": (3,)})
+        pushed = []
+        OscTap(mixer, on_message=lambda *a: pushed.append(a))
+        # An unrelated push arriving first must not be taken as the reply
+        mixer.server.dispatcher.handler("/ch/01/mix/fader", 0.5)
+        assert mixer.query("/-show/prepos/current ") == (3,)
+        assert pushed == [("/ch/01/mix/fader", (0.5,), False)]
+
+    def test_query_times_out_empty(self):
+        mixer = FakeMixer()
+        tap = OscTap(mixer, reply_timeout=0.02)
+        assert tap.query("/ch/01/mix/on") == ()
+
+    def test_local_sets_reported(self):
+        mixer = FakeMixer()
+        pushed = []
+        OscTap(mixer, on_message=lambda *a: pushed.append(a))
+        mixer.send("/ch/02/mix/on", 0)
+        mixer.send("/xinfo")
+        assert pushed == [("/ch/02/mix/on", (0,), True)]
+        assert mixer.sent == [("/ch/02/mix/on", 0), ("/xinfo", None)]
+
+
+class TestPipelinedQueries:
+    def test_query_many_matches_replies_and_requeries_missing(self):
+        replies = {f"/ch/{i:02d}/mix/on": (i % 2,) for i in range(1, 33)}
+        mixer = FakeMixer(replies, drop_once={"/ch/07/mix/on"})
+        tap = OscTap(mixer, reply_timeout=0.1)
+        got = tap.query_many(list(replies) + ["/ch/99/mix/on"], window=8, retries=1)
+        assert got == replies
+        assert tap.last_stats["queries"] == 33
+        assert tap.last_stats["missing"] == 1
+        assert tap.last_stats["requeried"] == 2  # ch07 once, ch99 once
+        assert tap.last_stats["duration_ms"] > 0
+
+    def test_push_for_answered_address_dispatched_mid_scan(self):
+        replies = {f"/ch/{i:02d}/mix/fader": (0.5,) for i in range(1, 9)}
+        mixer = FakeMixer(replies)
+        pushed = []
+        tap = OscTap(mixer, on_message=lambda a, args, local: pushed.append((a, args)),
+                     reply_timeout=0.1)
+
+        def on_window(answered, total):
+            if answered == 4:  # first window done: ch01 answered, ch08 not asked yet
+                mixer.server.dispatcher.handler("/ch/01/mix/fader", 0.9)
+                mixer.server.dispatcher.handler("/ch/08/mix/on", 0)
+
+        got = tap.query_many(list(replies), window=4, on_window=on_window)
+        assert got == replies
+        assert ("/ch/01/mix/fader", (0.9,)) in pushed
+        assert ("/ch/08/mix/on", (0,)) in pushed
+
+    def test_build_snapshot_uses_one_pipelined_pass(self):
+        p = _poller()
+        replies = {"/-show/prepos/current": (3,)}
+        for key, addr, _, _, _ in p._snapshot_plan(3):
+            addr = addr.rstrip()
+            if addr.endswith("/on"):
+                replies[addr] = (1,)
+            elif addr.endswith("/fader"):
+                replies[addr] = (0.42,)
+            else:
+                replies[addr] = (f"name:{addr}",)
+        mixer = FakeMixer(replies)
+        p._owner.tap = OscTap(mixer)
+        snap = p._build_snapshot(mixer)
+        assert snap["cur_scene"] == "3"
+        assert snap["cur_scene_name"] == "name:/-show/showfile/scene/003/name"
+        assert snap["ch32mutestatus"] == "unmuted"
+        assert snap["aux8vol"] == "42"
+        assert snap["bus16_name"] == "name:/bus/16/config/name"
+        assert snap["dca8vol"] == "42"
+        assert snap["scene25name"] == "name:/-show/showfile/scene/025/name"
+        assert len(snap) == 2 + 3 * (32 + 8 + 16 + 8) + 26
+        assert p.snapshot_stats["missing"] == 0
+        assert p.snapshot_stats["tier"] == "full"
+
+    def test_build_snapshot_defaults_for_missing_replies(self):
+        p = _poller()
+        mixer = FakeMixer({"/-show/prepos/current": (0,)})
+        p._owner.tap = OscTap(mixer, reply_timeout=0.05)
+        snap = p._build_snapshot(mixer)
+        assert snap["ch1mutestatus"] == "unknown"
+        assert snap["ch1vol"] == ""
+        assert snap["scene0name"] == ""
+
+
+class TestSnapshotTiers:
+    def _mixer(self, p, name="A"):
+        replies = {"/-show/prepos/current": (1,)}
+        for _, addr, _, _, is_cold in p._snapshot_plan(1):
+            addr = addr.rstrip()
+            replies[addr] = (f"{name}:{addr}",) if is_cold else ((1,) if addr.endswith("/on") else (0.5,))
+        mixer = FakeMixer(replies)
+        p._owner.tap = OscTap(mixer)
+        return mixer
+
+    def _snap(self, p, mixer):
+        snap = p._build_snapshot(mixer)
+        p._snapshot = (freeze(snap), 0.0)
+        return snap
+
+    def test_hot_snapshot_reuses_names(self):
+        p = _poller()
+        self._snap(p, self._mixer(p, "A"))
+        mixer = self._mixer(p, "B")
+        snap = self._snap(p, mixer)
+        assert p.snapshot_stats["tier"] == "hot"
+        assert snap["ch1name"] == "A:/ch/01/config/name"
+        assert snap["cur_scene_name"] == "A:/-show/showfile/scene/001/name"
+        assert p.snapshot_stats["queries"] == 2 * (32 + 8 + 16 + 8)
+        assert not any("/config/name" in a or "/showfile/" in a for a, _ in mixer.sent)
+
+    def test_scene_recall_forces_cold_refresh(self):
+        p = _poller()
+        self._snap(p, self._mixer(p, "A"))
+        p._on_message("/-action/goscene", (1,), True)
+        snap = self._snap(p, self._mixer(p, "B"))
+        assert p.snapshot_stats["tier"] == "full"
+        assert snap["ch1name"] == "B:/ch/01/config/name"
+
+    def test_cold_interval_elapsed(self):
+        p = _poller()
+        self._snap(p, self._mixer(p, "A"))
+        p._last_cold -= p._cold_seconds + 1
+        self._snap(p, self._mixer(p, "B"))
+        assert p.snapshot_stats["tier"] == "full"
+
+
+class TestCommandLane:
+    def test_command_goes_ahead_of_waiting_background(self):
+        lane = CommandLane()
+        order = []
+
+        def run(kind):
+            with getattr(lane, kind)():
+                order.append(kind)
+
+        with lane.background():
+            bg = threading.Thread(target=run, args=("background",))
+            bg.start()
+            time.sleep(0.02)
+            cmd = threading.Thread(target=run, args=("command",))
+            cmd.start()
+            time.sleep(0.02)
+        cmd.join(1)
+        bg.join(1)
+        assert order == ["command", "background"]
+
+    def test_yield_to_commands_lets_command_run(self):
+        lane = CommandLane()
+        ran = threading.Event()
+
+        def cmd():
+            with lane.command() as waited:
+                assert waited >= 0
+                ran.set()
+
+        with lane.background():
+            assert lane.yield_to_commands() is False
+            t = threading.Thread(target=cmd)
+            t.start()
+            while not lane.commands_waiting:
+                time.sleep(0.001)
+            assert lane.yield_to_commands() is True
+            assert ran.is_set()
+        t.join(1)
+
+    def test_snapshot_yields_between_windows(self):
+        p = _poller()
+        replies = {"/-show/prepos/current": (1,)}
+        for _, addr, _, _, _ in p._snapshot_plan(1):
+            addr = addr.rstrip()
+            replies[addr] = (1,) if addr.endswith("/on") else (0.5,) if addr.endswith("/fader") else ("n",)
+        mixer = FakeMixer(replies)
+        p._owner.tap = OscTap(mixer)
+        p._query_window = 16
+        p._owner.mixer = mixer
+        p._owner.connected = True
+        command_done_at = []
+
+        def press():
+            p.command(lambda m: command_done_at.append(len(mixer.sent)))
+
+        with p._lane.background():
+            t = threading.Thread(target=press)
+            t.start()
+            while not p._lane.commands_waiting:
+                time.sleep(0.001)
+            p._build_snapshot(mixer)
+        t.join(1)
+        total = len(mixer.sent)
+        # The command ran after the first window, not after the whole scan
+        assert command_done_at and command_done_at[0] < total / 2
+        assert p.snapshot_stats["yields"] == 1
+        assert p.snapshot_progress is None
+
+
+class TestPushPatches:
+    def test_push_patches_snapshot_and_notifies(self):
+        p = _poller()
+        p._snapshot = (freeze({"ch1vol": "50", "ch1mutestatus": "unmuted"}), 0.0)
+        calls = []
+        p.add_listener(lambda: calls.append(1))
+        p._on_message("/ch/01/mix/fader", (0.8,), False)
+        snap = p.snapshot()[0]
+        assert snap["ch1vol"] == "80"
+        assert snap["ch1mutestatus"] == "unmuted"
+        assert calls == [1]
+
+    def test_unchanged_value_does_not_notify(self):
+        p = _poller()
+        p._snapshot = (freeze({"ch1vol": "50"}), 0.0)
+        calls = []
+        p.add_listener(lambda: calls.append(1))
+        p._on_message("/ch/01/mix/fader", (0.5,), False)
+        assert calls == []
+
+    def test_scene_change_updates_name_and_requests_rescan(self):
+        p = _poller()
+        p._snapshot = (freeze({"cur_scene": "1", "cur_scene_name": "Liturgy",
+                               "scene1name": "Liturgy", "scene2name": "Vespers"}), 0.0)
+        p._on_message("/-show/prepos/current", (2,), False)
+        snap = p.snapshot()[0]
+        assert snap["cur_scene"] == "2"
+        assert snap["cur_scene_name"] == "Vespers"
+        assert p._snapshot_wanted.is_set()
+
+    def test_patches_during_scan_are_kept(self):
+        p = _poller()
+        p._snapshot = (freeze({"ch1vol": "10"}), 0.0)
+        p._scan_patches = {}
+        p._on_message("/ch/01/mix/fader", (0.9,), False)
+        assert p._scan_patches == {"ch1vol": "90"}
+
+    def test_no_snapshot_yet_ignores_push(self):
+        p = _poller()
+        p._on_message("/ch/01/mix/fader", (0.9,), False)
+        assert p.snapshot()[0] is None
+
+
+ROUTING = {
+    "send_level": 0.75,
+    "source_groups": [
+        {"name": "Altar", "patterns": ["altar"]},
+        {"name": "AirPlay", "patterns": ["airplay"], "type": "aux"},
+    ],
+    "destinations": [
+        {"name": "Church", "buses": [1, 2]},
+        {"name": "Chapel", "buses": [5]},
+    ],
+    "presets": {
+        "church_only": {"name": "Church only", "routes": {"Altar": ["Church"], "AirPlay": ["Church"]}},
+    },
+}
+
+
+class TestRoutingSends:
+    def _module(self, levels):
+        x = X32Module({"routing": ROUTING}, logging.getLogger("test_x32"))
+        p = x._poller
+        p._snapshot = (freeze({"ch1name": "ALTAR 1", "ch2name": "ALTAR 2", "ch3name": "PODIUM",
+                               "aux1_name": "AIRPLAY L"}), 0.0)
+        p._online = True
+        mixer = FakeMixer({addr: (lvl,) for addr, lvl in levels.items()})
+        p._owner.tap = OscTap(mixer, on_message=p._on_message, reply_timeout=0.05)
+        p._owner.mixer = mixer
+        p._owner.connected = True
+        return x, mixer
+
+    def _sets(self, mixer):
+        return {a: v for a, v in mixer.sent if v is not None}
+
+    def test_parse_send(self):
+        assert parse_send("/ch/03/mix/05/level", (0.5,)) == (("ch", 3, 5), 0.5)
+        assert parse_send("/auxin/01/mix/12/level", (0.0,)) == (("aux", 1, 12), 0.0)
+        assert parse_send("/ch/03/mix/fader", (0.5,)) is None
+
+    def test_routing_state_queried_once_then_cached(self):
+        levels = {f"/{root}/{n:02d}/mix/{bus:02d}/level": 0.75 if bus < 5 else 0.0
+                  for root, n in (("ch", 1), ("ch", 2), ("auxin", 1)) for bus in (1, 2, 5)}
+        x, mixer = self._module(levels)
+        state, status = x.get_routing_state()
+        assert status == 200
+        assert state["matrix"]["Altar"]["Church"] == {"active": True, "level": 0.75}
+        assert state["matrix"]["Altar"]["Chapel"]["active"] is False
+        queried = len(mixer.sent)
+        x._poller._push_active = True
+        x._poller._on_message("/ch/09/mix/on", (1,), False)  # pushes are arriving
+        x.get_routing_state()
+        assert len(mixer.sent) == queried
+
+    def test_silent_subscription_does_not_pin_cache(self):
+        x, mixer = self._module({"/ch/01/mix/01/level": 0.75})
+        x._poller._on_message("/ch/01/mix/01/level", (0.5,), False)
+        x._poller._push_active = True
+        assert x._poller.send_levels([("ch", 1, 1)], 0.0)[0] == {("ch", 1, 1): 0.5}
+        # No push for longer than an /xremote lasts: fall back to max_age
+        x._poller._last_push_at -= 11.0
+        assert x._poller.send_levels([("ch", 1, 1)], 0.0) == ({}, [("ch", 1, 1)])
+
+    def test_preset_writes_only_differing_sends(self):
+        levels = {"/ch/01/mix/01/level": 0.75, "/ch/01/mix/02/level": 0.75,
+                  "/ch/02/mix/01/level": 0.7498, "/ch/02/mix/02/level": 0.0,
+                  "/ch/01/mix/05/level": 0.75, "/ch/02/mix/05/level": 0.0,
+                  "/auxin/01/mix/01/level": 0.75, "/auxin/01/mix/02/level": 0.75,
+                  "/auxin/01/mix/05/level": 0.0}
+        x, mixer = self._module(levels)
+        res, status = x.apply_routing_preset("church_only")
+        assert status == 200
+        assert self._sets(mixer) == {"/ch/02/mix/02/level": 0.75, "/ch/01/mix/05/level": 0.0}
+        assert res["changes"] == 2 and res["unchanged"] == 7
+        # Our own sets update the matrix, so re-applying is a no-op
+        mixer.sent.clear()
+        x._poller._push_active = True
+        x._poller._last_push_at = time.time()
+        res, _ = x.apply_routing_preset("church_only")
+        assert res["changes"] == 0 and mixer.sent == []
+
+    def test_push_updates_matrix(self):
+        x, mixer = self._module({})
+        x._poller._push_active = True
+        for ch in (1, 2):
+            for bus in (1, 2, 5):
+                mixer.server.dispatcher.handler(f"/ch/{ch:02d}/mix/{bus:02d}/level", 0.0)
+        mixer.server.dispatcher.handler("/ch/01/mix/05/level", 0.6)
+        res, status = x.set_group_routing("Altar", "Chapel", True)
+        assert status == 200
+        assert self._sets(mixer) == {"/ch/02/mix/05/level": 0.75, "/ch/01/mix/05/level": 0.75}
+        assert res["sends_changed"] == 2
+        assert not any(v is None for _, v in mixer.sent)  # nothing queried
+
+    def test_scene_recall_drops_cached_sends(self):
+        x, _ = self._module({})
+        x._poller._on_message("/ch/01/mix/01/level", (0.5,), False)
+        assert x._poller.send_levels([("ch", 1, 1)], 10.0)[0] == {("ch", 1, 1): 0.5}
+        x._poller._on_message("/-action/goscene", (3,), True)
+        assert x._poller.send_levels([("ch", 1, 1)], 10.0) == ({}, [("ch", 1, 1)])
+
+    def test_push_during_scan_beats_scan_reply(self):
+        x, _ = self._module({})
+        p = x._poller
+        p._scan_sends = set()
+        p._on_message("/ch/01/mix/01/level", (0.2,), False)
+        p._store_sends({("ch", 1, 1): 0.9, ("ch", 1, 2): 0.9}, from_scan=True)
+        levels, _ = p.send_levels([("ch", 1, 1), ("ch", 1, 2)], 10.0)
+        assert levels == {("ch", 1, 1): 0.2, ("ch", 1, 2): 0.9}
+
+
+class _Recorder:
+    """Stands in for X32Poller.command: runs the function against a FakeMixer."""
+
+    def __init__(self, fail=False):
+        self.mixer = FakeMixer()
+        self.calls = 0
+        self.fail = fail
+
+    def __call__(self, func):
+        self.calls += 1
+        if self.fail:
+            return None, "mixer gone"
+        return func(self.mixer), None
+
+
+class TestFaderEngine:
+    def _engine(self, fail=False):
+        cmd = _Recorder(fail)
+        return FaderEngine(cmd, logging.getLogger("test_x32")), cmd
+
+    def test_db_mapping(self):
+        assert db_to_fader(10) == 1.0
+        assert db_to_fader(0) == 0.75
+        assert db_to_fader(-10) == 0.5
+        assert db_to_fader(-30) == 0.25
+        assert db_to_fader(-90) == 0.0
+        for db in (-75.0, -45.0, -20.0, -5.0, 5.0):
+            assert abs(fader_to_db(db_to_fader(db)) - db) < 1e-9
+
+    def test_slider_burst_coalesces_to_one_send(self):
+        eng, cmd = self._engine()
+        for i in range(50):
+            eng.set(("ch", 5), i / 100)
+        eng.set(("dca", 2), 0.3)
+        assert eng.tick() == 2
+        assert cmd.calls == 1
+        assert sorted(cmd.mixer.sent) == [("/ch/05/mix/fader", 0.49), ("/dca/2/fader", 0.3)]
+        assert eng.tick() == 0 and cmd.calls == 1
+
+    def test_ramp_interpolates_and_finishes(self):
+        eng, cmd = self._engine()
+        eng.ramp(("bus", 3), 0.2, 0.6, 2.0)
+        t0 = eng._ramps[("bus", 3)][2]
+        eng.tick(t0 + 1.0)
+        assert cmd.mixer.sent[-1] == ("/bus/03/mix/fader", 0.4)
+        assert eng.busy(("bus", 3))
+        eng.tick(t0 + 5.0)
+        assert cmd.mixer.sent[-1] == ("/bus/03/mix/fader", 0.6)
+        assert not eng.busy(("bus", 3))
+        assert eng.wait(("bus", 3), 0.1)
+
+    def test_repeated_set_always_sent(self):
+        eng, cmd = self._engine()
+        eng.set(("ch", 1), 0.5)
+        eng.tick()
+        eng.set(("ch", 1), 0.5)
+        assert eng.tick() == 1
+        assert cmd.mixer.sent == [("/ch/01/mix/fader", 0.5)] * 2
+
+    def test_set_cancels_ramp(self):
+        eng, cmd = self._engine()
+        eng.ramp(("ch", 1), 0.0, 1.0, 10.0)
+        eng.set(("ch", 1), 0.1)
+        eng.tick()
+        assert cmd.mixer.sent == [("/ch/01/mix/fader", 0.1)]
+        assert eng.active() == 0
+
+    def test_failure_cancels_pending(self):
+        eng, _ = self._engine(fail=True)
+        eng.ramp(("ch", 1), 0.0, 1.0, 10.0)
+        eng.tick()
+        assert eng.active() == 0
+        assert eng.failures == 1 and eng.last_error == "mixer gone"
+
+    def test_engine_thread_runs_fade(self):
+        eng, cmd = self._engine()
+        eng.start()
+        try:
+            eng.ramp(("ch", 2), 0.0, 0.5, 0.2)
+            assert eng.wait(("ch", 2), 2.0)
+        finally:
+            eng.stop()
+        values = [v for _, v in cmd.mixer.sent]
+        assert values[-1] == 0.5
+        assert values == sorted(values) and len(values) > 2
+
+
+class TestFade:
+    def _module(self, replies=None):
+        x = X32Module({}, logging.getLogger("test_x32"))
+        p = x._poller
+        p._online = True
+        mixer = FakeMixer(replies or {})
+        p._owner.tap = OscTap(mixer, on_message=p._on_message, reply_timeout=0.05)
+        p._owner.mixer = mixer
+        p._owner.connected = True
+        return x, mixer
+
+    def test_validation(self):
+        x, _ = self._module()
+        assert x.fade("ch", 40, db=-10)[1] == 400
+        assert x.fade("fx", 1, db=-10)[1] == 400
+        assert x.fade("ch", 1)[1] == 400
+        assert x.fade("ch", 1, value=0.5, db=-10)[1] == 400
+
+    def test_fade_starts_from_mixer_position(self):
+        x, mixer = self._module({"/ch/04/mix/fader": (0.25,)})
+        res, status = x.fade("ch", 4, db=-10, seconds=3)
+        assert status == 200
+        assert res["from"] == 0.25 and res["target"] == 0.5 and res["target_db"] == -10.0
+        assert x._faders._ramps[("ch", 4)][:2] == (0.25, 0.5)
+
+    def test_set_volume_goes_through_engine(self):
+        x, mixer = self._module()
+        for v in (0.1, 0.2, 0.3):
+            res, status = x.set_volume_channel(7, v)
+        assert status == 200 and res == {"success": True, "channel": 7, "volume": 0.3, "queued": True}
+        assert mixer.sent == []
+        x._faders.tick()
+        assert mixer.sent == [("/ch/07/mix/fader", 0.3)]
+
+    def test_failed_send_reported_on_next_set(self):
+        x, _ = self._module()
+        x.set_volume_bus(2, 0.4)
+        x._faders._command = _Recorder(fail=True)
+        x._faders.tick()
+        res, status = x.set_volume_bus(2, 0.5)
+        assert status == 200 and res["previous_error"] == "mixer gone"
+        # The new position is queued, not dropped with the old failure
+        assert x._faders.busy(("bus", 2))
+        assert "previous_error" not in x.set_volume_bus(2, 0.6)[0]
+        assert x.get_health()["fader_failures"] == 1
+
+    def test_same_value_resent_after_scene_recall(self):
+        x, mixer = self._module()
+        x.set_volume_channel(4, 0.75)
+        x._faders.tick()
+        assert x.set_scene(3)[1] == 200
+        x.set_volume_channel(4, 0.75)
+        assert x._faders.tick() == 1
+        assert mixer.sent[-1] == ("/ch/04/mix/fader", 0.75)
+
+    def test_pushed_scene_recall_forgets_positions(self):
+        x, mixer = self._module()
+        x.set_volume_channel(4, 0.75)
+        x._faders.tick()
+        mixer.server.dispatcher.handler("/-show/prepos/current", 5)
+        assert x._faders.position(("ch", 4)) == (None, 0.0)
+
+    def test_fade_starts_from_console_push(self):
+        x, mixer = self._module({"/ch/04/mix/fader": (0.25,)})
+        x.set_volume_channel(4, 0.8)
+        x._faders.tick()
+        mixer.server.dispatcher.handler("/ch/04/mix/fader", 0.3)
+        res, _ = x.fade("ch", 4, value=0.5, seconds=3)
+        assert res["from"] == 0.3
+
+    def test_newer_snapshot_overrides_last_send(self):
+        x, mixer = self._module({"/ch/04/mix/fader": (0.25,)})
+        x.set_volume_channel(4, 0.8)
+        x._faders.tick()
+        # A later scan saw the fader elsewhere (moved while pushes were off)
+        x._poller._snapshot = (freeze({"ch4vol": "25"}), time.time() + 1)
+        res, _ = x.fade("ch", 4, value=0.5, seconds=3)
+        assert res["from"] == 0.25
+        # ...but one that agrees with the send keeps the exact value
+        x._faders.set(("ch", 4), 0.805)
+        x._faders.tick()
+        x._poller._snapshot = (freeze({"ch4vol": "80"}), time.time() + 1)
+        assert x.fade("ch", 4, value=0.5, seconds=3)[0]["from"] == 0.805
+
+    def test_relative_step_cancels_queued_move(self):
+        x, mixer = self._module({"/ch/06/mix/fader": (0.5,)})
+        x.set_volume_channel(6, 0.9)
+        res, status = x.volume_channel(6, "up")
+        assert status == 200 and res["volume"] == 0.55
+        assert not x._faders.busy(("ch", 6))
+        x._faders.tick()
+        assert mixer.sent[-1] == ("/ch/06/mix/fader", 0.55)
+
+    def test_offline_rejected(self):
+        x, _ = self._module()
+        x._poller._online = False
+        assert x.set_volume_aux(1, 0.5)[1] == 503
+
+
+def _meter_blob(values):
+    return struct.pack(f"<i{len(values)}f", len(values), *values)
+
+
+class TestMeters:
+    def test_decode_blob(self):
+        assert decode_meter_blob(_meter_blob([1.0, 0.5, 0.0])) == [1.0, 0.5, 0.0]
+        assert decode_meter_blob(b"\x01") == []
+        # A count larger than the blob holds is cut to what is there
+        assert decode_meter_blob(struct.pack("<i2f", 9, 0.25, 0.5)) == [0.25, 0.5]
+
+    def test_pack_frame(self):
+        frame = pack_meter_frame({2: [1.0, 0.0], 1: [0.1]})
+        # version, bank count, then bank 1 (one value) and bank 2 (two values)
+        assert frame == bytes([1, 2, 1, 1, 140, 2, 2, 180, 0])
+
+    def test_poller_keeps_latest_frame_per_bank(self):
+        p = _poller()
+        assert p.meter_frame() == (0, b"")
+        p._on_message("/meters/1", (_meter_blob([1.0] * 96),), False)
+        p._on_message("/meters/2", (_meter_blob([0.0] * 49),), False)
+        p._on_message("/meters/9", (_meter_blob([1.0]),), False)
+        seq, frame = p.meter_frame()
+        assert seq == 2
+        assert frame[:4] == bytes([1, 2, 1, 32]) and len(frame) == 2 + 2 + 32 + 2 + 25
+        assert p.meter_frame()[1] is frame  # packed once per update
+
+    def test_renew_subscribes_each_bank(self):
+        p = _poller()
+        mixer = FakeMixer()
+        p._owner.tap = OscTap(mixer)
+        assert p.renew_meters() is False  # offline
+        p._online = True
+        assert p.renew_meters() is True
+        assert mixer.sent == [("/meters", "/meters/1"), ("/meters", "/meters/2")]
+
+    def test_renew_does_not_wait_for_a_scan(self):
+        p = _poller()
+        mixer = FakeMixer()
+        p._owner.tap = OscTap(mixer)
+        p._online = True
+        with p._lane.background():  # a snapshot scan holds the mixer
+            assert p.renew_meters() is True
+        assert len(mixer.sent) == 2
+
+
+class TestBatch:
+    def _module(self, replies=None, echo=True):
+        x = X32Module({}, logging.getLogger("test_x32"))
+        p = x._poller
+        p._online = True
+        mixer = FakeMixer(replies or {})
+        if echo:
+            # The mixer answers read-backs with whatever was last set
+            raw_send = mixer.send
+
+            def send(address, param=None):
+                if param is not None:
+                    mixer.replies[address.rstrip()] = (param,)
+                raw_send(address, param)
+            mixer.send = send
+        p._owner.tap = OscTap(mixer, on_message=p._on_message, reply_timeout=0.05)
+        p._owner.mixer = mixer
+        p._owner.connected = True
+        return x, mixer
+
+    def test_one_burst_then_one_readback(self):
+        x, mixer = self._module()
+        res, status = x.batch([
+            {"strip": "ch", "num": 3, "mute": True},
+            {"strip": "aux", "num": 2, "mute": "off"},
+            {"strip": "bus", "num": 4, "volume": 0.5},
+            {"strip": "dca", "num": 1, "db": -10, "mute": False},
+        ])
+        assert status == 200 and res["success"] is True
+        assert res["sent"] == 5
+        sets = [(a, v) for a, v in mixer.sent if v is not None]
+        assert sets == [("/ch/03/mix/on", 0), ("/auxin/02/mix/on", 1), ("/bus/04/mix/fader", 0.5),
+                        ("/dca/1/on", 1), ("/dca/1/fader", 0.5)]
+        # Every set goes out before the first read-back query
+        first_query = next(i for i, (_, v) in enumerate(mixer.sent) if v is None)
+        assert first_query == 5
+        assert all(r["success"] and r["confirmed"] for r in res["results"])
+
+    def test_bad_items_reported_others_applied(self):
+        x, mixer = self._module()
+        res, status = x.batch([
+            {"strip": "ch", "num": 40, "mute": True},
+            {"strip": "ch", "num": 1},
+            {"strip": "ch", "num": 2, "mute": True},
+        ])
+        assert status == 200 and res["success"] is False
+        assert [r["success"] for r in res["results"]] == [False, False, True]
+        assert "1-32" in res["results"][0]["error"]
+        assert [(a, v) for a, v in mixer.sent if v is not None] == [("/ch/02/mix/on", 0)]
+
+    def test_readback_mismatch_fails_item(self):
+        x, _ = self._module({"/ch/05/mix/on": (1,)}, echo=False)
+        res, _ = x.batch([{"strip": "ch", "num": 5, "mute": True}])
+        assert res["results"][0]["success"] is False
+        assert "/ch/05/mix/on" in res["results"][0]["error"]
+
+    def test_unanswered_readback_is_unconfirmed(self):
+        x, _ = self._module(echo=False)
+        res, _ = x.batch([{"strip": "dca", "num": 2, "mute": True}])
+        assert res["results"][0] == {"index": 0, "strip": "dca", "num": 2, "mute": True,
+                                     "success": True, "confirmed": False}
+
+    def test_direct_volume_cancels_running_fade(self):
+        x, _ = self._module()
+        x._faders.ramp(("ch", 1), 0.0, 1.0, 10.0)
+        x.batch([{"strip": "ch", "num": 1, "volume": 0.3}])
+        assert not x._faders.busy(("ch", 1))
+
+    def test_empty_batch_rejected(self):
+        x, _ = self._module()
+        assert x.batch([])[1] == 400
+        assert x.batch(None)[1] == 400
@@ -33,6 +33,8 @@ import xml.etree.ElementTree as ET
 import requests as http_requests
 import urllib3
 
+from metrics import record_command
+
 # Suppress warnings for verify=False calls
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -211,6 +213,12 @@ class WattBoxConnection:
         Reconnection/retry logic lives in WattBoxDevice._send() so the failure
         streak counter stays accurate (one call = one attempt = one count).
         """
+        started = time.perf_counter()
+        result = self._send_once(command)
+        record_command("wattbox", started, result is not None)
+        return result
+
+    def _send_once(self, command: str) -> Optional[str]:
         if not self.connected or not self._sock:
             return None
 
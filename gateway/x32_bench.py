@@ -0,0 +1,198 @@
+"""
+X32 benchmark — times the gateway's X32 code against the simulator.
+
+Reports:
+  - snapshot duration (full and hot tier)
+  - command latency while snapshots run back to back
+  - routing preset apply time (first apply and a repeat that changes nothing)
+
+    python x32_bench.py                        # clean network
+    python x32_bench.py --latency 3 --jitter 2 --loss 0.02 --json
+
+Uses an in-process X32Simulator unless --target host:port points at another
+one (or, carefully, at a real console).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import statistics
+import threading
+import time
+from typing import Dict, Optional
+
+from bench_stats import print_table, summarize
+from x32_module import X32Module
+from x32_sim import X32Simulator
+
+logger = logging.getLogger("stp-gateway")
+
+# Two presets over a small routing setup; the simulator's channel names match
+BENCH_ROUTING = {
+    "send_level": 0.75,
+    "source_groups": [
+        {"name": "Mics", "patterns": ["^mic"]},
+        {"name": "Playback", "patterns": ["^play"], "type": "aux"},
+    ],
+    "destinations": [
+        {"name": "Main", "buses": [1, 2]},
+        {"name": "Chapel", "buses": [5, 6]},
+        {"name": "Hall", "buses": [7, 8]},
+        {"name": "PA", "buses": [11, 12]},
+    ],
+    "presets": {
+        "everywhere": {"name": "Everywhere", "routes": {
+            "Mics": ["Main", "Chapel", "Hall", "PA"], "Playback": ["Main", "Chapel", "Hall", "PA"]}},
+        "main_only": {"name": "Main only", "routes": {"Mics": ["Main"], "Playback": ["Main"]}},
+    },
+}
+BENCH_NAMES = {**{f"/ch/{i:02d}/config/name": f"MIC {i}" for i in range(1, 17)},
+               **{f"/auxin/{i:02d}/config/name": f"PLAY {i}" for i in range(1, 5)}}
+
+
+def bench_snapshots(x32: X32Module, runs: int) -> Dict[str, dict]:
+    poller = x32._poller
+    result = {}
+    for tier in ("full", "hot"):
+        samples = []
+        for _ in range(runs):
+            poller._cold_wanted = tier == "full"
+            with poller._lane.background():
+                started = time.perf_counter()
+                poller._build_snapshot(poller._owner.require())
+                samples.append(time.perf_counter() - started)
+        result[tier] = summarize(samples)
+        result[tier]["missing_last"] = poller.snapshot_stats.get("missing", 0)
+    return result
+
+
+def bench_commands_under_load(x32: X32Module, commands: int) -> Dict[str, dict]:
+    """Mute toggles while full snapshots run continuously in the background."""
+    poller = x32._poller
+    stop = threading.Event()
+    scans = [0]
+
+    def load():
+        while not stop.is_set():
+            poller._cold_wanted = True
+            with poller._lane.background():
+                try:
+                    poller._build_snapshot(poller._owner.require())
+                    scans[0] += 1
+                except Exception as e:
+                    logger.debug(f"bench: snapshot failed: {e}")
+
+    idle = []
+    for i in range(commands):
+        started = time.perf_counter()
+        x32.mute_channel(1 + i % 32, "on" if i % 2 else "off")
+        idle.append(time.perf_counter() - started)
+
+    loader = threading.Thread(target=load, daemon=True)
+    loader.start()
+    time.sleep(0.05)
+    loaded, failures = [], 0
+    for i in range(commands):
+        started = time.perf_counter()
+        _, status = x32.mute_channel(1 + i % 32, "on" if i % 2 else "off")
+        loaded.append(time.perf_counter() - started)
+        failures += status >= 400
+        time.sleep(0.01)
+    stop.set()
+    loader.join(timeout=10)
+    return {"idle": summarize(idle), "under_snapshot_load": summarize(loaded),
+            "failures": failures, "snapshots_during": scans[0]}
+
+
+def bench_routing(x32: X32Module, rounds: int) -> Dict[str, dict]:
+    first, repeat, changes = [], [], []
+    for preset in ["everywhere", "main_only"] * rounds:
+        x32.invalidate_routing_cache()  # cold matrix: read sends, then write the diff
+        started = time.perf_counter()
+        res, _ = x32.apply_routing_preset(preset)
+        first.append(time.perf_counter() - started)
+        changes.append(res.get("changes", 0))
+        started = time.perf_counter()
+        x32.apply_routing_preset(preset)  # warm matrix, nothing to change
+        repeat.append(time.perf_counter() - started)
+    return {"apply": summarize(first), "reapply_no_change": summarize(repeat),
+            "sends_changed_avg": round(statistics.mean(changes), 1) if changes else 0}
+
+
+def run(target: Optional[str], latency: float, jitter: float, loss: float,
+        runs: int, commands: int, seed: Optional[int]) -> dict:
+    sim = None
+    if target:
+        host, _, port = target.partition(":")
+        port = int(port or 10023)
+    else:
+        sim = X32Simulator(latency_ms=latency, jitter_ms=jitter, loss=loss, seed=seed,
+                           names=BENCH_NAMES).start()
+        host, port = sim.address
+    # push off: the benchmark drives snapshots itself and routing reads the mixer
+    x32 = X32Module({"mixer_ip": host, "mixer_port": port, "push": False,
+                     "routing": BENCH_ROUTING}, logger)
+    poller = x32._poller
+    try:
+        poller._owner.connect()
+        poller._online = True
+        with poller._lane.background():
+            poller._snapshot = (poller._build_snapshot(poller._owner.mixer), time.time())
+        report = {
+            "network": {"latency_ms": latency, "jitter_ms": jitter, "loss": loss,
+                        "target": target or f"simulator {host}:{port}"},
+            "snapshot": bench_snapshots(x32, runs),
+            "commands": bench_commands_under_load(x32, commands),
+            "routing_preset": bench_routing(x32, max(1, runs // 2)),
+        }
+        if sim is not None:
+            report["simulator"] = dict(sim.stats)
+        return report
+    finally:
+        poller._owner.disconnect()
+        if sim is not None:
+            sim.stop()
+
+
+def _print(report: dict) -> None:
+    net = report["network"]
+    print(f"X32 benchmark against {net['target']} "
+          f"(latency {net['latency_ms']} ms, jitter {net['jitter_ms']} ms, loss {net['loss']:.1%})")
+    rows = [
+        ("snapshot full", report["snapshot"]["full"]),
+        ("snapshot hot", report["snapshot"]["hot"]),
+        ("command idle", report["commands"]["idle"]),
+        ("command under snapshot load", report["commands"]["under_snapshot_load"]),
+        ("routing preset apply", report["routing_preset"]["apply"]),
+        ("routing preset re-apply", report["routing_preset"]["reapply_no_change"]),
+    ]
+    print_table(rows)
+    print(f"command failures: {report['commands']['failures']}, "
+          f"snapshots during load: {report['commands']['snapshots_during']}, "
+          f"sends changed per preset: {report['routing_preset']['sends_changed_avg']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the gateway's X32 code")
+    parser.add_argument("--target", help="host:port of a running simulator (default: start one)")
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated reply latency (ms)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="simulated +/- jitter (ms)")
+    parser.add_argument("--loss", type=float, default=0.0, help="simulated packet loss (0-1)")
+    parser.add_argument("--runs", type=int, default=10, help="snapshots per tier")
+    parser.add_argument("--commands", type=int, default=50, help="commands per latency sample")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    report = run(args.target, args.latency, args.jitter, args.loss, args.runs, args.commands, args.seed)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,21 +8,36 @@ Key design:
 - Background poller thread owns the mixer connection via xair_api.
 - Two-stage polling: PING (cheap, determines online/offline) and SNAPSHOT
   (heavier, refreshes cached status less often).
+- Push mode: the gateway renews an /xremote subscription and patches the
+  snapshot from the parameter changes the mixer pushes; full snapshots
+  then only run on connect, on scene change and as a slow safety sweep.
+- Level meters: /meters blobs are decoded and packed once per update for
+  the x32_meters room (see meter_stream.py).
+- Routing keeps a cached channel→bus send matrix (full scans, pushes, our
+  own sets); presets write only the sends that differ, in one burst.
 - All public methods return plain dicts suitable for jsonify().
 - Thread-safe: HTTP routes and macro engine can call methods concurrently.
 """
 
 from __future__ import annotations
 
-import copy
 import logging
+import math
 import re
+import struct
 import threading
 import time
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 import xair_api
 
+from metrics import (
+    X32_COMMAND_WAIT, X32_FADER_COALESCED, X32_FADER_SENDS, X32_SNAPSHOT, X32_SNAPSHOT_PROGRESS,
+    X32_SNAPSHOT_YIELDS, record_command,
+)
+from snapshots import FrozenDict, freeze
+
 
 # =============================================================================
 # MIXER OWNER
@@ -31,16 +46,24 @@ import xair_api
 class MixerOwner:
     """Owns the xair_api connection. Not thread-safe; caller must hold lock."""
 
-    def __init__(self, mixer_type: str, ip: str, logger: logging.Logger) -> None:
+    def __init__(self, mixer_type: str, ip: str, logger: logging.Logger,
+                 on_message: Optional[Callable[[str, tuple, bool], None]] = None,
+                 port: Optional[int] = None) -> None:
         self.mixer_type = mixer_type
         self.ip = ip
+        self.port = port  # None = xair_api's default for the mixer type
         self.mixer = None
+        self.tap: Optional[OscTap] = None
         self.connected = False
         self._logger = logger
+        self._on_message = on_message
 
     def connect(self) -> None:
         self._logger.info(f"X32: Connecting to {self.mixer_type} @ {self.ip}...")
-        m = xair_api.connect(self.mixer_type, ip=self.ip)
+        kwargs = {"ip": self.ip}
+        if self.port:
+            kwargs["port"] = self.port
+        m = xair_api.connect(self.mixer_type, **kwargs)
         try:
             m.__enter__()
         except Exception:
@@ -51,6 +74,7 @@ class MixerOwner:
                 self._logger.debug(f"X32: cleanup after failed connect: {e}")
             raise
         self.mixer = m
+        self.tap = OscTap(m, on_message=self._on_message)
         self.connected = True
         self._logger.info("X32: Connected to mixer")
 
@@ -61,6 +85,7 @@ class MixerOwner:
             except Exception as e:
                 self._logger.debug(f"X32: disconnect cleanup: {e}")
         self.mixer = None
+        self.tap = None
         self.connected = False
 
     def require(self):
@@ -69,6 +94,238 @@ class MixerOwner:
         return self.mixer
 
 
+# =============================================================================
+# OSC TAP (reply matching + pushed parameter changes)
+# =============================================================================
+
+class OscTap:
+    """Sits between xair_api and the mixer's UDP socket.
+
+    xair_api's own ``query`` sleeps 20 ms and returns whatever message
+    arrived last, which breaks as soon as the mixer also pushes /xremote
+    updates.  The tap replaces ``query`` on the mixer instance with one that
+    waits for the reply to *that* address, and hands every other incoming
+    message — plus every set we send — to *on_message(address, args, local)*.
+    """
+
+    def __init__(self, mixer, on_message: Optional[Callable[[str, tuple, bool], None]] = None,
+                 reply_timeout: float = 0.25) -> None:
+        self._mixer = mixer
+        self._raw_send = mixer.send
+        self._on_message = on_message
+        self._reply_timeout = reply_timeout
+        self._cond = threading.Condition()
+        self._waiting: Dict[str, int] = {}
+        self._replies: Dict[str, tuple] = {}
+        self.last_stats: Dict[str, Any] = {}
+        mixer.server.dispatcher.set_default_handler(self._handle)
+        mixer.query = self.query
+        mixer.send = self.send
+
+    def _handle(self, address: str, *args) -> None:
+        self._mixer._info_response = args
+        addr = address.rstrip()
+        with self._cond:
+            if addr in self._waiting:
+                self._replies[addr] = args
+                self._cond.notify_all()
+                return
+        self._dispatch(addr, args, False)
+
+    def _dispatch(self, addr: str, args: tuple, local: bool) -> None:
+        if self._on_message is None:
+            return
+        try:
+            self._on_message(addr, args, local)
+        except Exception as e:
+            logging.getLogger("stp-gateway").debug(f"X32: push handler failed for {addr}: {e}")
+
+    def _expect(self, keys: List[str]) -> None:
+        """Route replies for *keys* to a waiting query instead of on_message."""
+        with self._cond:
+            for k in keys:
+                self._waiting[k] = self._waiting.get(k, 0) + 1
+                self._replies.pop(k, None)
+
+    def _release(self, keys: List[str]) -> None:
+        """Stop waiting for *keys*; later messages for them are pushes again."""
+        with self._cond:
+            for k in keys:
+                n = self._waiting.get(k, 1) - 1
+                if n > 0:
+                    self._waiting[k] = n
+                else:
+                    self._waiting.pop(k, None)
+                    self._replies.pop(k, None)
+
+    def query(self, address: str) -> tuple:
+        """Send a query and return the reply args for that address (empty on timeout)."""
+        addr = address.rstrip()
+        self._expect([addr])
+        try:
+            self._raw_send(address)
+            deadline = time.time() + self._reply_timeout
+            with self._cond:
+                while addr not in self._replies:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        return ()
+                    self._cond.wait(remaining)
+                return self._replies.pop(addr)
+        finally:
+            self._release([addr])
+
+    def query_many(self, addresses: List[str], window: int = 32, retries: int = 2,
+                   on_window: Optional[Callable[[int, int], None]] = None) -> Dict[str, tuple]:
+        """Pipelined queries: send *window* at a time, match replies by address.
+
+        Addresses still unanswered after a window's timeout are re-queried
+        (up to *retries* more rounds).  Returns ``{address: reply args}``
+        keyed by the address without trailing whitespace; unanswered
+        addresses are absent.  Stats for the call are left in ``last_stats``.
+        *on_window(answered, total)* runs between windows, with nothing in
+        flight — the caller can hand the connection to someone else there.
+
+        Only the window in flight is claimed as replies: a push for an
+        address already answered (or not yet asked) still reaches
+        on_message during a long scan.
+        """
+        started = time.perf_counter()
+        todo: Dict[str, str] = {}
+        for a in addresses:
+            todo.setdefault(a.rstrip(), a)
+        keys = list(todo)
+        results: Dict[str, tuple] = {}
+        sent = 0
+        chunk: List[str] = []
+        try:
+            pending = keys
+            for attempt in range(retries + 1):
+                missed: List[str] = []
+                for i in range(0, len(pending), max(1, window)):
+                    chunk = pending[i:i + window]
+                    self._expect(chunk)
+                    for k in chunk:
+                        self._raw_send(todo[k])
+                    sent += len(chunk)
+                    deadline = time.time() + self._reply_timeout
+                    with self._cond:
+                        while True:
+                            waiting = [k for k in chunk if k not in self._replies]
+                            remaining = deadline - time.time()
+                            if not waiting or remaining <= 0:
+                                break
+                            self._cond.wait(remaining)
+                        for k in chunk:
+                            if k in self._replies:
+                                results[k] = self._replies.pop(k)
+                            else:
+                                missed.append(k)
+                    self._release(chunk)
+                    chunk = []
+                    if on_window is not None:
+                        on_window(len(results), len(keys))
+                if not missed:
+                    break
+                pending = missed
+        finally:
+            if chunk:
+                self._release(chunk)
+        self.last_stats = {
+            "queries": len(keys),
+            "sent": sent,
+            "requeried": sent - len(keys),
+            "missing": len(keys) - len(results),
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+        return results
+
+    def send(self, address: str, param: Any = None) -> None:
+        self._raw_send(address, param)
+        if param is not None:
+            # The mixer doesn't echo our own sets back; report them as local changes
+            args = tuple(param) if isinstance(param, list) else (param,)
+            self._dispatch(address.rstrip(), args, True)
+
+    def subscribe(self) -> None:
+        """(Re)arm /xremote; the mixer pushes changes for ~10 s after each call."""
+        self._raw_send("/xremote")
+
+    def subscribe_meters(self, bank: int) -> None:
+        """(Re)arm the /meters/<bank> stream; it also lapses after ~10 s."""
+        self._raw_send("/meters", f"/meters/{bank}")
+
+
+# =============================================================================
+# COMMAND LANE (mixer access, user commands first)
+# =============================================================================
+
+class CommandLane:
+    """Exclusive access to the mixer connection with two priorities.
+
+    User commands (``command()``) always go ahead of background work
+    (``background()``: ping, /xremote renewal, snapshots).  Long background
+    jobs call ``yield_to_commands()`` between chunks, which hands the
+    connection to any waiting command and takes it back afterwards.
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._busy = False
+        self._commands_waiting = 0
+
+    @property
+    def commands_waiting(self) -> int:
+        return self._commands_waiting
+
+    @contextmanager
+    def command(self) -> Iterator[float]:
+        """Hold the mixer for a user command; yields the seconds spent waiting."""
+        started = time.perf_counter()
+        with self._cond:
+            self._commands_waiting += 1
+            try:
+                while self._busy:
+                    self._cond.wait()
+            finally:
+                self._commands_waiting -= 1
+            self._busy = True
+        waited = time.perf_counter() - started
+        X32_COMMAND_WAIT.observe(waited)
+        try:
+            yield waited
+        finally:
+            self._release()
+
+    @contextmanager
+    def background(self) -> Iterator[None]:
+        """Hold the mixer for background work once no command is waiting."""
+        self._acquire_background()
+        try:
+            yield
+        finally:
+            self._release()
+
+    def yield_to_commands(self) -> bool:
+        """Inside ``background()``: let waiting commands run first.  True if any did."""
+        if not self._commands_waiting:
+            return False
+        self._release()
+        self._acquire_background()
+        return True
+
+    def _acquire_background(self) -> None:
+        with self._cond:
+            while self._busy or self._commands_waiting:
+                self._cond.wait()
+            self._busy = True
+
+    def _release(self) -> None:
+        with self._cond:
+            self._busy = False
+            self._cond.notify_all()
+
+
 # =============================================================================
 # HELPERS
 # =============================================================================
@@ -81,6 +338,109 @@ def _mute_str(v: Any) -> str:
     return "unmuted" if str(v) == "1" else "muted"
 
 
+def _vol_str(v: Any) -> str:
+    return str(int(float(v) * 100))
+
+
+_STRIP_PREFIX = {"ch": "ch{}", "auxin": "aux{}_", "bus": "bus{}_", "dca": "dca{}_"}
+_STRIP_RE = re.compile(r"^/(ch|auxin|bus|dca)/(\d+)/(mix/on|mix/fader|on|fader|config/name)$")
+_SCENE_NAME_RE = re.compile(r"^/-show/showfile/scene/(\d+)/name$")
+_SEND_RE = re.compile(r"^/(ch|auxin)/(\d+)/mix/(\d+)/level$")
+
+# (source type "ch"/"aux", source number, bus number)
+SendKey = Tuple[str, int, int]
+
+# X32 send levels move in 1/1023 steps; closer than this counts as unchanged
+_SEND_TOLERANCE = 0.001
+
+
+def send_address(ch_type: str, ch_id: int, bus_num: int) -> str:
+    """OSC address of one channel/aux-in → bus send level."""
+    root = "auxin" if ch_type == "aux" else "ch"
+    return f"/{root}/{_fmt_ch(ch_id)}/mix/{_fmt_ch(bus_num)}/level"
+
+
+def parse_send(address: str, args: tuple) -> Optional[Tuple[SendKey, float]]:
+    """``(send key, level)`` for a send-level message, else None."""
+    m = _SEND_RE.match(address)
+    if not m or not args:
+        return None
+    ch_type = "aux" if m.group(1) == "auxin" else "ch"
+    return (ch_type, int(m.group(2)), int(m.group(3))), float(args[0])
+
+
+def osc_to_snapshot(address: str, args: tuple) -> Tuple[Dict[str, str], bool]:
+    """Map one OSC parameter message onto snapshot keys.
+
+    Returns ``(updates, scene_changed)``; unknown addresses give ``({}, False)``.
+    """
+    if not args:
+        return {}, False
+    value = args[0]
+    if address in ("/-show/prepos/current", "/-action/goscene"):
+        return {"cur_scene": str(int(value))}, True
+    m = _SCENE_NAME_RE.match(address)
+    if m:
+        return {f"scene{int(m.group(1))}name": str(value)}, False
+    m = _STRIP_RE.match(address)
+    if not m:
+        return {}, False
+    kind, num, param = m.group(1), int(m.group(2)), m.group(3)
+    # Snapshot keys: ch1mutestatus / ch1vol / ch1name, aux1_mutestatus / aux1vol / aux1_name, ...
+    prefix = _STRIP_PREFIX[kind].format(num)
+    vol_prefix = prefix.rstrip("_")
+    if param in ("mix/on", "on"):
+        return {f"{prefix}mutestatus": _mute_str(value)}, False
+    if param in ("mix/fader", "fader"):
+        return {f"{vol_prefix}vol": _vol_str(value)}, False
+    return {f"{prefix}name": str(value)}, False
+
+
+# Meter banks streamed to tablets: /meters/N -> leading values kept.
+# /meters/1 is 32 input channels, then gate and dynamics gain reduction;
+# /meters/2 is 16 mix buses, 6 matrices, main L/R and mono, then GR
+METER_BANKS = {1: 32, 2: 25}
+# How long one /xremote keeps the mixer pushing changes
+_XREMOTE_SECONDS = 10.0
+
+_METERS_RE = re.compile(r"^/meters/(\d+)$")
+
+
+def decode_meter_blob(blob: bytes) -> List[float]:
+    """Float levels (1.0 = 0 dBFS) from a /meters blob.
+
+    The blob is a little-endian int32 count followed by that many
+    little-endian float32 values.
+    """
+    if not isinstance(blob, (bytes, bytearray)) or len(blob) < 4:
+        return []
+    (count,) = struct.unpack_from("<i", blob, 0)
+    count = max(0, min(count, (len(blob) - 4) // 4))
+    return list(struct.unpack_from(f"<{count}f", blob, 4))
+
+
+def _meter_byte(level: float) -> int:
+    """Level as half-dB steps above -90 dBFS (0 = silence, 180 = 0 dBFS)."""
+    if level <= 0:
+        return 0
+    db = 20 * math.log10(level)
+    return max(0, min(255, int(round((db + 90) * 2))))
+
+
+def pack_meter_frame(banks: Dict[int, List[float]]) -> bytes:
+    """Pack meter banks for tablets.
+
+    Layout: version (1), bank count, then per bank its number, its value
+    count and one byte per value (see _meter_byte).  Byte b is b/2 - 90 dB.
+    """
+    out = bytearray((1, len(banks)))
+    for bank in sorted(banks):
+        values = banks[bank]
+        out += bytes((bank, len(values)))
+        out += bytes(_meter_byte(v) for v in values)
+    return bytes(out)
+
+
 # =============================================================================
 # X32 POLLER
 # =============================================================================
@@ -90,6 +450,8 @@ class X32Poller:
     Background poller:
       - PING determines online/offline (with fail-streak gating)
       - SNAPSHOT refreshes cached data (but does not flip offline by itself)
+      - PUSH (optional) keeps /xremote armed and patches the snapshot from
+        pushed changes; snapshots then become a slow safety sweep
     """
 
     def __init__(self, mixer_type: str, ip: str, logger: logging.Logger,
@@ -97,41 +459,151 @@ class X32Poller:
                  snapshot_seconds: float = 6.0,
                  offline_after_seconds: float = 8.0,
                  ping_fails_to_offline: int = 3,
-                 routing_buses: Optional[set] = None) -> None:
-        self._lock = threading.Lock()
+                 routing_buses: Optional[set] = None,
+                 push: bool = True,
+                 push_renew_seconds: float = 8.0,
+                 push_sweep_seconds: float = 60.0,
+                 query_window: int = 32,
+                 cold_seconds: float = 600.0,
+                 port: Optional[int] = None) -> None:
+        self._lane = CommandLane()
         self._logger = logger
-        self._owner = MixerOwner(mixer_type, ip, logger)
+        self._owner = MixerOwner(mixer_type, ip, logger, on_message=self._on_message, port=port)
 
         self._online: bool = False
         self._last_ok_ts: float = 0.0
         self._last_error: str = ""
 
-        self._snapshot: Optional[Dict[str, Any]] = None
-        self._snapshot_ts: float = 0.0
+        # (frozen snapshot, built-at) — replaced as one tuple so readers
+        # never see a snapshot paired with another one's timestamp
+        self._snapshot: Tuple[Optional[FrozenDict], float] = (None, 0.0)
 
         self._ping_fail_streak: int = 0
         self._ping_seconds = ping_seconds
         self._snapshot_seconds = snapshot_seconds
+        self._idle_snapshot_seconds: Optional[float] = None  # set while no tablet watches
         self._offline_after_seconds = offline_after_seconds
         self._ping_fails_to_offline = ping_fails_to_offline
         self._routing_buses = routing_buses or set()
 
+        self._query_window = query_window
+        # Names and the scene list: refreshed every cold_seconds, or on the
+        # next snapshot after a scene recall or reconnect
+        self._cold_seconds = cold_seconds
+        self._cold_wanted = True
+        self._last_cold = 0.0
+        self._snapshot_stats: Dict[str, Any] = {}
+        self._snapshot_progress: Optional[Dict[str, int]] = None  # set while a scan runs
+        self._push = push
+        self._push_renew_seconds = push_renew_seconds
+        self._push_sweep_seconds = push_sweep_seconds
+        self._push_active = False
+        self._last_push_at = 0.0  # when the mixer last pushed a change to us
+        # Told about fader moves made on the console (address, position)
+        # and about scene recalls, which move every fader at once
+        self.on_fader: Optional[Callable[[str, float], None]] = None
+        self.on_scene: Optional[Callable[[], None]] = None
+        self._patch_lock = threading.Lock()
+        # Pushed changes seen while a full snapshot is being built; re-applied
+        # on top of it so a console move mid-scan isn't lost
+        self._scan_patches: Optional[Dict[str, str]] = None
+        # Channel → bus send levels: {(type, id, bus): (level, read-at)}.
+        # Filled by full scans and on demand, patched by pushes and our own
+        # sets; pushes seen during a scan win over the scan's replies
+        self._sends: Dict[SendKey, Tuple[float, float]] = {}
+        self._scan_sends: Optional[set] = None
+        # Latest decoded /meters blob per bank and a sequence number; the
+        # packed frame is built once per sequence however many tablets read it
+        self._meters: Dict[int, List[float]] = {}
+        self._meters_seq = 0
+        self._meter_frame: Tuple[int, bytes] = (0, b"")
+        self._listeners: List[Callable[[], None]] = []
+
         self._stop = threading.Event()
+        self._snapshot_wanted = threading.Event()
         self._thread = threading.Thread(target=self._run, daemon=True)
 
     def start(self) -> None:
         self._thread.start()
 
+    def set_idle(self, idle_seconds: Optional[float]) -> None:
+        """Slow snapshots to *idle_seconds*; None restores full rate immediately."""
+        was_idle = self._idle_snapshot_seconds is not None
+        self._idle_snapshot_seconds = idle_seconds
+        if was_idle and idle_seconds is None:
+            self._snapshot_wanted.set()
+
+    def add_listener(self, fn: Callable[[], None]) -> None:
+        """Call *fn()* whenever the snapshot changes (push patch or rescan)."""
+        self._listeners.append(fn)
+
+    @property
+    def push_active(self) -> bool:
+        return self._push_active
+
+    @property
+    def snapshot_stats(self) -> Dict[str, Any]:
+        """Last snapshot: queries, re-queries, missing replies, yields, duration_ms."""
+        return self._snapshot_stats
+
+    @property
+    def snapshot_progress(self) -> Optional[Dict[str, int]]:
+        """``{answered, total}`` for the scan in progress, None when idle."""
+        return self._snapshot_progress
+
     def online(self) -> Tuple[bool, float, str]:
         last_ok = self._last_ok_ts
         age_ok = (time.time() - last_ok) if last_ok else float("inf")
         return self._online, age_ok, self._last_error
 
-    def snapshot(self) -> Tuple[Optional[Dict[str, Any]], float, bool, str]:
-        with self._lock:
-            snap_ts = self._snapshot_ts
-            snap_age = (time.time() - snap_ts) if snap_ts else float("inf")
-            return copy.deepcopy(self._snapshot), snap_age, self._online, self._last_error
+    def snapshot(self) -> Tuple[Optional[FrozenDict], float, bool, str]:
+        """Return the latest immutable snapshot by reference (lock-free)."""
+        snap, snap_ts = self._snapshot
+        snap_age = (time.time() - snap_ts) if snap_ts else float("inf")
+        return snap, snap_age, self._online, self._last_error
+
+    def send_levels(self, keys: List[SendKey],
+                    max_age: float) -> Tuple[Dict[SendKey, float], List[SendKey]]:
+        """Cached send levels for *keys*, plus the keys that need a fresh query.
+
+        While push updates are flowing every cached level is current; otherwise
+        levels older than *max_age* seconds count as stale.  /xremote is sent
+        without any reply, so "flowing" means a push actually arrived within
+        the subscription's lifetime, not just that we asked for one.
+        """
+        now = time.time()
+        trust = self._push_active and now - self._last_push_at <= _XREMOTE_SECONDS
+        levels: Dict[SendKey, float] = {}
+        stale: List[SendKey] = []
+        sends = self._sends
+        for key in keys:
+            entry = sends.get(key)
+            if entry is not None and (trust or now - entry[1] <= max_age):
+                levels[key] = entry[0]
+            else:
+                stale.append(key)
+        return levels, stale
+
+    def refresh_sends(self, m, keys: List[SendKey]) -> Dict[SendKey, float]:
+        """Query *keys* in one pipelined pass and cache the replies.
+
+        Runs inside ``command()`` (*m* is the mixer it hands over).
+        Unanswered sends are left out of the result.
+        """
+        addresses = {send_address(*k): k for k in keys}
+        tap = self._owner.tap
+        if tap is not None:
+            replies = tap.query_many(list(addresses), window=self._query_window)
+        else:
+            replies = {a: m.query(a) for a in addresses}
+        levels = self._send_replies(addresses, replies)
+        self._store_sends(levels)
+        return levels
+
+    def invalidate_sends(self) -> None:
+        """Forget cached send levels (next read queries the mixer)."""
+        with self._patch_lock:
+            self._sends = {}
 
     def command(self, func: Callable[[Any], Any]) -> Tuple[Optional[Any], Optional[str]]:
         """Execute a command against the mixer.
@@ -140,12 +612,14 @@ class X32Poller:
         the mixer offline.  This prevents a single dropped UDP packet or
         momentary network glitch from taking down the whole mixer session.
         """
-        with self._lock:
+        with self._lane.command():
+            started = time.perf_counter()
             last_err = None
             for attempt in range(2):  # attempt 0 = first try, 1 = retry
                 try:
                     m = self._owner.require()
                     res = func(m)
+                    record_command("x32", started, True)
                     return res, None
                 except Exception as e:
                     last_err = e
@@ -158,12 +632,141 @@ class X32Poller:
                         time.sleep(0.5)
                         continue
             # Both attempts failed — flip offline
+            record_command("x32", started, False)
             self._online = False
             self._last_error = str(last_err)
             self._ping_fail_streak = self._ping_fails_to_offline
             self._owner.disconnect()
             return None, str(last_err)
 
+    # -------------------
+    # Push patches
+    # -------------------
+
+    def _on_message(self, address: str, args: tuple, local: bool) -> None:
+        """Apply one pushed (or locally sent) parameter change to the snapshot.
+
+        Runs on the OSC server thread (pushes) or the caller's thread
+        (*local* sets, which the mixer never echoes back to us).
+        """
+        m = _METERS_RE.match(address)
+        if m:
+            self._on_meters(int(m.group(1)), args)
+            return
+        if not local:
+            self._last_push_at = time.time()
+        try:
+            send = parse_send(address, args)
+            if send is not None:
+                self._patch_send(*send)
+                return
+            updates, scene_changed = osc_to_snapshot(address, args)
+            if not local and self.on_fader is not None and address in _FADER_KEYS:
+                self.on_fader(address, float(args[0]))
+        except (TypeError, ValueError):
+            return
+        if scene_changed:
+            # A recall rewrites names and most of the console — full rescan
+            self._cold_wanted = True
+            self.invalidate_sends()
+            if self.on_scene is not None:
+                self.on_scene()
+            self._snapshot_wanted.set()
+        if updates:
+            self._apply_patch(updates)
+
+    def _apply_patch(self, updates: Dict[str, str]) -> None:
+        with self._patch_lock:
+            if self._scan_patches is not None:
+                self._scan_patches.update(updates)
+            snap, _ = self._snapshot
+            if snap is None:
+                return
+            merged = dict(snap)
+            merged.update(updates)
+            self._fix_cur_scene_name(merged)
+            if merged == snap:
+                return
+            self._snapshot = (freeze(merged), time.time())
+        self._notify()
+
+    def _on_meters(self, bank: int, args: tuple) -> None:
+        keep = METER_BANKS.get(bank)
+        if keep is None or not args:
+            return
+        values = decode_meter_blob(args[0])
+        if values:
+            self._meters[bank] = values[:keep]
+            self._meters_seq += 1
+
+    def renew_meters(self) -> bool:
+        """(Re)subscribe to every meter bank; False if the mixer isn't reachable.
+
+        Deliberately outside the command lane: each renewal is a lone UDP
+        send that expects no reply, and waiting behind a snapshot scan
+        would let the stream lapse mid-scan.
+        """
+        if not self._online:
+            return False
+        tap = self._owner.tap
+        if tap is None:
+            return False
+        try:
+            for bank in sorted(METER_BANKS):
+                tap.subscribe_meters(bank)
+        except Exception as e:
+            self._logger.debug(f"X32: /meters renew failed: {e}")
+            return False
+        return True
+
+    def meter_frame(self) -> Tuple[int, bytes]:
+        """``(sequence, packed frame)`` for the latest meters; sequence 0 = none yet."""
+        seq = self._meters_seq
+        cached = self._meter_frame
+        if cached[0] != seq:
+            cached = (seq, pack_meter_frame(dict(self._meters)))
+            self._meter_frame = cached
+        return cached
+
+    def _patch_send(self, key: SendKey, level: float) -> None:
+        with self._patch_lock:
+            self._sends[key] = (level, time.time())
+            if self._scan_sends is not None:
+                self._scan_sends.add(key)
+
+    def _store_sends(self, levels: Dict[SendKey, float], from_scan: bool = False) -> None:
+        now = time.time()
+        with self._patch_lock:
+            skip = self._scan_sends if from_scan and self._scan_sends else ()
+            for key, level in levels.items():
+                if key not in skip:
+                    self._sends[key] = (level, now)
+
+    @staticmethod
+    def _send_replies(keys: Dict[str, SendKey], replies: Dict[str, tuple]) -> Dict[SendKey, float]:
+        levels: Dict[SendKey, float] = {}
+        for addr, key in keys.items():
+            reply = replies.get(addr)
+            if reply:
+                try:
+                    levels[key] = float(reply[0])
+                except (TypeError, ValueError):
+                    pass
+        return levels
+
+    @staticmethod
+    def _fix_cur_scene_name(snap: Dict[str, Any]) -> None:
+        name = snap.get(f"scene{snap.get('cur_scene')}name")
+        if name is not None:
+            snap["cur_scene_name"] = name
+
+    def _notify(self) -> None:
+        for fn in self._listeners:
+            try:
+                fn()
+            except Exception as e:
+                self._logger.debug(f"X32: snapshot listener failed: {e}")
+
     # -------------------
     # Poll internals
     # -------------------
@@ -181,7 +784,39 @@ class X32Poller:
         if n < 0 or n > 999:
             raise RuntimeError(f"cur_scene out of range: {n}")
 
+    def _snapshot_plan(self, cur_scene: int) -> List[Tuple[str, str, Callable[[Any], Any], str, bool]]:
+        """(snapshot key, OSC address, converter, default, cold) for every field.
+
+        Cold fields (strip names, the scene list) only change when the show
+        file is edited or a scene is recalled, so they are re-queried on a
+        long interval; hot fields (mutes, faders) on every snapshot.
+        """
+        plan: List[Tuple[str, str, Callable[[Any], Any], str, bool]] = []
+        if not 0 <= cur_scene < 26:
+            # Outside the scene list, so it can't be taken from scene{n}name
+            plan.append(("cur_scene_name", f"/-show/showfile/scene/{cur_scene:03d}/name ", str, "", False))
+        strips = (
+            # (key prefix, vol prefix, address root, count, mute/fader path)
+            ("ch{}", "ch{}", "/ch/{:02d}", 32, "mix/"),
+            ("aux{}_", "aux{}", "/auxin/{:02d}", 8, "mix/"),
+            ("bus{}_", "bus{}", "/bus/{:02d}", 16, "mix/"),
+            ("dca{}_", "dca{}", "/dca/{}", 8, ""),
+        )
+        for key_fmt, vol_fmt, addr_fmt, count, mix in strips:
+            for i in range(1, count + 1):
+                key, vol_key, root = key_fmt.format(i), vol_fmt.format(i), addr_fmt.format(i)
+                plan.append((f"{key}mutestatus", f"{root}/{mix}on", _mute_str, "unknown", False))
+                plan.append((f"{key}name", f"{root}/config/name", str, "", True))
+                plan.append((f"{vol_key}vol", f"{root}/{mix}fader", _vol_str, "", False))
+        for i in range(26):
+            plan.append((f"scene{i}name", f"/-show/showfile/scene/{i:03d}/name ", str, "", True))
+        return plan
+
     def _build_snapshot(self, m) -> Dict[str, Any]:
+        started = time.perf_counter()
+        prev = self._snapshot[0]
+        cold = (self._cold_wanted or prev is None
+                or time.time() - self._last_cold >= self._cold_seconds)
         snap: Dict[str, Any] = {}
 
         # Current scene
@@ -192,105 +827,71 @@ class X32Poller:
         if isinstance(cur_raw, bytes):
             cur_raw = cur_raw.decode(errors="ignore")
         cur_scene = int(str(cur_raw).strip())
-
         snap["cur_scene"] = str(cur_scene)
-        try:
-            snap["cur_scene_name"] = m.query(f"/-show/showfile/scene/{cur_scene:03d}/name ")[0]
-        except Exception as e:
-            self._logger.debug(f"X32 snapshot: cur_scene_name query failed: {e}")
-            snap["cur_scene_name"] = ""
-
-        # Channels 1-32
-        for i in range(1, 33):
-            ch = _fmt_ch(i)
-            try:
-                mute_val = m.query(f"/ch/{ch}/mix/on")[0]
-                snap[f"ch{i}mutestatus"] = _mute_str(mute_val)
-            except Exception as e:
-                self._logger.debug(f"X32 snapshot: ch{i} mute query failed: {e}")
-                snap[f"ch{i}mutestatus"] = "unknown"
+        snap["cur_scene_name"] = ""
+
+        # Everything else in one pipelined pass (replies matched by address);
+        # cold fields carry over from the previous snapshot between refreshes
+        plan = self._snapshot_plan(cur_scene)
+        wanted = [addr for _, addr, _, _, is_cold in plan if cold or not is_cold]
+        # Routing send levels ride along with full scans (after a recall they
+        # have all changed); in between, pushes and our own sets keep them
+        send_keys: Dict[str, SendKey] = {}
+        if cold:
+            for bus in sorted(self._routing_buses):
+                for ch_type, count in (("ch", 32), ("aux", 8)):
+                    for i in range(1, count + 1):
+                        send_keys[send_address(ch_type, i, bus)] = (ch_type, i, bus)
+            wanted.extend(send_keys)
+        tap = self._owner.tap
+        if tap is not None:
+            yields = 0
+
+            def between_windows(answered: int, total: int) -> None:
+                nonlocal yields
+                self._snapshot_progress = {"answered": answered, "total": total}
+                X32_SNAPSHOT_PROGRESS.set(answered / total if total else 1.0)
+                # A tablet's mute/volume press goes ahead of the rest of the scan
+                if self._lane.yield_to_commands():
+                    yields += 1
+                    X32_SNAPSHOT_YIELDS.inc()
+
+            self._snapshot_progress = {"answered": 0, "total": len(wanted)}
+            X32_SNAPSHOT_PROGRESS.set(0.0)
             try:
-                snap[f"ch{i}name"] = m.strip[i - 1].config.name
-            except Exception as e:
-                self._logger.debug(f"X32 snapshot: ch{i} name query failed: {e}")
-                snap[f"ch{i}name"] = ""
-            try:
-                vol = float(m.query(f"/ch/{ch}/mix/fader")[0])
-                snap[f"ch{i}vol"] = str(int(vol * 100))
-            except Exception as e:
-                self._logger.debug(f"X32 snapshot: ch{i} vol query failed: {e}")
-                snap[f"ch{i}vol"] = ""
-
-        # Aux 1-8
-        for i in range(1, 9):
-            ax = _fmt_ch(i)
-            try:
-                mute_val = m.query(f"/auxin/{ax}/mix/on")[0]
-                snap[f"aux{i}_mutestatus"] = _mute_str(mute_val)
-            except Exception as e:
-                self._logger.debug(f"X32 snapshot: aux{i} mute query failed: {e}")
-                snap[f"aux{i}_mutestatus"] = "unknown"
-            try:
-                snap[f"aux{i}_name"] = m.auxin[i - 1].config.name
-            except Exception as e:
-                self._logger.debug(f"X32 snapshot: aux{i} name query failed: {e}")
-                snap[f"aux{i}_name"] = ""
-            try:
-                vol = float(m.query(f"/auxin/{ax}/mix/fader")[0])
-                snap[f"aux{i}vol"] = str(int(vol * 100))
-            except Exception as e:
-                self._logger.debug(f"X32 snapshot: aux{i} vol query failed: {e}")
-                snap[f"aux{i}vol"] = ""
-
-        # Buses 1-16
-        for i in range(1, 17):
-            bx = _fmt_ch(i)
-            try:
-                mute_val = m.query(f"/bus/{bx}/mix/on")[0]
-                snap[f"bus{i}_mutestatus"] = _mute_str(mute_val)
-            except Exception as e:
-                self._logger.debug(f"X32 snapshot: bus{i} mute query failed: {e}")
-                snap[f"bus{i}_mutestatus"] = "unknown"
-            try:
-                snap[f"bus{i}_name"] = m.bus[i - 1].config.name
-            except Exception as e:
-                self._logger.debug(f"X32 snapshot: bus{i} name query failed: {e}")
-                snap[f"bus{i}_name"] = ""
-            try:
-                vol = float(m.query(f"/bus/{bx}/mix/fader")[0])
-                snap[f"bus{i}vol"] = str(int(vol * 100))
-            except Exception as e:
-                self._logger.debug(f"X32 snapshot: bus{i} vol query failed: {e}")
-                snap[f"bus{i}vol"] = ""
-
-        # DCAs 1-8
-        for i in range(1, 9):
-            try:
-                mute_val = m.query(f"/dca/{i}/on")[0]
-                snap[f"dca{i}_mutestatus"] = _mute_str(mute_val)
-            except Exception as e:
-                self._logger.debug(f"X32 snapshot: dca{i} mute query failed: {e}")
-                snap[f"dca{i}_mutestatus"] = "unknown"
-            try:
-                snap[f"dca{i}_name"] = m.dca[i - 1].config.name
-            except Exception as e:
-                self._logger.debug(f"X32 snapshot: dca{i} name query failed: {e}")
-                snap[f"dca{i}_name"] = ""
-            try:
-                vol = float(m.query(f"/dca/{i}/fader")[0])
-                snap[f"dca{i}vol"] = str(int(vol * 100))
-            except Exception as e:
-                self._logger.debug(f"X32 snapshot: dca{i} vol query failed: {e}")
-                snap[f"dca{i}vol"] = ""
-
-        # Scene names 0-25
-        for i in range(26):
+                replies = tap.query_many(wanted, window=self._query_window,
+                                         on_window=between_windows)
+            finally:
+                self._snapshot_progress = None
+            stats = dict(tap.last_stats)
+            stats["yields"] = yields
+        else:
+            replies = {addr.rstrip(): m.query(addr) for addr in wanted}
+            stats = {"queries": len(wanted)}
+        for key, addr, convert, default, is_cold in plan:
+            if is_cold and not cold:
+                snap[key] = prev.get(key, default)
+                continue
+            reply = replies.get(addr.rstrip())
             try:
-                snap[f"scene{i}name"] = m.query(f"/-show/showfile/scene/{i:03d}/name ")[0]
+                snap[key] = convert(reply[0]) if reply else default
             except Exception as e:
-                self._logger.debug(f"X32 snapshot: scene{i} name query failed: {e}")
-                snap[f"scene{i}name"] = ""
-
+                self._logger.debug(f"X32 snapshot: {key} ({addr.strip()}) unusable: {e}")
+                snap[key] = default
+        self._fix_cur_scene_name(snap)
+        levels = self._send_replies(send_keys, replies)
+        if levels:
+            self._store_sends(levels, from_scan=True)
+
+        if cold:
+            self._cold_wanted = False
+            self._last_cold = time.time()
+        stats["tier"] = "full" if cold else "hot"
+        stats["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        self._snapshot_stats = stats
+        X32_SNAPSHOT.observe(stats["duration_ms"] / 1000, tier=stats["tier"])
+        if stats.get("missing"):
+            self._logger.debug(f"X32 snapshot: {stats['missing']} of {stats['queries']} queries unanswered")
         return snap
 
     def _run(self) -> None:
@@ -298,6 +899,7 @@ class X32Poller:
         time.sleep(0.25)
 
         last_snapshot_attempt = 0.0
+        last_renew = 0.0
         last_warn_log = 0.0
         _reconnect_backoff = 0.0  # extra delay after repeated connect failures
 
@@ -309,6 +911,7 @@ class X32Poller:
                 try:
                     self._owner.connect()
                     _reconnect_backoff = 0.0  # reset on success
+                    self._cold_wanted = True  # show file may have changed meanwhile
                 except Exception as e:
                     self._ping_fail_streak += 1
                     self._last_error = f"connect failed ({self._ping_fail_streak}): {e}"
@@ -322,7 +925,7 @@ class X32Poller:
                     continue
 
             # ---- 1) PING determines online/offline ----
-            with self._lock:
+            with self._lane.background():
                 try:
                     m = self._owner.mixer
                     if m is None:
@@ -345,30 +948,298 @@ class X32Poller:
             if self._last_ok_ts and (time.time() - self._last_ok_ts) > self._offline_after_seconds:
                 self._online = False
 
-            # ---- 2) SNAPSHOT refresh (only if online and due) ----
+            # ---- 2) PUSH subscription renewal ----
             now = time.time()
-            if now - last_snapshot_attempt >= self._snapshot_seconds:
+            if self._push and self._online:
+                if now - last_renew >= self._push_renew_seconds:
+                    with self._lane.background():
+                        tap = self._owner.tap
+                        if tap is not None:
+                            try:
+                                tap.subscribe()
+                                last_renew = now
+                                if not self._push_active:
+                                    self._logger.info("X32: /xremote push updates active")
+                                self._push_active = True
+                            except Exception as e:
+                                self._logger.debug(f"X32: /xremote renew failed: {e}")
+                                self._push_active = False
+            elif self._push_active:
+                # Connection lost: the subscription lapses with it, and the
+                # snapshot may have missed changes — rescan once back online
+                self._push_active = False
+                last_renew = 0.0
+                self._cold_wanted = True
+                self._snapshot_wanted.set()
+
+            # ---- 3) SNAPSHOT refresh (only if online and due) ----
+            # Pushed changes keep the snapshot current, so full scans drop to
+            # a safety sweep (at startup, on scene change, and every sweep)
+            snapshot_every = self._push_sweep_seconds if self._push_active else self._snapshot_seconds
+            if self._idle_snapshot_seconds:
+                snapshot_every = max(snapshot_every, self._idle_snapshot_seconds)
+            if (self._snapshot_wanted.is_set()
+                    or now - last_snapshot_attempt >= snapshot_every):
+                self._snapshot_wanted.clear()
                 last_snapshot_attempt = now
-                with self._lock:
+                with self._lane.background():
                     if self._online:
+                        with self._patch_lock:
+                            self._scan_patches = {}
+                            self._scan_sends = set()
                         try:
                             m = self._owner.mixer
                             if m is None:
                                 raise RuntimeError("mixer not connected")
                             snap = self._build_snapshot(m)
-                            self._snapshot = snap
-                            self._snapshot_ts = time.time()
+                            with self._patch_lock:
+                                snap.update(self._scan_patches)
+                                self._fix_cur_scene_name(snap)
+                                self._snapshot = (freeze(snap), time.time())
+                            self._notify()
                         except Exception as e:
                             self._last_error = f"snapshot failed: {e}"
                             if now - last_warn_log >= 10.0:
                                 last_warn_log = now
                                 self._logger.warning(f"X32: {self._last_error}")
+                        finally:
+                            with self._patch_lock:
+                                self._scan_patches = None
+                                self._scan_sends = None
 
             elapsed = time.time() - start
             sleep_for = max(0.2, self._ping_seconds - elapsed)
             self._stop.wait(timeout=sleep_for)
 
 
+# =============================================================================
+# FADER ENGINE (coalesced sets and timed fades)
+# =============================================================================
+
+# ("ch" | "aux" | "bus" | "dca", strip number)
+FaderKey = Tuple[str, int]
+
+FADER_STRIPS = {"ch": 32, "aux": 8, "bus": 16, "dca": 8}
+
+# One X32 fader step; moves smaller than half of one aren't worth a packet
+_FADER_STEP = 1.0 / 1023
+
+
+def fader_address(strip: str, num: int) -> str:
+    if strip == "dca":
+        return f"/dca/{num}/fader"
+    root = "auxin" if strip == "aux" else strip
+    return f"/{root}/{_fmt_ch(num)}/mix/fader"
+
+
+def mute_address(strip: str, num: int) -> str:
+    if strip == "dca":
+        return f"/dca/{num}/on"
+    root = "auxin" if strip == "aux" else strip
+    return f"/{root}/{_fmt_ch(num)}/mix/on"
+
+
+def db_to_fader(db: float) -> float:
+    """X32 fader position (0.0-1.0) for a level in dB (+10 max, -90 = off)."""
+    if db >= -10:
+        f = (db + 30) / 40
+    elif db >= -30:
+        f = (db + 50) / 80
+    elif db >= -60:
+        f = (db + 70) / 160
+    else:
+        f = (db + 90) / 480
+    return min(1.0, max(0.0, f))
+
+
+def fader_to_db(f: float) -> float:
+    """Inverse of db_to_fader(); 0.0 gives -90 (off)."""
+    if f >= 0.5:
+        return f * 40 - 30
+    if f >= 0.25:
+        return f * 80 - 50
+    if f >= 0.0625:
+        return f * 160 - 70
+    return f * 480 - 90
+
+
+# fader address -> (strip, num)
+_FADER_KEYS: Dict[str, FaderKey] = {
+    fader_address(strip, n): (strip, n)
+    for strip, count in FADER_STRIPS.items() for n in range(1, count + 1)
+}
+
+
+class FaderEngine:
+    """Sends fader moves at a fixed rate; the latest target wins.
+
+    ``set()`` only records where a fader should go.  Once per tick the
+    engine thread sends whatever changed, all inside one ``command()``
+    hold, so a slider drag costs at most *rate_hz* sets per fader per
+    second however fast the tablet posts.  ``ramp()`` moves a fader to a
+    target over a duration, one interpolated step per tick.
+    """
+
+    def __init__(self, command: Callable[[Callable[[Any], Any]], Tuple[Any, Optional[str]]],
+                 logger: logging.Logger, rate_hz: float = 40.0) -> None:
+        self._command = command
+        self._logger = logger
+        self._interval = 1.0 / min(100.0, max(1.0, rate_hz))
+        self._cond = threading.Condition()
+        self._targets: Dict[FaderKey, float] = {}
+        # key -> (from, to, started, seconds)
+        self._ramps: Dict[FaderKey, Tuple[float, float, float, float]] = {}
+        # Last known position per fader (sent by us or pushed by the console)
+        # and when it was learned, wall-clock so it compares with snapshots
+        self._sent: Dict[FaderKey, float] = {}
+        self._sent_at: Dict[FaderKey, float] = {}
+        # Moves that a failed tick dropped, reported on the next set of that fader
+        self._errors: Dict[FaderKey, str] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.last_error = ""
+        self.failures = 0  # bumped each time a failed tick cancels everything
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+
+    def set(self, key: FaderKey, value: float) -> None:
+        """Move *key* to *value* on the next tick (cancels a running fade)."""
+        with self._cond:
+            if key in self._targets:
+                X32_FADER_COALESCED.inc()
+            self._ramps.pop(key, None)
+            self._targets[key] = value
+            self._cond.notify_all()
+
+    def ramp(self, key: FaderKey, start: float, target: float, seconds: float) -> None:
+        """Fade *key* from *start* to *target* over *seconds*."""
+        with self._cond:
+            self._targets.pop(key, None)
+            self._ramps[key] = (start, target, time.monotonic(), max(0.0, seconds))
+            self._cond.notify_all()
+
+    def cancel(self, key: FaderKey) -> None:
+        """Drop anything pending for *key* and forget its position
+        (someone else is about to set it directly)."""
+        with self._cond:
+            self._targets.pop(key, None)
+            self._ramps.pop(key, None)
+            self._sent.pop(key, None)
+            self._sent_at.pop(key, None)
+            self._cond.notify_all()
+
+    def observe(self, key: FaderKey, value: float) -> None:
+        """The console reported *key* at *value* (someone moved it there)."""
+        with self._cond:
+            self._sent[key] = value
+            self._sent_at[key] = time.time()
+
+    def forget_all(self) -> None:
+        """Drop every known position (a scene recall just moved the faders)."""
+        with self._cond:
+            self._sent.clear()
+            self._sent_at.clear()
+
+    def position(self, key: FaderKey) -> Tuple[Optional[float], float]:
+        """Last known value for *key* and when it was learned (None, 0.0 if never)."""
+        with self._cond:
+            return self._sent.get(key), self._sent_at.get(key, 0.0)
+
+    def take_error(self, key: FaderKey) -> Optional[str]:
+        """Why the last queued move for *key* never reached the mixer, once."""
+        with self._cond:
+            return self._errors.pop(key, None)
+
+    def busy(self, key: FaderKey) -> bool:
+        with self._cond:
+            return key in self._targets or key in self._ramps
+
+    def active(self) -> int:
+        with self._cond:
+            return len(self._targets) + len(self._ramps)
+
+    def wait(self, key: FaderKey, timeout: float) -> bool:
+        """Block until *key* has nothing pending; False on timeout."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while key in self._targets or key in self._ramps:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def _due(self, now: float) -> Dict[FaderKey, float]:
+        """Values to send this tick; finished fades and sets are dropped.
+
+        Explicit sets always go out: the last known position can be stale
+        (a scene recall, a console move we never heard about).  Only fade
+        steps too small to move the fader are skipped.
+        """
+        due = dict(self._targets)
+        self._targets.clear()
+        for key, (start, end, started, seconds) in list(self._ramps.items()):
+            frac = 1.0 if seconds <= 0 else min(1.0, (now - started) / seconds)
+            value = start + (end - start) * frac
+            if frac >= 1.0:
+                del self._ramps[key]
+            if key not in self._sent or abs(self._sent[key] - value) >= _FADER_STEP / 2:
+                due[key] = value
+        return due
+
+    def tick(self, now: Optional[float] = None) -> int:
+        """Send everything due now in one command; returns the number of sets."""
+        with self._cond:
+            due = self._due(time.monotonic() if now is None else now)
+        if due:
+            def do(m):
+                for (strip, num), value in due.items():
+                    m.send(fader_address(strip, num), float(value))
+
+            _, err = self._command(do)
+            if err:
+                # Don't keep hammering a mixer that just dropped off
+                self.last_error = err
+                self.failures += 1
+                self._logger.warning(f"X32: fader update failed ({err}); pending fades cancelled")
+                with self._cond:
+                    for key in set(due) | set(self._targets) | set(self._ramps):
+                        self._errors[key] = err
+                    self._targets.clear()
+                    self._ramps.clear()
+            else:
+                sent_at = time.time()
+                with self._cond:
+                    self._sent.update(due)
+                    self._sent_at.update(dict.fromkeys(due, sent_at))
+                X32_FADER_SENDS.inc(len(due))
+        with self._cond:
+            self._cond.notify_all()
+        return len(due)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            with self._cond:
+                while not (self._targets or self._ramps) and not self._stop.is_set():
+                    self._cond.wait()
+            if self._stop.is_set():
+                return
+            started = time.monotonic()
+            try:
+                self.tick()
+            except Exception as e:
+                self._logger.debug(f"X32: fader tick failed: {e}")
+            self._stop.wait(max(0.0, self._interval - (time.monotonic() - started)))
+
+
 # =============================================================================
 # X32 MODULE (public interface for the gateway)
 # =============================================================================
@@ -389,8 +1260,8 @@ class X32Module:
         self._mixer_type = cfg.get("mixer_type", "X32")
         self._routing_cfg = cfg.get("routing", {})
         self._routing_buses = self._collect_routing_buses()
-        self._routing_cache: Optional[dict] = None
-        self._routing_cache_ts: float = 0.0
+        # Without push updates, cached send levels older than this are re-read
+        self._sends_max_age = cfg.get("sends_max_age_seconds", 10.0)
         self._poller = X32Poller(
             mixer_type=self._mixer_type,
             ip=self._mixer_ip,
@@ -400,7 +1271,17 @@ class X32Module:
             offline_after_seconds=cfg.get("offline_after_seconds", 8.0),
             ping_fails_to_offline=cfg.get("ping_fails_to_offline", 3),
             routing_buses=self._routing_buses,
+            push=cfg.get("push", True),
+            push_renew_seconds=cfg.get("push_renew_seconds", 8.0),
+            push_sweep_seconds=cfg.get("push_sweep_seconds", 60.0),
+            query_window=cfg.get("query_window", 32),
+            cold_seconds=cfg.get("cold_seconds", 600.0),
+            port=cfg.get("mixer_port"),
         )
+        self._faders = FaderEngine(self._poller.command, logger,
+                                   rate_hz=cfg.get("fader_rate_hz", 40.0))
+        self._poller.on_fader = lambda addr, value: self._faders.observe(_FADER_KEYS[addr], value)
+        self._poller.on_scene = self._faders.forget_all
 
     def _collect_routing_buses(self) -> set:
         """Collect the set of bus numbers used in routing destinations."""
@@ -415,11 +1296,32 @@ class X32Module:
     def start(self) -> None:
         self._logger.info(f"X32 module starting: {self._mixer_type} @ {self._mixer_ip}")
         self._poller.start()
+        self._faders.start()
 
     def stop(self) -> None:
+        self._faders.stop()
         self._poller._stop.set()
         self._poller._owner.disconnect()
 
+    def set_idle(self, idle_seconds: Optional[float]) -> None:
+        """Drop the mixer snapshot rate while no tablet is in the x32 room.
+
+        The ping keeps running so online/offline detection is unaffected.
+        """
+        self._poller.set_idle(idle_seconds)
+
+    def add_listener(self, fn: Callable[[], None]) -> None:
+        """Call *fn()* as soon as the mixer state changes (push mode)."""
+        self._poller.add_listener(fn)
+
+    def renew_meters(self) -> bool:
+        """Keep the console's /meters stream running (call every few seconds)."""
+        return self._poller.renew_meters()
+
+    def meter_frame(self) -> Tuple[int, bytes]:
+        """Latest packed meter frame as ``(sequence, bytes)``."""
+        return self._poller.meter_frame()
+
     # --- Status / Health ---
 
     def get_status(self) -> dict:
@@ -450,6 +1352,12 @@ class X32Module:
             "cur_scene": cur_scene,
             "cur_scene_name": cur_scene_name,
             "seconds_since_last_ok": None if age_ok == float("inf") else round(age_ok, 2),
+            "push_active": self._poller.push_active,
+            "last_snapshot": self._poller.snapshot_stats,
+            "snapshot_in_progress": self._poller.snapshot_progress,
+            "faders_moving": self._faders.active(),
+            "fader_failures": self._faders.failures,
+            "fader_error": self._faders.last_error,
             "error": err or "",
         }
 
@@ -467,7 +1375,8 @@ class X32Module:
         res, err = self._poller.command(do)
         if err:
             return {"error": err}, 503
-        self._routing_cache = None  # scene changes alter send levels
+        self._poller.invalidate_sends()  # scene changes alter send levels
+        self._faders.forget_all()  # ...and fader positions
         return res, 200
 
     # --- Channel mute/volume ---
@@ -494,6 +1403,8 @@ class X32Module:
             return {"error": "Channel must be 1-32"}, 400
 
         step = 0.05 if direction == "up" else -0.05
+        # Step from where the mixer is, not from a slider move still queued
+        self._faders.cancel(("ch", ch))
 
         def do(m):
             chs = _fmt_ch(ch)
@@ -512,16 +1423,7 @@ class X32Module:
         if ch < 1 or ch > 32:
             return {"error": "Channel must be 1-32"}, 400
         value = min(1.0, max(0.0, value))
-
-        def do(m):
-            chs = _fmt_ch(ch)
-            m.send(f"/ch/{chs}/mix/fader", value)
-            return {"success": True, "channel": ch, "volume": round(value, 3)}
-
-        res, err = self._poller.command(do)
-        if err:
-            return {"error": err}, 503
-        return res, 200
+        return self._set_fader("ch", ch, value, "channel")
 
     # --- Aux mute/volume ---
 
@@ -530,16 +1432,7 @@ class X32Module:
         if ch < 1 or ch > 8:
             return {"error": "Aux must be 1-8"}, 400
         value = min(1.0, max(0.0, value))
-
-        def do(m):
-            ax = _fmt_ch(ch)
-            m.send(f"/auxin/{ax}/mix/fader", value)
-            return {"success": True, "aux": ch, "volume": round(value, 3)}
-
-        res, err = self._poller.command(do)
-        if err:
-            return {"error": err}, 503
-        return res, 200
+        return self._set_fader("aux", ch, value, "aux")
 
     # --- Aux mute/volume ---
 
@@ -583,6 +1476,7 @@ class X32Module:
             return {"error": "Bus must be 1-16"}, 400
 
         step = 0.05 if direction == "up" else -0.05
+        self._faders.cancel(("bus", ch))
 
         def do(m):
             bx = _fmt_ch(ch)
@@ -601,16 +1495,7 @@ class X32Module:
         if ch < 1 or ch > 16:
             return {"error": "Bus must be 1-16"}, 400
         value = min(1.0, max(0.0, value))
-
-        def do(m):
-            bx = _fmt_ch(ch)
-            m.send(f"/bus/{bx}/mix/fader", value)
-            return {"success": True, "bus": ch, "volume": round(value, 3)}
-
-        res, err = self._poller.command(do)
-        if err:
-            return {"error": err}, 503
-        return res, 200
+        return self._set_fader("bus", ch, value, "bus")
 
     # --- DCA mute/volume (NEW — not in old x32-flask.py) ---
 
@@ -622,7 +1507,7 @@ class X32Module:
         mute_value = (state == "off")
 
         def do(m):
-            m.dca[ch - 1].config.on = mute_value
+            m.dca[ch - 1].on = mute_value
             return {"success": True, "dca": ch, "muted": state == "on"}
 
         res, err = self._poller.command(do)
@@ -636,6 +1521,7 @@ class X32Module:
             return {"error": "DCA must be 1-8"}, 400
 
         step = 0.05 if direction == "up" else -0.05
+        self._faders.cancel(("dca", ch))
 
         def do(m):
             vol = float(m.query(f"/dca/{ch}/fader")[0])
@@ -653,21 +1539,201 @@ class X32Module:
         if ch < 1 or ch > 8:
             return {"error": "DCA must be 1-8"}, 400
         value = min(1.0, max(0.0, value))
+        return self._set_fader("dca", ch, value, "dca")
 
-        def do(m):
-            m.send(f"/dca/{ch}/fader", value)
-            return {"success": True, "dca": ch, "volume": round(value, 3)}
+    # --- Batch (several strips in one command) ---
 
-        res, err = self._poller.command(do)
+    @staticmethod
+    def _parse_batch_item(item: Any) -> Tuple[Optional[List[Tuple[str, Any]]], str]:
+        """OSC sets for one batch item, or (None, error).
+
+        Item: ``{"strip": "ch"|"aux"|"bus"|"dca", "num": n}`` plus any of
+        ``"mute": true/false`` (or "on"/"off"), ``"volume": 0.0-1.0``, ``"db": -10``.
+        """
+        if not isinstance(item, dict):
+            return None, "item must be an object"
+        strip = item.get("strip", "ch")
+        if strip not in FADER_STRIPS:
+            return None, f"strip must be one of {', '.join(FADER_STRIPS)}"
+        try:
+            num = int(item.get("num", item.get("channel")))
+        except (TypeError, ValueError):
+            return None, "num is required"
+        if num < 1 or num > FADER_STRIPS[strip]:
+            return None, f"{strip} must be 1-{FADER_STRIPS[strip]}"
+        sets: List[Tuple[str, Any]] = []
+        mute = item.get("mute")
+        if mute is not None:
+            if isinstance(mute, str):
+                if mute not in ("on", "off"):
+                    return None, "mute must be true/false or 'on'/'off'"
+                mute = mute == "on"
+            sets.append((mute_address(strip, num), 0 if mute else 1))  # on=0 means muted
+        if item.get("volume") is not None and item.get("db") is not None:
+            return None, "give volume or db, not both"
+        try:
+            if item.get("volume") is not None:
+                sets.append((fader_address(strip, num), min(1.0, max(0.0, float(item["volume"])))))
+            elif item.get("db") is not None:
+                sets.append((fader_address(strip, num), db_to_fader(float(item["db"]))))
+        except (TypeError, ValueError):
+            return None, "volume and db must be numbers"
+        if not sets:
+            return None, "nothing to change (mute, volume or db)"
+        return sets, ""
+
+    def batch(self, items: List[dict]) -> Tuple[dict, int]:
+        """Apply several mute/volume changes in one command hold.
+
+        All sets go out back to back, then one pipelined read-back confirms
+        them.  Returns per-item results in request order; a bad item is
+        reported and skipped without stopping the rest.
+        """
+        if not isinstance(items, list) or not items:
+            return {"error": "items must be a non-empty list"}, 400
+        parsed = [self._parse_batch_item(item) for item in items]
+        sets = [(addr, value) for item_sets, _ in parsed if item_sets for addr, value in item_sets]
+        started = time.perf_counter()
+
+        def do(m):
+            for addr, value in sets:
+                m.send(addr, value)
+            tap = self._poller._owner.tap
+            if tap is None or not sets:
+                return {}
+            return tap.query_many([addr for addr, _ in sets], window=self._poller._query_window,
+                                  retries=1)
+
+        for addr, _ in sets:
+            key = _FADER_KEYS.get(addr)
+            if key is not None:
+                # A direct set overrides any slider move or fade in flight
+                self._faders.cancel(key)
+        readback, err = self._poller.command(do) if sets else ({}, None)
         if err:
             return {"error": err}, 503
+
+        results = []
+        for index, (item, (item_sets, error)) in enumerate(zip(items, parsed)):
+            result: Dict[str, Any] = {"index": index}
+            if isinstance(item, dict):
+                result.update({k: item[k] for k in ("strip", "num", "mute", "volume", "db") if k in item})
+            if item_sets is None:
+                result.update({"success": False, "error": error})
+                results.append(result)
+                continue
+            mismatched = []
+            confirmed = True
+            for addr, value in item_sets:
+                reply = readback.get(addr)
+                if not reply:
+                    confirmed = False
+                    continue
+                try:
+                    took = abs(float(reply[0]) - float(value)) <= _FADER_STEP
+                except (TypeError, ValueError):
+                    took = False
+                if not took:
+                    mismatched.append(addr)
+            if mismatched:
+                result.update({"success": False, "error": f"mixer did not take {', '.join(mismatched)}"})
+            else:
+                result.update({"success": True, "confirmed": confirmed})
+            results.append(result)
+        return {
+            "success": all(r["success"] for r in results),
+            "results": results,
+            "sent": len(sets),
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+        }, 200
+
+    # --- Fader engine (coalesced sets, timed fades) ---
+
+    def _set_fader(self, strip: str, num: int, value: float, label: str) -> Tuple[dict, int]:
+        """Queue a fader move; slider drags collapse to the engine's tick rate.
+
+        The reply comes before the mixer is touched (``"queued": true``).  If
+        an earlier queued move for this fader failed to send, the new one is
+        still queued and the reply carries that failure as ``previous_error``.
+        """
+        online, _, err = self._poller.online()
+        if not online:
+            return {"error": err or "offline"}, 503
+        failed = self._faders.take_error((strip, num))
+        self._faders.set((strip, num), value)
+        res = {"success": True, label: num, "volume": round(value, 3), "queued": True}
+        if failed:
+            res["previous_error"] = failed
         return res, 200
 
+    def _fader_position(self, strip: str, num: int) -> Optional[float]:
+        """Where the fader is now: the engine's last send or console push,
+        unless a newer snapshot disagrees; else ask the mixer."""
+        pos, pos_at = self._faders.position((strip, num))
+        if pos is not None and not self._faders.busy((strip, num)):
+            snap, snap_age, _, _ = self._poller.snapshot()
+            seen = snap.get(f"{strip}{num}vol") if snap else None
+            if not seen or time.time() - snap_age <= pos_at or seen == _vol_str(pos):
+                return pos
+            pos = int(seen) / 100
+        res, err = self._poller.command(lambda m: m.query(fader_address(strip, num)))
+        if err or not res:
+            return pos
+        try:
+            return float(res[0])
+        except (TypeError, ValueError):
+            return pos
+
+    def fade(self, strip: str, num: int, value: Optional[float] = None,
+             db: Optional[float] = None, seconds: float = 0.0,
+             wait: bool = False) -> Tuple[dict, int]:
+        """Ramp a fader to *value* (0.0-1.0) or *db* over *seconds*.
+
+        With *wait* the call returns once the fade has finished.
+        """
+        if strip not in FADER_STRIPS:
+            return {"error": f"Strip must be one of {', '.join(FADER_STRIPS)}"}, 400
+        if num < 1 or num > FADER_STRIPS[strip]:
+            return {"error": f"{strip} must be 1-{FADER_STRIPS[strip]}"}, 400
+        if (value is None) == (db is None):
+            return {"error": "Give exactly one of value, db"}, 400
+        try:
+            target = db_to_fader(float(db)) if db is not None else min(1.0, max(0.0, float(value)))
+            seconds = max(0.0, float(seconds))
+        except (TypeError, ValueError):
+            return {"error": "value, db and seconds must be numbers"}, 400
+        online, _, err = self._poller.online()
+        if not online:
+            return {"error": err or "offline"}, 503
+
+        key = (strip, num)
+        failures = self._faders.failures
+        start = self._fader_position(strip, num)
+        if start is None or seconds == 0:
+            self._faders.set(key, target)
+        else:
+            self._faders.ramp(key, start, target, seconds)
+        result = {
+            "success": True,
+            "strip": strip,
+            "num": num,
+            "from": round(start, 3) if start is not None else None,
+            "target": round(target, 3),
+            "target_db": round(fader_to_db(target), 1),
+            "seconds": seconds,
+        }
+        if wait:
+            if not self._faders.wait(key, seconds + 5.0):
+                return {"error": "fade did not finish in time"}, 504
+            if self._faders.failures != failures:
+                return {"error": self._faders.last_error or "fade failed"}, 503
+        return result, 200
+
     # --- Audio Routing (channel → bus sends) ---
 
     def invalidate_routing_cache(self) -> None:
         """Force next get_routing_state() to query live data."""
-        self._routing_cache = None
+        self._poller.invalidate_sends()
 
     def get_routing_config(self) -> dict:
         """Return the routing configuration (source groups, destinations, presets)."""
@@ -716,86 +1782,77 @@ class X32Module:
             })
         return result
 
-    def _query_send_level(self, m, ch_type: str, ch_id: int, bus_num: int) -> float:
-        """Query a single channel→bus send level."""
-        bus_fmt = _fmt_ch(bus_num)
-        if ch_type == "aux":
-            path = f"/auxin/{_fmt_ch(ch_id)}/mix/{bus_fmt}/level"
-        else:
-            path = f"/ch/{_fmt_ch(ch_id)}/mix/{bus_fmt}/level"
-        try:
-            return float(m.query(path)[0])
-        except Exception:
-            return 0.0
+    def _read_sends(self, m, keys: List[SendKey]) -> Dict[SendKey, float]:
+        """Current levels for *keys*: cached where fresh, one pipelined query for the rest."""
+        levels, stale = self._poller.send_levels(keys, self._sends_max_age)
+        if stale:
+            levels.update(self._poller.refresh_sends(m, stale))
+        return levels
 
-    def _set_send_level(self, m, ch_type: str, ch_id: int, bus_num: int, level: float) -> None:
-        """Set a single channel→bus send level."""
-        bus_fmt = _fmt_ch(bus_num)
-        if ch_type == "aux":
-            path = f"/auxin/{_fmt_ch(ch_id)}/mix/{bus_fmt}/level"
-        else:
-            path = f"/ch/{_fmt_ch(ch_id)}/mix/{bus_fmt}/level"
-        m.send(path, level)
+    def _apply_sends(self, targets: Dict[SendKey, float]) -> Tuple[Optional[dict], Optional[str]]:
+        """Push only the sends whose level differs from *targets*, in one burst.
+
+        Sends whose current level can't be read are written anyway.
+        Returns ``({"changed", "unchanged", "duration_ms"}, error)``.
+        """
+        started = time.perf_counter()
+
+        def do(m):
+            current = self._read_sends(m, list(targets))
+            changes = [(key, level) for key, level in targets.items()
+                       if key not in current or abs(current[key] - level) > _SEND_TOLERANCE]
+            # UDP sets aren't acknowledged, so nothing waits between them
+            for key, level in changes:
+                m.send(send_address(*key), float(level))
+            return {
+                "changed": len(changes),
+                "unchanged": len(targets) - len(changes),
+                "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+            }
+
+        return self._poller.command(do)
 
     def get_routing_state(self) -> Tuple[dict, int]:
         """Return current routing matrix: which source groups are routed to which destinations.
-        Uses cached result with 10s TTL to avoid hammering the mixer with OSC queries."""
+        Levels come from the cached send matrix; only stale sends are queried."""
         snap, _, online, err = self._poller.snapshot()
         if not online or not snap:
             return {"error": err or "offline"}, 503
 
-        # Return cached result if fresh (within 10s)
-        now = time.time()
-        if (self._routing_cache is not None
-                and now - self._routing_cache_ts < 10.0):
-            return self._routing_cache, 200
-
         groups = self._match_channels_to_groups(snap)
         destinations = self._routing_cfg.get("destinations", [])
 
-        # Collect only the (ch_type, ch_id, bus_num) triples we need to query
-        queries = []
-        for group in groups:
-            for dest in destinations:
-                for bus_num in self._dest_buses(dest):
-                    for ch_info in group["channels"]:
-                        queries.append((ch_info["type"], ch_info["id"], bus_num,
-                                        group["name"], dest["name"]))
+        keys = [(ch_info["type"], ch_info["id"], bus_num)
+                for group in groups
+                for dest in destinations
+                for bus_num in self._dest_buses(dest)
+                for ch_info in group["channels"]]
 
-        def do(m):
-            # Query all send levels in one command() call
-            raw = {}
-            for ch_type, ch_id, bus_num, gname, dname in queries:
-                lvl = self._query_send_level(m, ch_type, ch_id, bus_num)
-                raw.setdefault((gname, dname), []).append(lvl)
-
-            matrix = {}
-            for group in groups:
-                group_routes = {}
-                for dest in destinations:
-                    levels = raw.get((group["name"], dest["name"]), [])
-                    avg_level = sum(levels) / len(levels) if levels else 0.0
-                    group_routes[dest["name"]] = {
-                        "active": avg_level > 0.05,
-                        "level": round(avg_level, 3),
-                    }
-                matrix[group["name"]] = group_routes
-            return matrix
-
-        matrix, cmd_err = self._poller.command(do)
+        levels, cmd_err = self._poller.command(lambda m: self._read_sends(m, keys))
         if cmd_err:
             return {"error": cmd_err}, 503
 
-        result = {
+        matrix = {}
+        for group in groups:
+            group_routes = {}
+            for dest in destinations:
+                group_levels = [levels.get((ch_info["type"], ch_info["id"], bus_num), 0.0)
+                                for bus_num in self._dest_buses(dest)
+                                for ch_info in group["channels"]]
+                avg_level = sum(group_levels) / len(group_levels) if group_levels else 0.0
+                group_routes[dest["name"]] = {
+                    "active": avg_level > 0.05,
+                    "level": round(avg_level, 3),
+                }
+            matrix[group["name"]] = group_routes
+
+        return {
             "groups": groups,
             "destinations": destinations,
             "matrix": matrix,
             "presets": self._routing_cfg.get("presets", {}),
             "send_level": self._routing_cfg.get("send_level", 0.75),
-        }
-        self._routing_cache = result
-        self._routing_cache_ts = now
-        return result, 200
+        }, 200
 
     def set_group_routing(self, group_name: str, dest_name: str, enabled: bool,
                           level: Optional[float] = None) -> Tuple[dict, int]:
@@ -823,31 +1880,29 @@ class X32Module:
         send_level = level if level is not None else self._routing_cfg.get("send_level", 0.75)
         target_level = send_level if enabled else 0.0
 
-        def do(m):
-            count = 0
-            for bus_num in buses:
-                for ch_info in target["channels"]:
-                    self._set_send_level(m, ch_info["type"], ch_info["id"], bus_num, target_level)
-                    count += 1
-            return {
-                "success": True,
-                "group": group_name,
-                "destination": dest_name,
-                "buses": buses,
-                "enabled": enabled,
-                "level": round(target_level, 3),
-                "channels_affected": len(target["channels"]),
-                "sends_changed": count,
-            }
-
-        res, cmd_err = self._poller.command(do)
+        targets = {(ch_info["type"], ch_info["id"], bus_num): target_level
+                   for bus_num in buses
+                   for ch_info in target["channels"]}
+        res, cmd_err = self._apply_sends(targets)
         if cmd_err:
             return {"error": cmd_err}, 503
-        self._routing_cache = None  # invalidate cache
-        return res, 200
+        return {
+            "success": True,
+            "group": group_name,
+            "destination": dest_name,
+            "buses": buses,
+            "enabled": enabled,
+            "level": round(target_level, 3),
+            "channels_affected": len(target["channels"]),
+            "sends_changed": res["changed"],
+            "sends_unchanged": res["unchanged"],
+        }, 200
 
     def apply_routing_preset(self, preset_name: str) -> Tuple[dict, int]:
-        """Apply a named routing preset — sets all configured routes and clears others."""
+        """Apply a named routing preset — sets all configured routes and clears others.
+
+        Only sends that differ from the preset are written.
+        """
         presets = self._routing_cfg.get("presets", {})
         preset = presets.get(preset_name)
         if not preset:
@@ -876,25 +1931,22 @@ class X32Module:
         for dest in destinations:
             all_buses.update(self._dest_buses(dest))
 
-        def do(m):
-            changes = 0
-            for group in groups:
-                gname = group["name"]
-                active = active_buses_by_group.get(gname, set())
-                for bus_num in all_buses:
-                    target_level = send_level if bus_num in active else 0.0
-                    for ch_info in group["channels"]:
-                        self._set_send_level(m, ch_info["type"], ch_info["id"], bus_num, target_level)
-                        changes += 1
-            return {
-                "success": True,
-                "preset": preset_name,
-                "preset_label": preset.get("name", preset_name),
-                "changes": changes,
-            }
+        targets: Dict[SendKey, float] = {}
+        for group in groups:
+            active = active_buses_by_group.get(group["name"], set())
+            for bus_num in all_buses:
+                target_level = send_level if bus_num in active else 0.0
+                for ch_info in group["channels"]:
+                    targets[(ch_info["type"], ch_info["id"], bus_num)] = target_level
 
-        res, cmd_err = self._poller.command(do)
+        res, cmd_err = self._apply_sends(targets)
         if cmd_err:
             return {"error": cmd_err}, 503
-        self._routing_cache = None  # invalidate cache
-        return res, 200
+        return {
+            "success": True,
+            "preset": preset_name,
+            "preset_label": preset.get("name", preset_name),
+            "changes": res["changed"],
+            "unchanged": res["unchanged"],
+            "duration_ms": res["duration_ms"],
+        }, 200
@@ -0,0 +1,302 @@
+"""
+X32 Simulator — a local UDP OSC stand-in for the Behringer X32.
+
+Answers the queries the gateway makes (scene, strip mutes/faders/names,
+scene list, channel → bus sends, /xinfo), keeps every set it receives, and
+honours /xremote (pushes console-side changes to subscribers) and /meters.
+Replies can be delayed, jittered and dropped to mimic a busy network, so
+X32Poller / X32Module performance can be measured without the console.
+
+Run standalone and point the gateway at it (x32.mixer_ip / mixer_port):
+
+    python x32_sim.py --port 10023 --latency 2 --jitter 1 --loss 0.01
+
+or start it in-process with ``X32Simulator(...).start()`` (see x32_bench.py).
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import logging
+import math
+import random
+import socket
+import struct
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from pythonosc.osc_message import OscMessage
+from pythonosc.osc_message_builder import OscMessageBuilder
+
+logger = logging.getLogger("stp-gateway")
+
+Addr = Tuple[str, int]
+
+# Subscriptions (/xremote, /meters) lapse this long after the last renewal
+SUBSCRIPTION_SECONDS = 10.0
+
+
+def default_state(names: Optional[Dict[str, str]] = None) -> Dict[str, tuple]:
+    """A console at rest: everything unmuted at 0.75, sends off, named strips."""
+    state: Dict[str, tuple] = {"/-show/prepos/current": (1,)}
+    for root, count in (("/ch/{:02d}", 32), ("/auxin/{:02d}", 8), ("/bus/{:02d}", 16)):
+        for i in range(1, count + 1):
+            base = root.format(i)
+            state[f"{base}/mix/on"] = (1,)
+            state[f"{base}/mix/fader"] = (0.75,)
+            state[f"{base}/config/name"] = (f"{base.split('/')[1].upper()} {i}",)
+    for i in range(1, 9):
+        state[f"/dca/{i}/on"] = (1,)
+        state[f"/dca/{i}/fader"] = (0.75,)
+        state[f"/dca/{i}/config/name"] = (f"DCA {i}",)
+    for root, count in (("/ch/{:02d}", 32), ("/auxin/{:02d}", 8)):
+        for i in range(1, count + 1):
+            for bus in range(1, 17):
+                state[f"{root.format(i)}/mix/{bus:02d}/level"] = (0.0,)
+    for i in range(26):
+        state[f"/-show/showfile/scene/{i:03d}/name"] = (f"Scene {i}",)
+    for addr, name in (names or {}).items():
+        state[addr] = (name,)
+    return state
+
+
+def _encode(address: str, args: tuple) -> bytes:
+    builder = OscMessageBuilder(address=address)
+    for arg in args:
+        if isinstance(arg, (bytes, bytearray)):
+            builder.add_arg(bytes(arg), arg_type="b")
+        else:
+            builder.add_arg(arg)
+    return builder.build().dgram
+
+
+class X32Simulator:
+    """In-process UDP OSC server behaving like an X32 for the gateway's needs.
+
+    *latency_ms* / *jitter_ms* delay each reply (uniform jitter around the
+    latency); *loss* is the chance that any one packet, in either direction,
+    is dropped.  *seed* makes the impairments repeatable.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+                 latency_ms: float = 0.0, jitter_ms: float = 0.0, loss: float = 0.0,
+                 meter_hz: float = 20.0, seed: Optional[int] = None,
+                 names: Optional[Dict[str, str]] = None) -> None:
+        self.latency = max(0.0, latency_ms) / 1000.0
+        self.jitter = max(0.0, jitter_ms) / 1000.0
+        self.loss = min(1.0, max(0.0, loss))
+        self._meter_interval = 1.0 / max(1.0, meter_hz)
+        self._rng = random.Random(seed)
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.bind((host, port))
+        self._sock.settimeout(0.2)
+        self.address: Addr = self._sock.getsockname()
+
+        self._lock = threading.Lock()
+        self.state = default_state(names)
+        self._xremote: Dict[Addr, float] = {}  # client -> subscription expiry
+        self._meters: Dict[Tuple[Addr, str], float] = {}  # (client, bank) -> expiry
+        self._outbox: List[Tuple[float, int, bytes, Addr]] = []  # heap of (due, n, dgram, to)
+        self._outbox_n = 0
+        self._outbox_cond = threading.Condition()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self.stats = {"received": 0, "queries": 0, "sets": 0, "replies": 0,
+                      "pushes": 0, "dropped_in": 0, "dropped_out": 0}
+
+    @property
+    def port(self) -> int:
+        return self.address[1]
+
+    def start(self) -> "X32Simulator":
+        for target in (self._serve, self._deliver, self._meter_loop):
+            t = threading.Thread(target=target, daemon=True)
+            t.start()
+            self._threads.append(t)
+        logger.info(f"X32 simulator listening on {self.address[0]}:{self.port}")
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        with self._outbox_cond:
+            self._outbox_cond.notify_all()
+        for t in self._threads:
+            t.join(timeout=1.0)
+        self._sock.close()
+
+    # -------------------
+    # Console-side actions
+    # -------------------
+
+    def console_set(self, address: str, *args: Any) -> None:
+        """Change a parameter as if someone moved it on the console."""
+        with self._lock:
+            self.state[address] = tuple(args)
+            subscribers = self._live(self._xremote)
+        for client in subscribers:
+            self.stats["pushes"] += 1
+            self._send(_encode(address, tuple(args)), client)
+
+    def get(self, address: str) -> Any:
+        with self._lock:
+            value = self.state.get(address)
+        return value[0] if value else None
+
+    # -------------------
+    # Network
+    # -------------------
+
+    def _dropped(self) -> bool:
+        return self.loss > 0 and self._rng.random() < self.loss
+
+    def _send(self, dgram: bytes, to: Addr) -> None:
+        if self._dropped():
+            self.stats["dropped_out"] += 1
+            return
+        delay = self.latency
+        if self.jitter:
+            delay = max(0.0, delay + self._rng.uniform(-self.jitter, self.jitter))
+        if delay <= 0:
+            self._sendto(dgram, to)
+            return
+        with self._outbox_cond:
+            self._outbox_n += 1
+            heapq.heappush(self._outbox, (time.monotonic() + delay, self._outbox_n, dgram, to))
+            self._outbox_cond.notify()
+
+    def _sendto(self, dgram: bytes, to: Addr) -> None:
+        try:
+            self._sock.sendto(dgram, to)
+        except OSError as e:
+            logger.debug(f"X32 simulator: send to {to} failed: {e}")
+
+    def _deliver(self) -> None:
+        while not self._stop.is_set():
+            with self._outbox_cond:
+                while not self._outbox and not self._stop.is_set():
+                    self._outbox_cond.wait()
+                if self._stop.is_set():
+                    return
+                due, _, dgram, to = self._outbox[0]
+                wait = due - time.monotonic()
+                if wait > 0:
+                    self._outbox_cond.wait(wait)
+                    continue
+                heapq.heappop(self._outbox)
+            self._sendto(dgram, to)
+
+    def _serve(self) -> None:
+        while not self._stop.is_set():
+            try:
+                dgram, client = self._sock.recvfrom(65535)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            self.stats["received"] += 1
+            if self._dropped():
+                self.stats["dropped_in"] += 1
+                continue
+            try:
+                msg = OscMessage(dgram)
+            except Exception as e:
+                logger.debug(f"X32 simulator: bad packet from {client}: {e}")
+                continue
+            self._handle(msg.address.rstrip(), tuple(msg.params), client)
+
+    def _handle(self, address: str, args: tuple, client: Addr) -> None:
+        now = time.monotonic()
+        if address == "/xinfo":
+            self._reply(address, (self.address[0], "X32-SIM", "X32", "4.06"), client)
+        elif address == "/status":
+            self._reply(address, ("active", self.address[0], "X32-SIM"), client)
+        elif address == "/xremote":
+            with self._lock:
+                self._xremote[client] = now + SUBSCRIPTION_SECONDS
+        elif address == "/meters":
+            if args:
+                with self._lock:
+                    self._meters[(client, str(args[0]))] = now + SUBSCRIPTION_SECONDS
+        elif not args:
+            self.stats["queries"] += 1
+            with self._lock:
+                value = self.state.get(address)
+            if value is not None:
+                self._reply(address, value, client)
+        else:
+            self.stats["sets"] += 1
+            with self._lock:
+                if address == "/-action/goscene":
+                    self.state["/-show/prepos/current"] = (int(args[0]),)
+                else:
+                    self.state[address] = args
+                # Like the console: other subscribers hear about the change
+                others = [c for c in self._live(self._xremote) if c != client]
+            for other in others:
+                self.stats["pushes"] += 1
+                self._send(_encode(address, args), other)
+
+    def _reply(self, address: str, args: tuple, client: Addr) -> None:
+        self.stats["replies"] += 1
+        self._send(_encode(address, args), client)
+
+    def _live(self, subs: Dict[Any, float]) -> list:
+        """Unexpired subscribers (caller holds the lock)."""
+        now = time.monotonic()
+        for key in [k for k, exp in subs.items() if exp < now]:
+            del subs[key]
+        return list(subs)
+
+    def _meter_loop(self) -> None:
+        while not self._stop.wait(self._meter_interval):
+            with self._lock:
+                subs = self._live(self._meters)
+            for client, bank in subs:
+                values = self._meter_values(bank)
+                if values:
+                    blob = struct.pack(f"<i{len(values)}f", len(values), *values)
+                    self._send(_encode(bank, (blob,)), client)
+
+    def _meter_values(self, bank: str) -> List[float]:
+        """Plausible levels: unmuted strips move around their fader position."""
+        t = time.monotonic()
+        if bank == "/meters/1":
+            levels = []
+            with self._lock:
+                for i in range(1, 33):
+                    on = self.state.get(f"/ch/{i:02d}/mix/on", (1,))[0]
+                    fader = self.state.get(f"/ch/{i:02d}/mix/fader", (0.0,))[0]
+                    levels.append(0.0 if not on else fader * 0.5 * (1 + math.sin(t * 3 + i)) / 2)
+            return levels + [0.0] * 64
+        if bank == "/meters/2":
+            return [0.3 * (1 + math.sin(t * 2 + i)) / 2 for i in range(25)] + [0.0] * 24
+        return []
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local X32 OSC simulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=10023)
+    parser.add_argument("--latency", type=float, default=0.0, help="reply latency (ms)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="+/- reply jitter (ms)")
+    parser.add_argument("--loss", type=float, default=0.0, help="packet loss per direction (0-1)")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    sim = X32Simulator(args.host, args.port, latency_ms=args.latency, jitter_ms=args.jitter,
+                       loss=args.loss, seed=args.seed).start()
+    try:
+        while True:
+            time.sleep(10)
+            logger.info(f"X32 simulator: {sim.stats}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sim.stop()
+
+
+if __name__ == "__main__":
+    main()